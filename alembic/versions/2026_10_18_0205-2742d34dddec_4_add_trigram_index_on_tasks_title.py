@@ -0,0 +1,48 @@
+"""4-Add trigram index on tasks title
+
+Revision ID: 2742d34dddec
+Revises: bf1a478fae21
+Create Date: 2026-10-18 02:05:41.118204+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2742d34dddec"
+down_revision: Union[str, Sequence[str], None] = "bf1a478fae21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Индекс строится без блокировки записи в таблицу,
+    # CONCURRENTLY не выполняется внутри транзакции.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f("tasks_title_trgm_idx"),
+            "tasks",
+            ["title"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Расширение pg_trgm не удаляется, так как может использоваться
+    # другими объектами БД.
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f("tasks_title_trgm_idx"),
+            table_name="tasks",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
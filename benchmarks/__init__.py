@@ -0,0 +1,6 @@
+"""
+Бенчмарки API задач.
+
+Бенчмарки наполняют БД тестовыми задачами, поэтому их следует запускать
+на отдельной БД, указанной в `src/.env`.
+"""
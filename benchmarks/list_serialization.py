@@ -0,0 +1,111 @@
+"""
+Бенчмарк сериализации списка задач: Pydantic (`TaskReadListSchema`)
+и orjson без Pydantic (`TASKS_FAST_JSON=True`).
+
+Замеряются запросы к `GET /api/v1/tasks` через ASGI-транспорт без сети
+и отдельно сериализация одной и той же страницы без обращения к БД.
+Кэш списков отключается, чтобы каждый запрос обращался к БД. Запросы
+выполняются последовательно в одном процессе, поэтому число запросов
+в секунду соответствует одному ядру.
+
+Запуск (требуются примененные миграции):
+    python -m benchmarks.list_serialization --rows 100000 --requests 2000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from benchmarks.seed import seed_tasks
+from benchmarks.stats import summarize_latencies
+from src.config import api_settings
+from src.database import SessionLocal
+from src.main import app
+from src.tasks.schemas import TaskQuerySchema, TaskReadListSchema, TaskSearchReadSchema
+from src.tasks.service import TaskService
+
+MODES = {"pydantic": False, "orjson": True}
+
+
+async def measure_requests(requests: int, limit: int) -> dict[str, dict]:
+    """Замерить запросы к списку задач в каждом режиме сериализации."""
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        for mode, fast_json in MODES.items():
+            api_settings.TASKS_FAST_JSON = fast_json
+            latencies = []
+            start = time.perf_counter()
+            for _ in range(requests):
+                request_start = time.perf_counter()
+                response = await client.get(
+                    "/api/v1/tasks", params={"limit": limit, "with_count": False}
+                )
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - request_start)
+            elapsed = time.perf_counter() - start
+
+            results[mode] = {
+                "requests_per_second": round(requests / elapsed, 1),
+                **summarize_latencies(latencies),
+            }
+    return results
+
+
+async def measure_serialization(repeats: int, limit: int) -> dict[str, dict]:
+    """Замерить сериализацию одной страницы задач без обращения к БД."""
+
+    query = TaskQuerySchema(limit=limit, with_count=False)
+    async with SessionLocal() as session:
+        task_mappings, list_data = await TaskService._get_tasks_page(
+            query=query, session=session
+        )
+
+    def pydantic_dump() -> bytes:
+        tasks_list = TaskReadListSchema(
+            **list_data,
+            tasks=[TaskSearchReadSchema.model_validate(task) for task in task_mappings],
+        )
+        return tasks_list.model_dump_json().encode()
+
+    def orjson_dump() -> bytes:
+        return TaskService._dump_tasks_json(task_mappings, list_data)
+
+    results = {}
+    for mode, dump in {"pydantic": pydantic_dump, "orjson": orjson_dump}.items():
+        latencies = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            dump()
+            latencies.append(time.perf_counter() - start)
+        results[mode] = summarize_latencies(latencies)
+    return results
+
+
+async def main(rows: int, requests: int, limit: int) -> None:
+    api_settings.TASKS_CACHE_ENABLED = False
+    async with SessionLocal() as session:
+        await seed_tasks(session=session, rows=rows)
+
+    report = {
+        "requests": await measure_requests(requests=requests, limit=limit),
+        "serialization": await measure_serialization(repeats=requests, limit=limit),
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000, help="Число задач в БД")
+    parser.add_argument(
+        "--requests", type=int, default=2000, help="Число запросов в каждом режиме"
+    )
+    parser.add_argument("--limit", type=int, default=100, help="Размер страницы")
+    args = parser.parse_args()
+    asyncio.run(main(rows=args.rows, requests=args.requests, limit=args.limit))
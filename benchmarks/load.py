@@ -0,0 +1,468 @@
+"""
+Нагрузочный тест API задач.
+
+Наполняет БД до `--rows` задач и в течение `--duration` секунд выполняет
+`--concurrency` параллельных клиентов httpx со смесью операций `--mix`:
+    list - страница списка задач с фильтром по статусу;
+    search - полнотекстовый поиск по слову из заголовков задач;
+    create - создание задачи;
+    update - обновление одной из существующих задач;
+    delete - удаление задачи, созданной во время теста.
+
+Запросы выполняются к одной из целей `--target`:
+    asgi - `src.main.app` через ASGI-транспорт в том же процессе,
+        клиенты и API используют один цикл событий;
+    uvicorn - API в отдельном процессе uvicorn на свободном порту;
+    url - уже запущенный API по адресу `--url`.
+
+Результат - JSON с числом запросов в секунду и перцентилями задержек
+по операциям. С `--baseline` результат сравнивается с сохраненным ранее
+(`--save-baseline`): снижение числа запросов в секунду или рост p95/p99
+больше чем на `--tolerance` считается регрессией, и процесс завершается
+с кодом 1.
+
+Запуск (требуются примененные миграции):
+    python -m benchmarks.load --rows 1000000 --concurrency 32 --duration 30 \\
+        --mix list=50,search=20,create=10,update=10,delete=10 \\
+        --baseline benchmarks/baselines/asgi_1m.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import httpx
+from sqlalchemy import select
+
+from benchmarks.seed import TITLE_WORDS, seed_tasks
+from benchmarks.stats import summarize_latencies
+from src import api_constants
+from src.config import api_settings
+from src.database import SessionLocal
+from src.tasks.models import TaskModel
+
+TASKS_URL = "/api/v1/tasks"
+DEFAULT_MIX = "list=50,search=20,create=10,update=10,delete=10"
+UPDATE_IDS_COUNT = 1000
+UVICORN_START_TIMEOUT = 30
+# Метрики, рост которых считается регрессией, и метрика, регрессией
+# считается снижение
+LATENCY_METRICS = ("p95_ms", "p99_ms")
+THROUGHPUT_METRIC = "requests_per_second"
+
+
+# MARK: Operations
+class LoadState:
+    """
+    Общее состояние клиентов нагрузочного теста.
+
+    Атрибуты экземпляра:
+        update_ids (list[uuid.UUID]): задачи из БД для обновления.
+        created_ids (list[uuid.UUID]): задачи, созданные во время теста
+            и еще не удаленные.
+        random (random.Random): генератор случайных параметров запросов.
+    """
+
+    def __init__(self, update_ids: list[uuid.UUID], seed: int):
+        self.update_ids = update_ids
+        self.created_ids: list[uuid.UUID] = []
+        self.random = random.Random(seed)
+
+    def make_task_data(self) -> dict[str, Any]:
+        """Получить данные задачи для создания или обновления."""
+
+        word = self.random.choice(TITLE_WORDS)
+        return {
+            "title": f"{word} {uuid.uuid4().hex[:8]}",
+            "description": uuid.uuid4().hex,
+            "is_completed": self.random.random() < 0.5,
+        }
+
+
+async def list_tasks(client: httpx.AsyncClient, state: LoadState) -> httpx.Response:
+    return await client.get(
+        TASKS_URL,
+        params={
+            "limit": api_constants.DEFAULT_QUERY_LIMIT,
+            "is_completed": state.random.random() < 0.5,
+            "with_count": False,
+        },
+    )
+
+
+async def search_tasks(client: httpx.AsyncClient, state: LoadState) -> httpx.Response:
+    return await client.get(
+        TASKS_URL,
+        params={
+            "q": state.random.choice(TITLE_WORDS),
+            "limit": api_constants.DEFAULT_QUERY_LIMIT,
+            "with_count": False,
+        },
+    )
+
+
+async def create_task(client: httpx.AsyncClient, state: LoadState) -> httpx.Response:
+    task_data = state.make_task_data()
+    del task_data["is_completed"]
+    response = await client.post(TASKS_URL, json=task_data)
+    if response.is_success:
+        state.created_ids.append(uuid.UUID(response.json()["id"]))
+    return response
+
+
+async def update_task(client: httpx.AsyncClient, state: LoadState) -> httpx.Response:
+    return await client.put(
+        TASKS_URL,
+        params={"task_id": str(state.random.choice(state.update_ids))},
+        json=state.make_task_data(),
+    )
+
+
+async def delete_task(client: httpx.AsyncClient, state: LoadState) -> httpx.Response:
+    return await client.delete(
+        TASKS_URL, params={"task_id": str(state.created_ids.pop())}
+    )
+
+
+OPERATIONS: dict[
+    str, Callable[[httpx.AsyncClient, LoadState], Awaitable[httpx.Response]]
+] = {
+    "list": list_tasks,
+    "search": search_tasks,
+    "create": create_task,
+    "update": update_task,
+    "delete": delete_task,
+}
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    """Получить веса операций из строки вида `list=50,create=10`."""
+
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Неизвестная операция: {name}")
+        weights[name] = int(weight)
+    if not any(weights.values()):
+        raise argparse.ArgumentTypeError("Сумма весов операций должна быть больше 0")
+    return weights
+
+
+# MARK: Load
+async def run_client(
+    client: httpx.AsyncClient,
+    state: LoadState,
+    mix: dict[str, int],
+    deadline: float,
+    latencies: dict[str, list[float]],
+    errors: dict[str, int],
+) -> None:
+    """Выполнять операции со случайным выбором по весам до `deadline`."""
+
+    names = list(mix)
+    weights = list(mix.values())
+    while time.perf_counter() < deadline:
+        name = state.random.choices(names, weights)[0]
+        if name == "delete" and not state.created_ids:
+            # Удаляются только задачи, созданные во время теста,
+            # создание для удаления в замеры не входит
+            await create_task(client, state)
+            continue
+
+        start = time.perf_counter()
+        try:
+            response = await OPERATIONS[name](client, state)
+        except httpx.HTTPError:
+            errors[name] += 1
+            continue
+        latency = time.perf_counter() - start
+        if response.is_success:
+            latencies[name].append(latency)
+        else:
+            errors[name] += 1
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    state: LoadState,
+    mix: dict[str, int],
+    concurrency: int,
+    duration: float,
+) -> dict[str, Any]:
+    """
+    Выполнить нагрузку `concurrency` клиентами в течение `duration` секунд.
+
+    Returns:
+        dict[str, Any]: число запросов в секунду, ошибки и задержки
+            по всем операциям (`total`) и по каждой операции.
+    """
+
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(
+        *(
+            run_client(client, state, mix, deadline, latencies, errors)
+            for _ in range(concurrency)
+        )
+    )
+    elapsed = time.perf_counter() - start
+
+    def summarize(latencies: list[float], errors: int) -> dict[str, Any]:
+        return {
+            THROUGHPUT_METRIC: round(len(latencies) / elapsed, 1),
+            "errors": errors,
+            **summarize_latencies(latencies),
+        }
+
+    operations = {
+        name: summarize(latencies[name], errors[name]) for name in mix if mix[name]
+    }
+    total = summarize(
+        [latency for values in latencies.values() for latency in values],
+        sum(errors.values()),
+    )
+    return {"total": total, "operations": operations}
+
+
+async def delete_created_tasks(client: httpx.AsyncClient, state: LoadState) -> None:
+    """Удалить задачи, созданные во время теста и не удаленные им."""
+
+    ids = [str(task_id) for task_id in state.created_ids]
+    for start in range(0, len(ids), api_constants.BULK_MAX_IDS):
+        response = await client.post(
+            f"{TASKS_URL}/bulk/delete",
+            json={"ids": ids[start : start + api_constants.BULK_MAX_IDS]},
+        )
+        response.raise_for_status()
+    state.created_ids.clear()
+
+
+# MARK: Baseline
+def find_regressions(
+    report: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[dict[str, Any]]:
+    """
+    Сравнить результат с базовым и получить регрессии: снижение числа
+    запросов в секунду или рост p95/p99 больше чем на `tolerance`.
+    """
+
+    regressions = []
+    for name, current in report["operations"].items():
+        base = baseline["operations"].get(name)
+        if base is None:
+            continue
+
+        checks = [(THROUGHPUT_METRIC, -1)] + [(metric, 1) for metric in LATENCY_METRICS]
+        for metric, direction in checks:
+            if metric not in current or not base.get(metric):
+                continue
+            change = (current[metric] - base[metric]) / base[metric]
+            if change * direction > tolerance:
+                regressions.append(
+                    {
+                        "operation": name,
+                        "metric": metric,
+                        "baseline": base[metric],
+                        "current": current[metric],
+                        "change_percent": round(change * 100, 1),
+                    }
+                )
+    return regressions
+
+
+# MARK: Targets
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def start_uvicorn(workers: int, cache: bool) -> tuple[subprocess.Popen, str]:
+    """
+    Запустить API в отдельном процессе uvicorn и дождаться его готовности.
+
+    Returns:
+        tuple[subprocess.Popen, str]: процесс uvicorn и адрес API.
+    """
+
+    port = get_free_port()
+    env = {**os.environ, "TASKS_CACHE_ENABLED": str(cache).lower()}
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "src.main:app",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--no-access-log",
+        ],
+        env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+
+    deadline = time.monotonic() + UVICORN_START_TIMEOUT
+    async with httpx.AsyncClient(base_url=url) as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError("Процесс uvicorn завершился при запуске")
+            try:
+                await client.get(TASKS_URL, params={"limit": 1})
+                return process, url
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+
+    process.terminate()
+    raise RuntimeError("Процесс uvicorn не запустился за отведенное время")
+
+
+def create_client(url: str | None, concurrency: int) -> httpx.AsyncClient:
+    """Создать клиент к API по адресу `url` или к `src.main.app` без сети."""
+
+    timeout = httpx.Timeout(30)
+    if url is None:
+        from src.main import app
+
+        return httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://bench",
+            timeout=timeout,
+        )
+    return httpx.AsyncClient(
+        base_url=url,
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=concurrency, max_keepalive_connections=concurrency
+        ),
+    )
+
+
+# MARK: Main
+async def prepare_database(rows: int) -> list[uuid.UUID]:
+    """
+    Наполнить БД до `rows` задач.
+
+    Returns:
+        list[uuid.UUID]: задачи для обновления во время теста.
+    """
+
+    async with SessionLocal() as session:
+        await seed_tasks(session=session, rows=rows)
+        result = await session.execute(
+            select(TaskModel.id).order_by(TaskModel.id).limit(UPDATE_IDS_COUNT)
+        )
+        return list(result.scalars())
+
+
+async def main(args: argparse.Namespace) -> int:
+    api_settings.TASKS_CACHE_ENABLED = args.cache
+    update_ids = await prepare_database(rows=args.rows)
+    if not update_ids:
+        raise RuntimeError("В БД нет задач для обновления")
+    state = LoadState(update_ids=update_ids, seed=args.seed)
+
+    process = None
+    url = args.url
+    if args.target == "uvicorn":
+        process, url = await start_uvicorn(workers=args.workers, cache=args.cache)
+    try:
+        async with create_client(url, concurrency=args.concurrency) as client:
+            if args.warmup:
+                await run_load(
+                    client, state, args.mix, args.concurrency, duration=args.warmup
+                )
+            results = await run_load(
+                client, state, args.mix, args.concurrency, duration=args.duration
+            )
+            await delete_created_tasks(client, state)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    report = {
+        "target": args.target,
+        "rows": args.rows,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "cache": args.cache,
+        "mix": args.mix,
+        **results,
+    }
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        report["regressions"] = find_regressions(report, baseline, args.tolerance)
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.save_baseline) or ".", exist_ok=True)
+        with open(args.save_baseline, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=10_000,
+        help="Число задач в БД, например 10000, 1000000 или 10000000",
+    )
+    parser.add_argument(
+        "--target", choices=["asgi", "uvicorn", "url"], default="asgi", help="Цель"
+    )
+    parser.add_argument("--url", help="Адрес API для цели url")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Число процессов uvicorn"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=16, help="Число параллельных клиентов"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=30, help="Длительность замера, с"
+    )
+    parser.add_argument(
+        "--warmup", type=float, default=5, help="Длительность прогрева, с"
+    )
+    parser.add_argument(
+        "--mix", type=parse_mix, default=DEFAULT_MIX, help="Веса операций"
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="cache",
+        action="store_false",
+        help="Отключить кэш списков задач",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed случайных запросов")
+    parser.add_argument("--baseline", help="Файл базового результата для сравнения")
+    parser.add_argument("--save-baseline", help="Сохранить результат в файл")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Допустимое ухудшение метрик относительно базового результата",
+    )
+    args = parser.parse_args()
+    if (args.target == "url") != (args.url is not None):
+        parser.error("--url задается только вместе с --target url")
+    sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,127 @@
+"""
+Бенчмарк форматов ответа списка задач: JSON и MessagePack.
+
+Для одной и той же страницы задач замеряются размер тела ответа,
+время кодирования (так же, как в `NegotiatedResponse`) и время
+декодирования на стороне клиента. Отдельно замеряются запросы
+к `GET /api/v1/tasks` с заголовком `Accept` каждого формата через
+ASGI-транспорт без сети при отключенном кэше списков.
+
+Запуск (требуются примененные миграции):
+    python -m benchmarks.payload_formats --rows 100000 --requests 2000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+import msgpack
+from fastapi.encoders import jsonable_encoder
+
+from benchmarks.seed import seed_tasks
+from benchmarks.stats import summarize_latencies
+from src import api_constants
+from src.config import api_settings
+from src.database import SessionLocal
+from src.main import app
+from src.negotiation import NegotiatedResponse
+from src.tasks.schemas import TaskQuerySchema, TaskReadListSchema, TaskSearchReadSchema
+from src.tasks.service import TaskService
+
+FORMATS = {
+    "json": (api_constants.JSON_MEDIA_TYPE, json.loads),
+    "msgpack": (api_constants.MSGPACK_MEDIA_TYPE, msgpack.unpackb),
+}
+
+
+def measure(func, arg, repeats: int) -> dict[str, float]:
+    """Замерить `repeats` вызовов `func(arg)`."""
+
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(arg)
+        latencies.append(time.perf_counter() - start)
+    return summarize_latencies(latencies)
+
+
+async def measure_payloads(repeats: int, limit: int) -> dict[str, dict]:
+    """Замерить размер, кодирование и декодирование одной страницы задач."""
+
+    query = TaskQuerySchema(limit=limit, with_count=False)
+    async with SessionLocal() as session:
+        task_mappings, list_data = await TaskService._get_tasks_page(
+            query=query, session=session
+        )
+    tasks_list = TaskReadListSchema(
+        **list_data,
+        tasks=[TaskSearchReadSchema.model_validate(task) for task in task_mappings],
+    )
+    content = jsonable_encoder(tasks_list)
+
+    results = {}
+    for name, (media_type, decode) in FORMATS.items():
+        response = NegotiatedResponse(content)
+        response.media_type = media_type
+        body = response.render(content)
+        results[name] = {
+            "payload_bytes": len(body),
+            "encode": measure(response.render, content, repeats=repeats),
+            "decode": measure(decode, body, repeats=repeats),
+        }
+    return results
+
+
+async def measure_requests(requests: int, limit: int) -> dict[str, dict]:
+    """Замерить запросы к списку задач в каждом формате ответа."""
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        for name, (media_type, _) in FORMATS.items():
+            latencies = []
+            start = time.perf_counter()
+            for _ in range(requests):
+                request_start = time.perf_counter()
+                response = await client.get(
+                    "/api/v1/tasks",
+                    params={"limit": limit, "with_count": False},
+                    headers={"Accept": media_type},
+                )
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - request_start)
+            elapsed = time.perf_counter() - start
+
+            results[name] = {
+                "requests_per_second": round(requests / elapsed, 1),
+                **summarize_latencies(latencies),
+            }
+    return results
+
+
+async def main(rows: int, requests: int, limit: int) -> None:
+    api_settings.TASKS_CACHE_ENABLED = False
+    api_settings.TASKS_FAST_JSON = False
+    async with SessionLocal() as session:
+        await seed_tasks(session=session, rows=rows)
+
+    report = {
+        "payloads": await measure_payloads(repeats=requests, limit=limit),
+        "requests": await measure_requests(requests=requests, limit=limit),
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000, help="Число задач в БД")
+    parser.add_argument(
+        "--requests", type=int, default=2000, help="Число запросов в каждом формате"
+    )
+    parser.add_argument("--limit", type=int, default=100, help="Размер страницы")
+    args = parser.parse_args()
+    asyncio.run(main(rows=args.rows, requests=args.requests, limit=args.limit))
@@ -0,0 +1,88 @@
+"""
+Наполнение БД тестовыми задачами.
+
+Запуск:
+    python -m benchmarks.seed --rows 1000000
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import Integer, String, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import SessionLocal
+from src.tasks.dao import TaskDAO
+
+SEED_BATCH_SIZE = 500_000
+TITLE_WORDS = [
+    "Отчет",
+    "Встреча",
+    "Звонок",
+    "Ревью",
+    "Релиз",
+    "Миграция",
+    "Документация",
+    "Планирование",
+    "Исправление",
+    "Тестирование",
+]
+
+SEED_TASKS_STMT = text(
+    """
+    INSERT INTO tasks (id, title, description, is_completed, created_at, updated_at)
+    SELECT
+        gen_random_uuid(),
+        (:words)[1 + i % :words_count] || ' ' || substr(md5(i::text), 1, 8),
+        md5(random()::text) || ' ' || md5(random()::text),
+        random() < 0.5,
+        now() - make_interval(secs => i),
+        now()
+    FROM generate_series(:start, :stop) AS i
+    """
+).bindparams(
+    bindparam("words", value=TITLE_WORDS, type_=ARRAY(String)),
+    bindparam("words_count", value=len(TITLE_WORDS), type_=Integer),
+    bindparam("start", type_=Integer),
+    bindparam("stop", type_=Integer),
+)
+
+
+async def seed_tasks(session: AsyncSession, rows: int) -> int:
+    """
+    Дополнить таблицу `tasks` тестовыми задачами до `rows` записей.
+
+    Заголовок задачи состоит из слова из `TITLE_WORDS` и 8 символов md5-хеша,
+    что позволяет проверять поиск как по частым, так и по редким подстрокам.
+
+    Returns:
+        int: количество добавленных задач.
+    """
+
+    existing_rows = await TaskDAO.count(session=session)
+    for start in range(existing_rows + 1, rows + 1, SEED_BATCH_SIZE):
+        stop = min(start + SEED_BATCH_SIZE - 1, rows)
+        await session.execute(SEED_TASKS_STMT, {"start": start, "stop": stop})
+        await session.commit()
+
+    await session.execute(text("ANALYZE tasks"))
+    await session.commit()
+    return max(rows - existing_rows, 0)
+
+
+async def main(rows: int) -> None:
+    async with SessionLocal() as session:
+        start = time.perf_counter()
+        added_rows = await seed_tasks(session=session, rows=rows)
+        elapsed = time.perf_counter() - start
+
+    print(f"Добавлено задач: {added_rows} за {elapsed:.1f} с")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, required=True, help="Число задач в БД")
+    args = parser.parse_args()
+    asyncio.run(main(rows=args.rows))
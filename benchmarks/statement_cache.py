@@ -0,0 +1,102 @@
+"""
+Микробенчмарк построения и компиляции запросов `TaskDAO` на один запрос API.
+
+Сравниваются запросы, построенные заново при каждом вызове (кэши выражений
+и запросов `functools.cache` сбрасываются перед каждым построением),
+и запросы, построенные один раз. Для каждого запроса замеряются:
+    build - построение выражения запроса;
+    cache_key - вычисление ключа кэша скомпилированных запросов SQLAlchemy,
+        которое выполняется при каждом выполнении запроса;
+    compile - компиляция запроса, которая выполняется при промахе кэша.
+
+БД не требуется: запросы компилируются для диалекта asyncpg.
+
+Запуск:
+    python -m benchmarks.statement_cache --repeats 10000
+"""
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+
+from sqlalchemy.sql import ClauseElement
+
+from benchmarks.stats import summarize_latencies
+from src.database import EngineLocal
+from src.tasks.dao import TaskDAO
+from src.tasks.models import TaskModel
+
+STATEMENTS: dict[str, Callable[[], ClauseElement]] = {
+    "get_tasks_data": lambda: TaskDAO.get_tasks_data_stmt(
+        TaskModel.is_completed.is_(False),
+        offset=0,
+        limit=101,
+        asc=True,
+        with_count=True,
+    ),
+    "get_tasks_data_by_ids": TaskDAO._get_tasks_data_by_ids_stmt,
+    "update_task_full_data": TaskDAO._get_update_task_full_data_stmt,
+    "delete_by_id_returning_id": TaskDAO._get_delete_by_id_stmt,
+}
+CACHED_BUILDERS = [
+    TaskDAO._get_task_completion_exp,
+    TaskDAO.get_overdue_exp,
+    TaskDAO._get_ids_param_exp,
+    TaskDAO._get_tasks_base_stmt,
+    TaskDAO._get_tasks_data_by_ids_stmt,
+    TaskDAO._get_update_task_full_data_stmt,
+    TaskDAO._get_delete_by_id_stmt,
+]
+
+
+def clear_cached_builders() -> None:
+    """Сбросить выражения и запросы, построенные заранее."""
+
+    for builder in CACHED_BUILDERS:
+        builder.cache_clear()
+
+
+def measure_statement(
+    build: Callable[[], ClauseElement], cached: bool, repeats: int
+) -> dict[str, dict]:
+    """Замерить построение, вычисление ключа кэша и компиляцию запроса."""
+
+    dialect = EngineLocal.dialect
+    latencies = {"build": [], "cache_key": [], "compile": []}
+    for _ in range(repeats):
+        if not cached:
+            clear_cached_builders()
+
+        start = time.perf_counter()
+        stmt = build()
+        latencies["build"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        stmt._generate_cache_key()
+        latencies["cache_key"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        stmt.compile(dialect=dialect)
+        latencies["compile"].append(time.perf_counter() - start)
+
+    return {phase: summarize_latencies(values) for phase, values in latencies.items()}
+
+
+def main(repeats: int) -> None:
+    report = {}
+    for name, build in STATEMENTS.items():
+        report[name] = {
+            "rebuilt": measure_statement(build, cached=False, repeats=repeats),
+            "prebuilt": measure_statement(build, cached=True, repeats=repeats),
+        }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--repeats", type=int, default=10_000, help="Число построений каждого запроса"
+    )
+    args = parser.parse_args()
+    main(repeats=args.repeats)
@@ -0,0 +1,33 @@
+"""Модуль расчета статистики по результатам замеров."""
+
+import statistics
+
+
+def summarize_latencies(latencies: list[float]) -> dict[str, float]:
+    """
+    Получить сводную статистику по задержкам.
+
+    Args:
+        latencies(list[float]): задержки в секундах.
+
+    Returns:
+        dict[str, float]: среднее значение и перцентили в миллисекундах.
+    """
+
+    if not latencies:
+        return {}
+
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    if len(latencies_ms) > 1:
+        percentiles = statistics.quantiles(latencies_ms, n=100, method="inclusive")
+    else:
+        percentiles = latencies_ms * 99
+
+    return {
+        "count": len(latencies_ms),
+        "mean_ms": round(statistics.fmean(latencies_ms), 3),
+        "p50_ms": round(percentiles[49], 3),
+        "p95_ms": round(percentiles[94], 3),
+        "p99_ms": round(percentiles[98], 3),
+        "max_ms": round(latencies_ms[-1], 3),
+    }
@@ -0,0 +1,82 @@
+"""
+Бенчмарк поиска задач по подстроке в заголовке до и после
+создания триграммного индекса `tasks_title_trgm_idx`.
+
+Для каждого объема таблица дополняется тестовыми задачами, после чего
+поиск замеряется с индексом и без него. Индекс удаляется внутри транзакции,
+которая затем откатывается, поэтому повторное построение индекса не требуется.
+
+Запуск (требуются примененные миграции):
+    python -m benchmarks.title_search --rows 1000000 10000000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.seed import seed_tasks
+from benchmarks.stats import summarize_latencies
+from src.database import SessionLocal
+from src.tasks.dao import TaskDAO
+
+# Частая подстрока (входит в заголовок каждой десятой задачи) и редкие подстроки.
+SEARCH_TERMS = ["миграц", "c4ca42", "a87ff6", "e4da3b"]
+
+
+async def measure_search(session: AsyncSession, repeats: int) -> dict[str, dict]:
+    """Замерить поиск по каждой подстроке из `SEARCH_TERMS`."""
+
+    results = {}
+    for term in SEARCH_TERMS:
+        latencies = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            await TaskDAO.get_tasks_data(
+                TaskDAO.get_title_search_exp(term),
+                offset=0,
+                limit=100,
+                asc=True,
+                with_count=True,
+                session=session,
+            )
+            latencies.append(time.perf_counter() - start)
+        results[term] = summarize_latencies(latencies)
+    return results
+
+
+async def main(rows_list: list[int], repeats: int) -> None:
+    report = {}
+    for rows in sorted(rows_list):
+        async with SessionLocal() as session:
+            await seed_tasks(session=session, rows=rows)
+
+            with_index = await measure_search(session=session, repeats=repeats)
+            await session.rollback()
+
+            await session.execute(text("DROP INDEX tasks_title_trgm_idx"))
+            without_index = await measure_search(session=session, repeats=repeats)
+            await session.rollback()
+
+        report[rows] = {"without_index": without_index, "with_index": with_index}
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[1_000_000, 10_000_000],
+        help="Объемы таблицы задач",
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=20, help="Число повторов каждого запроса"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(rows_list=args.rows, repeats=args.repeats))
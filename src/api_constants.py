@@ -5,6 +5,27 @@ from sqlalchemy import TextClause, text
 
 CORS_METHODS: list[str] = ["GET", "POST", "PUT", "DELETE", "OPTIONS"]
 CORS_ORIGINS: list[str] = ["*"]
+CORS_HEADERS: list[str] = ["If-None-Match", "X-Trace-Id", "X-Profile", "X-Last-Write"]
+CORS_EXPOSE_HEADERS: list[str] = [
+    "ETag",
+    "X-Query-Count",
+    "Server-Timing",
+    "X-Trace-Id",
+    "X-Profile-Id",
+    "X-Last-Write",
+]
+QUERY_COUNT_HEADER: str = "X-Query-Count"
+TRACE_ID_HEADER: str = "X-Trace-Id"
+TRACING_FLUSH_INTERVAL: float = 1.0
+PROFILE_HEADER: str = "X-Profile"
+PROFILE_ID_HEADER: str = "X-Profile-Id"
+PROFILING_TOP_ALLOCATIONS: int = 20
+
+# MARK: Media types
+JSON_MEDIA_TYPE: str = "application/json"
+MSGPACK_MEDIA_TYPE: str = "application/msgpack"
+NDJSON_MEDIA_TYPE: str = "application/x-ndjson"
+CSV_MEDIA_TYPE: str = "text/csv"
 
 # MARK: Database
 DB_NAMING_CONVENTION = {
@@ -16,4 +37,19 @@ DB_NAMING_CONVENTION = {
 }
 DEFAULT_QUERY_OFFSET: int = 0
 DEFAULT_QUERY_LIMIT: int = 100
+COUNT_CAP: int = 10_000
+MIN_TIME_TO_COMPLETE: int = 10
+MAX_TIME_TO_COMPLETE: int = 300
+FULL_TEXT_SEARCH_CONFIG: str = "russian"
+BULK_CREATE_MAX_ITEMS: int = 50_000
+BULK_COPY_THRESHOLD: int = 1_000
+BULK_MAX_IDS: int = 50_000
+BULK_CHUNK_SIZE: int = 1_000
+EXPORT_BATCH_SIZE: int = 1_000
+IMPORT_CHUNK_SIZE: int = 10_000
+IMPORT_MAX_ERRORS: int = 100
+REPLICA_LAG_CHECK_TIMEOUT: float = 1.0
+REPLICA_SESSION_INFO_KEY: str = "replica"
+LAST_WRITE_COOKIE: str = "last_write_at"
+LAST_WRITE_HEADER: str = "X-Last-Write"
 CURRENT_TIMESTAMP_UTC: TextClause = text("(CURRENT_TIMESTAMP AT TIME ZONE 'UTC')")
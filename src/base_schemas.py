@@ -1,9 +1,13 @@
 """Модуль основных Pydantic схем."""
 
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 from src import api_constants
 
+CountStrategy = Literal["exact", "capped", "estimated"]
+
 
 class BaseQuerySchema(BaseModel):
     """Схема query-параметров для пагинации."""
@@ -22,12 +26,54 @@ class BaseQuerySchema(BaseModel):
         default=True,
         description="Порядок сортировки записей по выбранному полю.",
     )
+    with_count: bool = Field(
+        default=True,
+        description="Подсчитывать ли общее число записей. "
+        "Если `false`, в ответе `count` равен `null`.",
+    )
+    count_strategy: CountStrategy = Field(
+        default="exact",
+        description="Способ подсчета общего числа записей: `exact` - точный подсчет, "
+        f"`capped` - подсчет не более {api_constants.COUNT_CAP} записей, "
+        "`estimated` - оценка по статистике планировщика PostgreSQL.",
+    )
+    cursor: str | None = Field(
+        default=None,
+        description="Курсор следующей страницы из `next_cursor`. "
+        "Если задан, параметр `offset` не учитывается.",
+    )
 
 
 class BaseListReadSchema(BaseModel):
     """Основная схема для отображение данных в списке."""
 
-    count: int = Field(
+    count: int | None = Field(
         description="Общее число записей, соответствующих "
-        "заданным параметрам фильтрации."
+        "заданным параметрам фильтрации, или `None`, если подсчет не запрашивался."
+    )
+    count_strategy: CountStrategy | None = Field(
+        default=None,
+        description="Способ, которым получено значение `count`. Для `capped` "
+        "значение `count` равно пределу подсчета, а записей может быть больше.",
+    )
+    next_cursor: str | None = Field(
+        default=None,
+        description="Курсор для получения следующей страницы "
+        "или `None`, если страница последняя или курсорная пагинация "
+        "недоступна, например при полнотекстовом поиске `q`.",
+    )
+
+
+class CacheStatsSchema(BaseModel):
+    """Схема метрик кэша."""
+
+    size: int = Field(default=0, description="Количество записей в кэше")
+    maxsize: int = Field(description="Максимальное количество записей в кэше")
+    hits: int = Field(default=0, description="Количество попаданий")
+    misses: int = Field(default=0, description="Количество промахов")
+    evictions: int = Field(
+        default=0, description="Количество записей, вытесненных при переполнении"
+    )
+    expirations: int = Field(
+        default=0, description="Количество записей, удаленных по истечении времени"
     )
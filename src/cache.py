@@ -0,0 +1,81 @@
+"""Модуль кэша в памяти процесса."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, Generic, TypeVar
+
+from src.base_schemas import CacheStatsSchema
+
+__all__ = ["TTLCache"]
+
+ValueType = TypeVar("ValueType")
+
+
+class TTLCache(Generic[ValueType]):
+    """
+    LRU-кэш с ограниченным числом записей и временем жизни записи.
+
+    При переполнении вытесняется запись, к которой дольше всего
+    не обращались. Кэш не потокобезопасен и рассчитан на использование
+    из одного цикла событий.
+
+    Атрибуты экземпляра:
+        maxsize (int): максимальное количество записей.
+        ttl (float): время жизни записи по умолчанию, с.
+        stats (CacheStatsSchema): метрики кэша.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStatsSchema(maxsize=maxsize)
+        self._data: OrderedDict[Hashable, tuple[float, ValueType]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> ValueType | Any:
+        """
+        Получить значение по ключу.
+
+        Returns:
+            ValueType|Any: значение или `default`, если записи нет или она устарела.
+        """
+
+        item = self._data.get(key)
+        if item is None:
+            self.stats.misses += 1
+            return default
+
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            self.stats.size = len(self._data)
+            return default
+
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: ValueType, ttl: float | None = None) -> None:
+        """Сохранить значение на `ttl` секунд, по умолчанию - на `self.ttl` секунд."""
+
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+        self.stats.size = len(self._data)
+
+    def delete(self, key: Hashable) -> None:
+        """Удалить запись по ключу, если она есть."""
+
+        self._data.pop(key, None)
+        self.stats.size = len(self._data)
+
+    def clear(self) -> None:
+        """Удалить все записи."""
+
+        self._data.clear()
+        self.stats.size = 0
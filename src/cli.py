@@ -0,0 +1,51 @@
+"""
+Консольные команды API.
+
+Запуск:
+    python -m src.cli import-tasks tasks.csv
+    python -m src.cli import-tasks tasks.ndjson --format ndjson
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+
+from src.database import SessionLocal
+from src.tasks.importer import TaskImporter
+
+
+async def import_tasks(path: Path, file_format: str) -> None:
+    """Импортировать задачи из файла и вывести результат импорта."""
+
+    async with SessionLocal() as session:
+        with path.open("rb") as file:
+            result = await TaskImporter.import_tasks(
+                file=file, file_format=file_format, session=session
+            )
+
+    print(result.model_dump_json(indent=2))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser(
+        "import-tasks", help="Импортировать задачи из файла CSV или NDJSON"
+    )
+    import_parser.add_argument("path", type=Path, help="Путь к файлу")
+    import_parser.add_argument(
+        "--format",
+        choices=["csv", "ndjson"],
+        default=None,
+        help="Формат файла, по умолчанию определяется по расширению",
+    )
+
+    args = parser.parse_args()
+    if args.command == "import-tasks":
+        file_format = args.format or ("csv" if args.path.suffix == ".csv" else "ndjson")
+        asyncio.run(import_tasks(path=args.path, file_format=file_format))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,9 @@
 
 import os
 from os.path import abspath, dirname
-from typing import Literal
+from typing import Literal, Self
 
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 __all__ = ["api_settings"]
@@ -26,6 +27,80 @@ class Settings(BaseSettings):
     POSTGRES_PORT: str
     POOL_SIZE: int
     MAX_OVERFLOW: int
+    # Размер кэшей подготовленных выражений SQLAlchemy и asyncpg на соединение
+    PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    # Размер кэша скомпилированных запросов SQLAlchemy
+    QUERY_CACHE_SIZE: int = 500
+
+    # Реплики Postgres для чтения: URL в формате `DATABASE_URL`
+    REPLICA_DATABASE_URLS: list[str] = []
+    # Допустимая задержка репликации, с
+    REPLICA_MAX_LAG: float = 5.0
+    # Интервал проверки задержки репликации, с
+    REPLICA_LAG_CHECK_INTERVAL: float = 1.0
+    # Время чтения с основной БД после записи клиента, с
+    READ_YOUR_WRITES_WINDOW: float = 5.0
+
+    # Режимы, в которых по умолчанию включены отладочные замеры
+    DEBUG_MODES: list[Literal["DEV", "TEST", "LOCAL"]] = ["LOCAL", "TEST"]
+
+    # Метрики Prometheus: время запросов к БД и HTTP-запросов.
+    # Если не задано, включены в режимах `DEBUG_MODES`
+    METRICS_ENABLED: bool | None = None
+
+    # Журнал медленных запросов и подсчет запросов к БД на HTTP-запрос
+    # с заголовками ответа `X-Query-Count` и `Server-Timing`.
+    # Если не задано, включены в режимах `DEBUG_MODES`
+    QUERY_LOG_ENABLED: bool | None = None
+    # Время выполнения медленного запроса, с
+    SLOW_QUERY_THRESHOLD: float = 0.5
+    # Доля медленных запросов SELECT, для которых записывается план выполнения
+    SLOW_QUERY_EXPLAIN_RATE: float = 0.0
+    # Допустимое число запросов к БД на HTTP-запрос
+    QUERY_BUDGET: int = 10
+
+    # Трассировка запросов: доля трассируемых запросов и экспортер интервалов
+    TRACING_SAMPLE_RATE: float = 0.0
+    TRACING_EXPORTER: Literal["memory", "jsonl"] = "memory"
+    TRACING_BUFFER_SIZE: int = 1000
+    TRACING_JSONL_PATH: str = "traces.jsonl"
+
+    # Профилирование отдельных запросов: режимы, в которых оно разрешено,
+    # каталог профилей и интервал семплирования стеков, с
+    PROFILING_MODES: list[Literal["DEV", "TEST", "LOCAL"]] = ["LOCAL", "TEST"]
+    PROFILING_DIR: str = "profiles"
+    PROFILING_INTERVAL: float = 0.001
+
+    # Планировщик автоматического завершения задач
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_INTERVAL: float = 1.0
+    SCHEDULER_BATCH_SIZE: int = 1000
+
+    # Кэш задач
+    TASKS_CACHE_ENABLED: bool = True
+    TASKS_CACHE_MAX_SIZE: int = 1024
+    TASKS_CACHE_TTL: float = 30.0
+    TASKS_CACHE_COMPLETION_TOLERANCE: float = 1.0
+    TASK_BY_ID_CACHE_MAX_SIZE: int = 10_000
+
+    # Сериализация списков задач в JSON без Pydantic
+    TASKS_FAST_JSON: bool = False
+    # Чтение задач: через ORM или запросами asyncpg без ORM
+    TASKS_DAO_BACKEND: Literal["orm", "asyncpg"] = "orm"
+
+    @model_validator(mode="after")
+    def set_debug_defaults(self) -> Self:
+        """
+        Включить метрики и журнал запросов, если они не настроены явно,
+        в режимах `DEBUG_MODES`.
+        """
+
+        debug = self.MODE in self.DEBUG_MODES
+        if self.METRICS_ENABLED is None:
+            self.METRICS_ENABLED = debug
+        if self.QUERY_LOG_ENABLED is None:
+            self.QUERY_LOG_ENABLED = debug
+        return self
 
     @property
     def DATABASE_URL(self):
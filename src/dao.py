@@ -1,11 +1,33 @@
+import functools
+import json
+import time
 import uuid
 from typing import Any, Generic, Literal, Tuple, TypeVar, overload
 
+import asyncpg
 from pydantic import BaseModel
-from sqlalchemy import Select, delete, insert, select, update
+from sqlalchemy import (
+    ColumnElement,
+    Delete,
+    Label,
+    Select,
+    any_,
+    bindparam,
+    delete,
+    insert,
+    literal,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.sql import func
+from sqlalchemy.sql.expression import ClauseElement, Executable
 
+from src import metrics, query_log, tracing
 from src.database import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
@@ -13,16 +35,72 @@ CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+class Explain(Executable, ClauseElement):
+    """
+    Запрос `EXPLAIN (FORMAT JSON)` для выражения SQLAlchemy.
+
+    Параметры выражения передаются драйверу как параметры запроса,
+    а не подставляются в текст запроса.
+    """
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain)
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+@tracing.instrument_class
+@metrics.instrument_dao
 class BaseDAO(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """
     Основной класс интерфейсов для операций с моделям БД.
 
+    Запросы публичных асинхронных методов DAO учитываются в метриках
+    по имени метода, см. `metrics.instrument_dao`, а вызовы методов
+    записываются в трассировку запроса, см. `tracing.instrument_class`.
+
     Атрибуты класса:
         model (Type[ModelType]): модель SQLAlchemy.
     """
 
     model = Base
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        metrics.instrument_dao(cls)
+        tracing.instrument_class(cls)
+
+    # MARK: Keyset
+    @classmethod
+    def _get_order_by(cls, order_by, asc: bool) -> tuple:
+        """
+        Получить выражения сортировки по полю `order_by`.
+
+        `id` используется как дополнительный ключ, чтобы порядок записей
+        с одинаковым значением `order_by` был стабильным.
+        """
+
+        if asc:
+            return order_by.asc(), cls.model.id.asc()
+        return order_by.desc(), cls.model.id.desc()
+
+    @classmethod
+    def _get_cursor_exp(cls, order_by, asc: bool, cursor: tuple[Any, uuid.UUID]):
+        """
+        Получить условие для выборки записей, следующих за курсором.
+
+        Сравнение пары `(order_by, id)` обслуживается составным индексом
+        по этим полям, поэтому стоимость страницы не зависит от ее номера.
+        """
+
+        keyset = tuple_(order_by, cls.model.id)
+        return keyset > cursor if asc else keyset < cursor
+
     # MARK: Create
     @classmethod
     async def add_returning_id(
@@ -53,6 +131,92 @@ class BaseDAO(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         result = await session.execute(stmt)
         return result.scalar_one()
 
+    @classmethod
+    async def add_many_returning_id(
+        cls,
+        session: AsyncSession,
+        objs_in: list[dict[str, Any]],
+    ) -> list[uuid.UUID]:
+        """
+        Добавить записи в текущую сессию одним запросом `INSERT ... VALUES`
+        из нескольких строк и вернуть `id` созданных записей.
+
+        Все словари `objs_in` должны содержать одинаковый набор ключей.
+
+        Returns:
+            list[uuid.UUID]: `id` созданных экземпляров модели.
+        """
+
+        if not objs_in:
+            return []
+
+        stmt = insert(cls.model).values(objs_in).returning(cls.model.id)
+        result = await session.execute(stmt)
+        return result.scalars().all()
+
+    @classmethod
+    async def copy_records(
+        cls,
+        session: AsyncSession,
+        records: list[tuple],
+        columns: list[str],
+        table_name: str | None = None,
+    ) -> None:
+        """
+        Скопировать записи в таблицу командой `COPY` через соединение asyncpg.
+
+        Подходит для большого числа записей: данные передаются потоком
+        без построения SQL-запроса и параметров для каждой строки.
+        Значения по умолчанию на стороне Python при копировании не применяются.
+
+        Args:
+            session(AsyncSession): асинхронная сессия SQLAlchemy.
+            records(list[tuple]): значения столбцов `columns` для каждой записи.
+            columns(list[str]): названия столбцов.
+            table_name(str | None): таблица, по умолчанию - таблица модели.
+        """
+
+        connection = await session.connection()
+        # Транзакция драйвера открывается первым запросом, поэтому выполняется
+        # запрос до копирования, чтобы COPY выполнился в транзакции сессии.
+        await connection.exec_driver_sql("SELECT 1")
+        driver_connection = await cls.get_driver_connection(session)
+        table_name = table_name or cls.model.__tablename__
+        start = time.perf_counter()
+        await driver_connection.copy_records_to_table(
+            table_name, records=records, columns=columns
+        )
+        cls.observe_driver_statement(f"COPY {table_name}", (), start=start)
+
+    @classmethod
+    async def get_driver_connection(cls, session: AsyncSession) -> asyncpg.Connection:
+        """
+        Получить соединение драйвера asyncpg, используемое сессией.
+
+        Соединение берется из пула движка сессии и возвращается
+        в пул вместе с ней.
+        """
+
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        return raw_connection.driver_connection
+
+    @staticmethod
+    def observe_driver_statement(statement: str, parameters: Any, start: float) -> None:
+        """
+        Учесть в метриках и журнале запросов запрос, выполненный
+        на соединении asyncpg в обход событий SQLAlchemy.
+
+        Args:
+            statement(str): текст запроса.
+            parameters(Any): параметры запроса.
+            start(float): время начала запроса по `time.perf_counter()`.
+        """
+
+        duration = time.perf_counter() - start
+        metrics.observe_statement(duration)
+        query_log.observe_statement(statement, parameters, duration)
+
     @classmethod
     async def add(
         cls,
@@ -92,21 +256,28 @@ class BaseDAO(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         offset: int | None,
         limit: int | None,
         asc: bool,
+        cursor: tuple[Any, uuid.UUID] | None = None,
     ) -> list[ModelType]:
         """
         Получить все записи с фильтрацией по переданным
         query-параметрам и с учетом пагинации.
 
+        Если задан `cursor` - пара значений `(order_by, id)` последней записи
+        предыдущей страницы, выборка начинается сразу после нее (keyset pagination).
+
         Returns:
             list[ModelType]: модели, соответствующие параметрам поиска.
         """
 
+        if cursor is not None:
+            where = (*where, cls._get_cursor_exp(order_by, asc, cursor))
+
         stmt = (
             select(cls.model)
             .where(*where)
             .offset(offset)
             .limit(limit)
-            .order_by(order_by.asc() if asc else order_by.desc())
+            .order_by(*cls._get_order_by(order_by, asc))
         )
         result = await session.execute(stmt)
         return result.scalars().all()
@@ -127,6 +298,55 @@ class BaseDAO(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         stmt = select(cls.model).where(*where)
         return await session.scalar(stmt)
 
+    @classmethod
+    def get_ids_exp(cls, ids: list[uuid.UUID]) -> ColumnElement[bool]:
+        """
+        Получить условие `id = ANY(:ids)`.
+
+        Идентификаторы передаются одним параметром-массивом, поэтому текст
+        запроса не зависит от их количества и переиспользуется драйвером.
+        """
+
+        return cls.model.id == any_(
+            bindparam("ids", value=ids, type_=ARRAY(cls.model.id.type))
+        )
+
+    @classmethod
+    @functools.cache
+    def _get_ids_param_exp(cls) -> ColumnElement[bool]:
+        """
+        Получить условие `id = ANY(:ids)` для запросов, построенных заранее.
+
+        Значение параметра `ids` передается при выполнении запроса.
+        """
+
+        return cls.model.id == any_(bindparam("ids", type_=ARRAY(cls.model.id.type)))
+
+    @classmethod
+    async def find_ids_after(
+        cls,
+        *where,
+        session: AsyncSession,
+        after_id: uuid.UUID | None,
+        limit: int,
+    ) -> list[uuid.UUID]:
+        """
+        Получить не более `limit` идентификаторов записей, соответствующих
+        критериям, в порядке возрастания `id`, начиная после `after_id`.
+
+        Позволяет обходить большие выборки частями без `OFFSET`.
+
+        Returns:
+            list[uuid.UUID]: `id` найденных записей.
+        """
+
+        if after_id is not None:
+            where = (*where, cls.model.id > after_id)
+
+        stmt = select(cls.model.id).where(*where).order_by(cls.model.id).limit(limit)
+        result = await session.execute(stmt)
+        return result.scalars().all()
+
     # MARK: Update
     @classmethod
     @overload
@@ -179,6 +399,31 @@ class BaseDAO(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         else:
             await session.execute(stmt)
 
+    @classmethod
+    async def update_by_ids_returning_id(
+        cls,
+        ids: list[uuid.UUID],
+        *where,
+        session: AsyncSession,
+        obj_in: dict[str, Any],
+    ) -> list[uuid.UUID]:
+        """
+        Обновить записи с `id` из `ids`, соответствующие критериям,
+        одним запросом `UPDATE ... WHERE id = ANY(:ids)`.
+
+        Returns:
+            list[uuid.UUID]: `id` обновленных экземпляров модели.
+        """
+
+        stmt = (
+            update(cls.model)
+            .where(cls.get_ids_exp(ids), *where)
+            .values(**obj_in)
+            .returning(cls.model.id)
+        )
+        result = await session.execute(stmt)
+        return result.scalars().all()
+
     # MARK: Delete
     @classmethod
     async def delete_returning_id(
@@ -196,23 +441,139 @@ class BaseDAO(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         stmt = delete(cls.model).where(*where).returning(cls.model.id)
         return await session.scalar(stmt)
 
+    @classmethod
+    async def delete_by_id_returning_id(
+        cls,
+        id: uuid.UUID,
+        session: AsyncSession,
+    ) -> uuid.UUID | None:
+        """
+        Удалить запись по `id` запросом, построенным один раз для модели.
+
+        Returns:
+            uuid.UUID|None: `id` удаленного экземпляра модели или `None`, если запись не найдена.
+        """
+
+        return await session.scalar(cls._get_delete_by_id_stmt(), {"id": id})
+
+    @classmethod
+    @functools.cache
+    def _get_delete_by_id_stmt(cls) -> Delete:
+        """Получить запрос удаления записи с параметром `id`."""
+
+        return (
+            delete(cls.model)
+            .where(cls.model.id == bindparam("id"))
+            .returning(cls.model.id)
+        )
+
+    @classmethod
+    async def delete_by_ids_returning_id(
+        cls,
+        ids: list[uuid.UUID],
+        *where,
+        session: AsyncSession,
+    ) -> list[uuid.UUID]:
+        """
+        Удалить записи с `id` из `ids`, соответствующие критериям,
+        одним запросом `DELETE ... WHERE id = ANY(:ids)`.
+
+        Returns:
+            list[uuid.UUID]: `id` удаленных экземпляров модели.
+        """
+
+        stmt = (
+            delete(cls.model)
+            .where(cls.get_ids_exp(ids), *where)
+            .returning(cls.model.id)
+        )
+        result = await session.execute(stmt)
+        return result.scalars().all()
+
     # MARK: Count
+    @classmethod
+    def _get_count_stmt(cls, *where, cap: int | None = None) -> Select[Tuple[int]]:
+        """
+        Получить выражение для подсчета строк, соответствующих критериям.
+
+        Если задан `cap`, подсчет останавливается после `cap` строк:
+        строки выбираются подзапросом с `LIMIT`, и полный просмотр таблицы
+        не выполняется.
+        """
+
+        if cap is None:
+            return select(func.count()).select_from(cls.model).where(*where)
+
+        capped_subquery = (
+            select(literal(1)).select_from(cls.model).where(*where).limit(cap)
+        ).subquery()
+        return select(func.count()).select_from(capped_subquery)
+
     @classmethod
     async def count(
         cls,
         *where,
         session: AsyncSession,
+        cap: int | None = None,
     ) -> int:
         """
         Посчитать строки в БД, соответствующий критериям.
 
+        Если задан `cap`, подсчитывается не более `cap` строк.
+
         Returns:
             rows_count: количество найденных строк или 0 если совпадений не найдено.
         """
 
-        stmt = select(func.count()).select_from(cls.model).where(*where)
+        stmt = cls._get_count_stmt(*where, cap=cap)
         return await session.scalar(stmt) or 0
 
+    @classmethod
+    def _get_count_exp(cls, *where, cap: int | None = None) -> Label:
+        """
+        Получить выражение для подсчета строк, соответствующих критериям,
+        в виде скалярного подзапроса.
+
+        Позволяет получить общее количество строк в том же запросе,
+        что и страницу данных, без дополнительного обращения к БД.
+        """
+
+        return (
+            cls._get_count_stmt(*where, cap=cap).scalar_subquery().label("total_count")
+        )
+
+    @classmethod
+    async def estimate_count(
+        cls,
+        *where,
+        session: AsyncSession,
+    ) -> int | None:
+        """
+        Оценить количество строк, соответствующих критериям,
+        по статистике планировщика PostgreSQL без просмотра таблицы.
+
+        Без критериев используется `pg_class.reltuples`,
+        иначе - оценка числа строк из плана запроса `EXPLAIN`.
+
+        Returns:
+            int|None: оценка количества строк или `None`,
+                если статистика по таблице еще не собрана.
+        """
+
+        if not where:
+            stmt = text(
+                "SELECT reltuples FROM pg_class WHERE oid = CAST(:table AS regclass)"
+            )
+            reltuples = await session.scalar(stmt, {"table": cls.model.__tablename__})
+            if reltuples is None or reltuples < 0:
+                return None
+            return int(reltuples)
+
+        plan = await session.scalar(Explain(select(cls.model.id).where(*where)))
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
     @classmethod
     async def count_from_stmt(
         cls,
@@ -1,13 +1,24 @@
 """Модуль конфигурации SQLAlchemy."""
 
-from sqlalchemy import AsyncAdaptedQueuePool, MetaData
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import MetaData
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
 
-from src import api_constants
+from src import api_constants, metrics, query_log
 from src.config import api_settings
 
-__all__ = ["Base", "SessionLocal", "EngineLocal"]
+__all__ = [
+    "Base",
+    "SessionLocal",
+    "EngineLocal",
+    "SnapshotSessionLocal",
+    "ReplicaEngines",
+]
 
 
 class Base(DeclarativeBase):
@@ -19,25 +30,71 @@ class Base(DeclarativeBase):
     metadata = MetaData(naming_convention=api_constants.DB_NAMING_CONVENTION)
 
 
-EngineLocal = create_async_engine(
-    url=api_settings.DATABASE_URL,
-    pool_size=api_settings.POOL_SIZE,
-    max_overflow=api_settings.MAX_OVERFLOW,
-    poolclass=AsyncAdaptedQueuePool,
-    pool_pre_ping=False,
-    pool_recycle=3600,
-    echo=True if api_settings.MODE == "LOCAL" else False,
-    connect_args={
-        "server_settings": {
-            "application_name": f"{api_settings.APP_NAME}_{api_settings.MODE}"
-        }
-    },
-)
+def create_engine(url: str, name: str) -> AsyncEngine:
+    """
+    Создать асинхронный движок SQLAlchemy с настройками пула API.
 
-SessionLocal = async_sessionmaker(
-    bind=EngineLocal,
-    autocommit=False,
-    autoflush=False,
-    expire_on_commit=False,
-    class_=AsyncSession,
-)
+    `name` используется в метке `pool` метрик пула соединений.
+    """
+
+    engine = create_async_engine(
+        url=url,
+        pool_size=api_settings.POOL_SIZE,
+        max_overflow=api_settings.MAX_OVERFLOW,
+        poolclass=metrics.InstrumentedQueuePool,
+        pool_logging_name=name,
+        pool_pre_ping=False,
+        pool_recycle=3600,
+        query_cache_size=api_settings.QUERY_CACHE_SIZE,
+        echo=True if api_settings.MODE == "LOCAL" else False,
+        connect_args={
+            "prepared_statement_cache_size": (
+                api_settings.PREPARED_STATEMENT_CACHE_SIZE
+            ),
+            "statement_cache_size": api_settings.PREPARED_STATEMENT_CACHE_SIZE,
+            "server_settings": {
+                "application_name": f"{api_settings.APP_NAME}_{api_settings.MODE}"
+            },
+        },
+    )
+    metrics.instrument_engine(engine, name=name)
+    if api_settings.QUERY_LOG_ENABLED:
+        query_log.instrument_engine(engine)
+    return engine
+
+
+def create_session_factory(
+    engine: AsyncEngine, snapshot: bool = False, **info
+) -> async_sessionmaker[AsyncSession]:
+    """
+    Создать фабрику сессий для движка `engine`.
+
+    Сессии с `snapshot=True` предназначены для согласованного чтения больших
+    выборок: все запросы транзакции видят один снимок БД, а транзакция
+    только для чтения не блокирует запись. Значения `info` доступны
+    в `AsyncSession.info`.
+    """
+
+    if snapshot:
+        engine = engine.execution_options(
+            isolation_level="REPEATABLE READ", postgresql_readonly=True
+        )
+    return async_sessionmaker(
+        bind=engine,
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+        class_=AsyncSession,
+        info=info or None,
+    )
+
+
+EngineLocal = create_engine(api_settings.DATABASE_URL, name="primary")
+SessionLocal = create_session_factory(EngineLocal)
+SnapshotSessionLocal = create_session_factory(EngineLocal, snapshot=True)
+
+# Движки реплик только для чтения, см. `src.replicas`
+ReplicaEngines: list[AsyncEngine] = [
+    create_engine(url, name=f"replica_{index}")
+    for index, url in enumerate(api_settings.REPLICA_DATABASE_URLS)
+]
@@ -1,8 +1,11 @@
 from typing import AsyncGenerator
 
+from fastapi import Depends, Request, Response
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import SessionLocal
+from src import replicas
+from src.database import SessionLocal, SnapshotSessionLocal
 
 
 # MARK: Session
@@ -18,3 +21,64 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             yield session
         except Exception as ex:
             raise ex
+
+
+async def get_write_session(
+    response: Response, session: AsyncSession = Depends(get_session)
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    AsyncGenerator экземпляра `AsyncSession` основной БД для записи.
+
+    Если настроены реплики, после успешного коммита запись клиента
+    отмечается в cookie и заголовке ответа, и следующие чтения клиента
+    в течение `READ_YOUR_WRITES_WINDOW` выполняются с основной БД.
+    """
+
+    if not replicas.replica_router.enabled:
+        yield session
+        return
+
+    def mark_write(_) -> None:
+        replicas.mark_write(response)
+
+    event.listen(session.sync_session, "after_commit", mark_write)
+    try:
+        yield session
+    finally:
+        event.remove(session.sync_session, "after_commit", mark_write)
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    AsyncGenerator экземпляра `AsyncSession` для чтения.
+
+    Сессия открывается на реплике с допустимой задержкой репликации,
+    а если такой реплики нет или клиент недавно выполнял запись -
+    на основной БД.
+
+    _Сессия закрывается внутри контекстного менеджера автоматически._
+    """
+
+    session_factory = None
+    if replicas.replica_router.enabled and not replicas.has_recent_write(request):
+        session_factory = replicas.replica_router.get_session_factory()
+
+    async with (session_factory or SessionLocal)() as session:
+        yield session
+
+
+async def get_snapshot_session(request: Request) -> AsyncSession:
+    """
+    Экземпляр `AsyncSession` для чтения в снимке БД
+    (`REPEATABLE READ`, `READ ONLY`).
+
+    Реплика выбирается так же, как в `get_read_session`.
+
+    _Сессия не закрывается зависимостью: тело `StreamingResponse` формируется
+    после выхода из зависимостей, поэтому сессию закрывает генератор ответа._
+    """
+
+    session_factory = None
+    if replicas.replica_router.enabled and not replicas.has_recent_write(request):
+        session_factory = replicas.replica_router.get_session_factory(snapshot=True)
+    return (session_factory or SnapshotSessionLocal)()
@@ -0,0 +1,27 @@
+"""Модуль условных запросов по ETag."""
+
+import hashlib
+
+
+def make_etag(*parts: object) -> str:
+    """Получить сильный ETag по значениям, от которых зависит представление ресурса."""
+
+    digest = hashlib.sha256("|".join(map(str, parts)).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Проверить, соответствует ли `etag` заголовку `If-None-Match`.
+
+    Для `If-None-Match` используется слабое сравнение, поэтому
+    префикс `W/` у переданных клиентом значений не учитывается.
+    """
+
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
@@ -8,3 +8,42 @@ class TaskNotFound(HTTPException):
         super().__init__(
             status_code=status.HTTP_404_NOT_FOUND, detail="Задача не найдена"
         )
+
+
+class InvalidCursor(HTTPException):
+    """Возникает, если передан некорректный курсор пагинации."""
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Некорректный курсор пагинации",
+        )
+
+
+class InvalidRequestBody(HTTPException):
+    """Возникает, если тело запроса не удается разобрать."""
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Некорректное тело запроса",
+        )
+
+
+class TooManyItems(HTTPException):
+    """Возникает, если в пакетном запросе превышено допустимое число элементов."""
+
+    def __init__(self, max_items: int):
+        super().__init__(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Превышено допустимое число элементов в запросе: {max_items}",
+        )
+
+
+class ProfileNotFound(HTTPException):
+    """Возникает, если профиль запроса не найден."""
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Профиль не найден"
+        )
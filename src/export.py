@@ -0,0 +1,49 @@
+"""Модуль сериализации строк выборки для потоковой выгрузки."""
+
+import csv
+import io
+import json
+import uuid
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+
+def json_default(value: Any) -> Any:
+    """
+    Преобразовать значение, не поддерживаемое `json`, в поддерживаемое.
+
+    Подходит и для orjson: UUID asyncpg является подклассом `uuid.UUID`,
+    который orjson не сериализует напрямую.
+    """
+
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"Тип {type(value).__name__} не поддерживается")
+
+
+def rows_to_ndjson(rows: Iterable[Sequence[Any]], columns: Sequence[str]) -> str:
+    """Сериализовать строки в формат NDJSON, по одному объекту в строке."""
+
+    return "".join(
+        json.dumps(
+            dict(zip(columns, row, strict=True)),
+            default=json_default,
+            ensure_ascii=False,
+        )
+        + "\n"
+        for row in rows
+    )
+
+
+def rows_to_csv(rows: Iterable[Sequence[Any]]) -> str:
+    """Сериализовать строки в формат CSV. `None` записывается пустой строкой."""
+
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
@@ -1,18 +1,47 @@
 """Модуль конфигурации FastAPI."""
 
+import json
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse
 
-from src import api_constants
+from src import (
+    api_constants,
+    exceptions,
+    metrics,
+    profiling,
+    query_log,
+    replicas,
+    tracing,
+)
 from src.config import api_settings
 from src.tasks.router import tasks_router
+from src.tasks.scheduler import task_completion_scheduler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Запустить планировщик завершения задач и проверку реплик
+    на время работы API.
+    """
+
+    if api_settings.SCHEDULER_ENABLED:
+        task_completion_scheduler.start()
+    replicas.replica_router.start()
+    yield
+    await replicas.replica_router.stop()
+    await task_completion_scheduler.stop()
+
 
 app = FastAPI(
     title=api_settings.APP_NAME,
     description=f"{api_settings.APP_NAME} в режиме {api_settings.MODE}",
     version=api_settings.APP_VERSION,
     swagger_ui_parameters={"operationsSorter": "method"},
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -20,11 +49,73 @@ app.add_middleware(
     allow_origins=api_constants.CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=api_constants.CORS_METHODS,
+    allow_headers=api_constants.CORS_HEADERS,
+    expose_headers=api_constants.CORS_EXPOSE_HEADERS,
 )
 
+if api_settings.QUERY_LOG_ENABLED:
+    app.add_middleware(query_log.QueryBudgetMiddleware)
+if api_settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+app.add_middleware(tracing.TracingMiddleware)
+if profiling.is_profiling_allowed():
+    app.add_middleware(profiling.ProfilingMiddleware)
+
 app.include_router(tasks_router, prefix="/api/v1")
 
 
+if api_settings.METRICS_ENABLED:
+
+    @app.get(
+        "/metrics",
+        response_class=PlainTextResponse,
+        include_in_schema=False,
+    )
+    def metrics_route() -> PlainTextResponse:
+        """Метрики API в текстовом формате Prometheus."""
+
+        return PlainTextResponse(
+            metrics.render_metrics(), media_type=metrics.METRICS_MEDIA_TYPE
+        )
+
+
+if isinstance(tracing.exporter, tracing.MemoryExporter):
+
+    @app.get("/debug/traces", include_in_schema=False)
+    def traces_route(trace_id: str | None = None) -> dict:
+        """
+        Интервалы трассировок из буфера в памяти,
+        при заданном `trace_id` - одной трассировки.
+        """
+
+        return {"spans": tracing.exporter.get_spans(trace_id=trace_id)}
+
+
+if profiling.is_profiling_allowed():
+
+    @app.get("/debug/profiles/{profile_id}", include_in_schema=False)
+    def profile_route(profile_id: str) -> dict:
+        """Время, число семплов и места наибольших аллокаций профиля запроса."""
+
+        summary = profiling.load_profile(profile_id, "json")
+        if summary is None:
+            raise exceptions.ProfileNotFound
+        return json.loads(summary)
+
+    @app.get(
+        "/debug/profiles/{profile_id}/folded",
+        response_class=PlainTextResponse,
+        include_in_schema=False,
+    )
+    def profile_folded_route(profile_id: str) -> PlainTextResponse:
+        """Стеки профиля запроса в формате folded для построения flamegraph."""
+
+        folded = profiling.load_profile(profile_id, "folded")
+        if folded is None:
+            raise exceptions.ProfileNotFound
+        return PlainTextResponse(folded)
+
+
 @app.get(
     "/",
     response_class=HTMLResponse,
@@ -0,0 +1,384 @@
+"""
+Модуль метрик API в текстовом формате Prometheus.
+
+Метрики собираются в памяти процесса:
+    http_request_duration_seconds - время обработки запросов по маршрутам;
+    db_pool_checkout_seconds - время получения соединения из пула;
+    db_pool_* - размер пула и число занятых, свободных и сверхлимитных соединений;
+    db_statement_duration_seconds - время выполнения запросов по методам DAO.
+"""
+
+import functools
+import inspect
+import time
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import AsyncAdaptedQueuePool, event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import api_settings
+
+__all__ = [
+    "METRICS_MEDIA_TYPE",
+    "InstrumentedQueuePool",
+    "MetricsMiddleware",
+    "instrument_dao",
+    "instrument_engine",
+    "observe_statement",
+    "render_metrics",
+]
+
+METRICS_MEDIA_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+DB_BUCKETS: tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+HTTP_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Метод DAO, выполняющий запросы в текущем контексте
+dao_method: ContextVar[str] = ContextVar("dao_method", default="other")
+
+
+# MARK: Metrics
+def _format_labels(labelnames: Iterable[str], labelvalues: Iterable[str]) -> str:
+    """Сформировать метки метрики в формате Prometheus."""
+
+    labels = ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in zip(labelnames, labelvalues, strict=True)
+    )
+    return f"{{{labels}}}" if labels else ""
+
+
+class Metric:
+    """
+    Базовый класс метрики.
+
+    Атрибуты экземпляра:
+        name (str): имя метрики.
+        documentation (str): описание метрики.
+        labelnames (tuple[str, ...]): имена меток.
+    """
+
+    type: str
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        REGISTRY.append(self)
+
+    def _get_labelvalues(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        """Получить значения меток в порядке `labelnames`."""
+
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def collect(self) -> Iterable[str]:
+        """Получить строки значений метрики."""
+
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Получить метрику в текстовом формате Prometheus."""
+
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+            *self.collect(),
+        ]
+        return "\n".join(lines)
+
+
+class Histogram(Metric):
+    """Гистограмма значений с заданными верхними границами корзин."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: tuple[float, ...] = HTTP_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+        self._values: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        """Учесть значение `value` с метками `labels`."""
+
+        labelvalues = self._get_labelvalues(labels)
+        values = self._values.get(labelvalues)
+        if values is None:
+            # Счетчики корзин, сумма и количество значений
+            values = self._values[labelvalues] = [[0] * len(self.buckets), 0.0, 0]
+        counts = values[0]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+                break
+        values[1] += value
+        values[2] += 1
+
+    def collect(self) -> Iterable[str]:
+        for labelvalues, (counts, total, count) in self._values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts, strict=True):
+                cumulative += bucket_count
+                labels = _format_labels(
+                    (*self.labelnames, "le"), (*labelvalues, repr(bound))
+                )
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels((*self.labelnames, "le"), (*labelvalues, "+Inf"))
+            yield f"{self.name}_bucket{labels} {count}"
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f"{self.name}_sum{labels} {total}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+class Gauge(Metric):
+    """Текущее значение, получаемое функцией `collect_values` при сборе метрик."""
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str],
+        collect_values: Callable[[], Iterable[tuple[tuple[str, ...], float]]],
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.collect_values = collect_values
+
+    def collect(self) -> Iterable[str]:
+        for labelvalues, value in self.collect_values():
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f"{self.name}{labels} {value}"
+
+
+REGISTRY: list[Metric] = []
+
+
+def render_metrics() -> str:
+    """Получить все метрики в текстовом формате Prometheus."""
+
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+# MARK: HTTP
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Время обработки HTTP-запросов, с.",
+    labelnames=("method", "route", "status"),
+)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware для замера времени обработки HTTP-запросов.
+
+    Запросы группируются по шаблону пути маршрута, чтобы число
+    значений меток не зависело от параметров пути.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=route.path if route is not None else "unmatched",
+                status=status_code,
+            )
+
+
+# MARK: Database
+_engines: dict[str, AsyncEngine] = {}
+
+
+def _collect_pool_values(
+    get_value: Callable[[AsyncAdaptedQueuePool], float],
+) -> Callable[[], Iterable[tuple[tuple[str, ...], float]]]:
+    """Получить функцию сбора значения `get_value` пулов всех движков."""
+
+    def collect_values() -> Iterable[tuple[tuple[str, ...], float]]:
+        for name, engine in _engines.items():
+            yield (name,), get_value(engine.pool)
+
+    return collect_values
+
+
+DB_POOL_CHECKOUT = Histogram(
+    "db_pool_checkout_seconds",
+    "Время получения соединения из пула, включая ожидание и подключение, с.",
+    labelnames=("pool",),
+    buckets=DB_BUCKETS,
+)
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Размер пула соединений без учета сверхлимитных соединений.",
+    labelnames=("pool",),
+    collect_values=_collect_pool_values(lambda pool: pool.size()),
+)
+DB_POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "Число соединений, выданных из пула.",
+    labelnames=("pool",),
+    collect_values=_collect_pool_values(lambda pool: pool.checkedout()),
+)
+DB_POOL_IDLE = Gauge(
+    "db_pool_connections_idle",
+    "Число свободных соединений в пуле.",
+    labelnames=("pool",),
+    collect_values=_collect_pool_values(lambda pool: pool.checkedin()),
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Число сверхлимитных соединений (отрицательно, пока пул не заполнен).",
+    labelnames=("pool",),
+    collect_values=_collect_pool_values(lambda pool: pool.overflow()),
+)
+DB_STATEMENT_DURATION = Histogram(
+    "db_statement_duration_seconds",
+    "Время выполнения запросов к БД по методам DAO, с.",
+    labelnames=("method",),
+    buckets=DB_BUCKETS,
+)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Пул соединений с замером времени получения соединения."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT.observe(
+                time.perf_counter() - start, pool=self._orig_logging_name
+            )
+
+
+def observe_statement(duration: float) -> None:
+    """Учесть время выполнения запроса методом DAO текущего контекста."""
+
+    DB_STATEMENT_DURATION.observe(duration, method=dao_method.get())
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_statement_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info["metrics_statement_start"].pop()
+    observe_statement(time.perf_counter() - start)
+
+
+def _handle_error(exception_context) -> None:
+    starts = exception_context.connection and exception_context.connection.info.get(
+        "metrics_statement_start"
+    )
+    if starts:
+        observe_statement(time.perf_counter() - starts.pop())
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """
+    Собирать метрики пула соединений и запросов движка `engine`.
+
+    Пул движка должен быть создан с `poolclass=InstrumentedQueuePool`
+    и `pool_logging_name=name`.
+    """
+
+    _engines[name] = engine
+    if api_settings.METRICS_ENABLED:
+        event.listen(
+            engine.sync_engine, "before_cursor_execute", _before_cursor_execute
+        )
+        event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+
+def instrument_dao(cls: type) -> type:
+    """
+    Отмечать запросы публичных асинхронных методов класса DAO `cls`
+    именем метода в метрике `db_statement_duration_seconds`.
+
+    Оборачиваются методы, объявленные в самом классе, в метке
+    указывается класс, для которого метод вызван, например
+    `TaskDAO.count` для метода `BaseDAO.count`.
+    """
+
+    for name, attr in list(vars(cls).items()):
+        if (
+            name.startswith("_")
+            or not isinstance(attr, classmethod)
+            or not inspect.iscoroutinefunction(attr.__func__)
+        ):
+            continue
+        setattr(cls, name, classmethod(_with_dao_method(attr.__func__)))
+    return cls
+
+
+def _with_dao_method(func: Callable) -> Callable:
+    """Обернуть метод DAO установкой `dao_method` на время вызова."""
+
+    @functools.wraps(func)
+    async def wrapper(cls, *args, **kwargs):
+        token = dao_method.set(f"{cls.__name__}.{func.__name__}")
+        try:
+            return await func(cls, *args, **kwargs)
+        finally:
+            dao_method.reset(token)
+
+    return wrapper
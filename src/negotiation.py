@@ -0,0 +1,159 @@
+"""Модуль согласования формата тела запросов и ответов API."""
+
+from collections.abc import Callable, Coroutine
+from contextvars import ContextVar
+from typing import Any
+
+import msgpack
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+
+from src import api_constants, exceptions
+
+__all__ = [
+    "NegotiatedResponse",
+    "NegotiatedRoute",
+    "get_response_media_type",
+    "representation_etag",
+]
+
+RESPONSE_MEDIA_TYPES: tuple[str, ...] = (
+    api_constants.JSON_MEDIA_TYPE,
+    api_constants.MSGPACK_MEDIA_TYPE,
+)
+
+response_media_type: ContextVar[str] = ContextVar(
+    "response_media_type", default=api_constants.JSON_MEDIA_TYPE
+)
+
+
+def parse_accept(accept: str | None) -> str:
+    """
+    Выбрать формат ответа по заголовку `Accept`.
+
+    Из поддерживаемых форматов выбирается формат с наибольшим
+    весом `q`, при равных весах - JSON. Если клиент не принимает
+    ни один из форматов явно, ответ возвращается в JSON.
+    """
+
+    if not accept:
+        return api_constants.JSON_MEDIA_TYPE
+
+    weights: dict[str, float] = {}
+    for media_range in accept.split(","):
+        media_type, *params = (part.strip() for part in media_range.split(";"))
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        media_type = media_type.lower()
+        if media_type in ("*/*", "application/*"):
+            weights.setdefault(api_constants.JSON_MEDIA_TYPE, q)
+        elif media_type in RESPONSE_MEDIA_TYPES:
+            weights[media_type] = q
+
+    weights = {media_type: q for media_type, q in weights.items() if q > 0}
+    if not weights:
+        return api_constants.JSON_MEDIA_TYPE
+    return max(
+        RESPONSE_MEDIA_TYPES, key=lambda media_type: weights.get(media_type, -1.0)
+    )
+
+
+def get_response_media_type() -> str:
+    """Получить формат ответа, согласованный для текущего запроса."""
+
+    return response_media_type.get()
+
+
+def representation_etag(etag: str) -> str:
+    """
+    Получить ETag представления ресурса в согласованном формате.
+
+    Представления в разных форматах отличаются, поэтому
+    ETag ответа в MessagePack дополняется суффиксом формата.
+    """
+
+    if get_response_media_type() == api_constants.JSON_MEDIA_TYPE:
+        return etag
+    return f'{etag[:-1]}-msgpack"'
+
+
+def is_msgpack(content_type: str) -> bool:
+    """Проверить, что тело запроса передано в формате MessagePack."""
+
+    return content_type.split(";")[0].strip().lower() == (
+        api_constants.MSGPACK_MEDIA_TYPE
+    )
+
+
+class NegotiatedResponse(JSONResponse):
+    """Ответ в формате JSON или MessagePack, согласованном по заголовку `Accept`."""
+
+    def __init__(self, content: Any, *args, **kwargs):
+        self.media_type = get_response_media_type()
+        super().__init__(content, *args, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        if self.media_type == api_constants.MSGPACK_MEDIA_TYPE:
+            return msgpack.packb(content)
+        return super().render(content)
+
+
+class MsgPackRequest(Request):
+    """Запрос, тело которого в формате MessagePack разбирается вместо JSON."""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            try:
+                self._json = msgpack.unpackb(await self.body())
+            except (ValueError, msgpack.UnpackException) as ex:
+                raise exceptions.InvalidRequestBody from ex
+        return self._json
+
+
+class NegotiatedRoute(APIRoute):
+    """
+    Маршрут с согласованием формата тела запроса и ответа.
+
+    Тело запроса с `Content-Type: application/msgpack` разбирается
+    и проверяется теми же схемами, что и JSON. Формат ответа выбирается
+    по заголовку `Accept` и применяется в `NegotiatedResponse`.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        original_route_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            if self.body_field is not None and is_msgpack(
+                request.headers.get("content-type", "")
+            ):
+                # Обработчик FastAPI разбирает тело только для JSON,
+                # поэтому запрос подменяется на JSON с разбором MessagePack.
+                headers = [
+                    (name, value)
+                    for name, value in request.scope["headers"]
+                    if name != b"content-type"
+                ]
+                headers.append(
+                    (b"content-type", api_constants.JSON_MEDIA_TYPE.encode())
+                )
+                request = MsgPackRequest(
+                    {**request.scope, "headers": headers}, request.receive
+                )
+
+            token = response_media_type.set(parse_accept(request.headers.get("accept")))
+            try:
+                response = await original_route_handler(request)
+            finally:
+                response_media_type.reset(token)
+
+            response.headers.append("Vary", "Accept")
+            return response
+
+        return route_handler
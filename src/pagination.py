@@ -0,0 +1,42 @@
+"""Модуль курсорной (keyset) пагинации."""
+
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+
+from src import exceptions
+
+__all__ = ["encode_cursor", "decode_cursor"]
+
+
+def encode_cursor(created_at: datetime, id: uuid.UUID) -> str:
+    """
+    Закодировать позицию последней записи страницы в непрозрачный курсор.
+
+    Returns:
+        str: строка base64url без выравнивания.
+    """
+
+    payload = json.dumps([created_at.isoformat(), str(id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """
+    Раскодировать курсор, полученный в `next_cursor`.
+
+    Raises:
+        InvalidCursor: Некорректный курсор `HTTP_400_BAD_REQUEST`.
+
+    Returns:
+        tuple[datetime, uuid.UUID]: дата создания и `id` последней записи страницы.
+    """
+
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        return datetime.fromisoformat(created_at), uuid.UUID(id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as ex:
+        raise exceptions.InvalidCursor from ex
@@ -0,0 +1,241 @@
+"""
+Модуль профилирования отдельных запросов API.
+
+Запрос с заголовком `X-Profile: 1` или query-параметром `profile=1`
+выполняется под семплирующим профилировщиком и `tracemalloc`, если
+профилирование разрешено в режиме `MODE` (`PROFILING_MODES`).
+Профиль сохраняется в `PROFILING_DIR`, его id возвращается
+в заголовке ответа `X-Profile-Id`:
+    <id>.folded - стеки в формате flamegraph.pl / speedscope;
+    <id>.json - время запроса, число семплов и места наибольших аллокаций.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from typing import Any
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src import api_constants
+from src.config import api_settings
+
+__all__ = ["ProfilingMiddleware", "StackSampler", "is_profiling_allowed"]
+
+PROFILE_FLAG_VALUES = {"1", "true", "yes"}
+
+
+def is_profiling_allowed() -> bool:
+    """Проверить, разрешено ли профилирование запросов в текущем режиме."""
+
+    return api_settings.MODE in api_settings.PROFILING_MODES
+
+
+# MARK: Sampler
+class StackSampler:
+    """
+    Семплирующий профилировщик потока.
+
+    Фоновый поток каждые `interval` секунд записывает стек вызовов
+    потока `thread_id`. Пока корутина ожидает ввод-вывод, стек
+    заканчивается в цикле событий, поэтому ожидание БД видно в профиле.
+
+    Атрибуты экземпляра:
+        stacks (Counter[str]): число семплов по стекам в формате folded.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[self._fold(frame)] += 1
+
+    @staticmethod
+    def _fold(frame) -> str:
+        """Получить стек кадра `frame` от корня в формате folded."""
+
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            filename = os.path.basename(code.co_filename)
+            names.append(f"{code.co_qualname} ({filename}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def get_folded(self) -> str:
+        """Получить профиль в формате folded: стек и число семплов в строке."""
+
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+
+def get_top_allocations(
+    before: tracemalloc.Snapshot, after: tracemalloc.Snapshot
+) -> list[dict[str, Any]]:
+    """Получить места наибольших аллокаций между снимками памяти."""
+
+    # Аллокации профилировщика в профиль не включаются
+    filters = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ]
+    stats = after.filter_traces(filters).compare_to(
+        before.filter_traces(filters), "lineno"
+    )
+    return [
+        {
+            "file": stat.traceback[0].filename,
+            "line": stat.traceback[0].lineno,
+            "size_kib": round(stat.size_diff / 1024, 1),
+            "count": stat.count_diff,
+        }
+        for stat in stats[: api_constants.PROFILING_TOP_ALLOCATIONS]
+    ]
+
+
+# MARK: Requests
+def pop_profile_flag(scope: Scope) -> bool:
+    """
+    Проверить, запрошено ли профилирование запроса, и удалить
+    query-параметр `profile` из запроса.
+    """
+
+    header = api_constants.PROFILE_HEADER.lower().encode()
+    requested = any(
+        name == header and value.decode("latin-1").lower() in PROFILE_FLAG_VALUES
+        for name, value in scope["headers"]
+    )
+
+    query = parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)
+    flags = [value for name, value in query if name == "profile"]
+    if flags:
+        requested = requested or flags[-1].lower() in PROFILE_FLAG_VALUES
+        scope["query_string"] = urlencode(
+            [(name, value) for name, value in query if name != "profile"]
+        ).encode("latin-1")
+    return requested
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware профилирования запросов по заголовку `X-Profile`
+    или query-параметру `profile`.
+
+    Профилировщик и `tracemalloc` общие для процесса, поэтому запросы
+    профилируются по одному, а в профиль попадают и другие запросы,
+    выполняемые одновременно с профилируемым.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._lock = asyncio.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not pop_profile_flag(scope):
+            await self.app(scope, receive, send)
+            return
+
+        async with self._lock:
+            await self._profile(scope, receive, send)
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send) -> None:
+        profile_id = uuid.uuid4().hex
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[api_constants.PROFILE_ID_HEADER] = (
+                    profile_id
+                )
+            await send(message)
+
+        started_tracemalloc = not tracemalloc.is_tracing()
+        if started_tracemalloc:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        sampler = StackSampler(
+            threading.get_ident(), interval=api_settings.PROFILING_INTERVAL
+        )
+        sampler.start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            sampler.stop()
+            after = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if started_tracemalloc:
+                tracemalloc.stop()
+
+            save_profile(
+                profile_id,
+                folded=sampler.get_folded(),
+                summary={
+                    "id": profile_id,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "duration_ms": round(duration * 1000, 3),
+                    "samples": sum(sampler.stacks.values()),
+                    "interval_ms": api_settings.PROFILING_INTERVAL * 1000,
+                    "peak_memory_kib": round(peak / 1024, 1),
+                    "top_allocations": get_top_allocations(before, after),
+                },
+            )
+
+
+# MARK: Storage
+def get_profile_path(profile_id: str, extension: str) -> str:
+    """Получить путь к файлу профиля."""
+
+    return os.path.join(api_settings.PROFILING_DIR, f"{profile_id}.{extension}")
+
+
+def save_profile(profile_id: str, folded: str, summary: dict[str, Any]) -> None:
+    """Сохранить профиль запроса в `PROFILING_DIR`."""
+
+    os.makedirs(api_settings.PROFILING_DIR, exist_ok=True)
+    with open(get_profile_path(profile_id, "folded"), "w", encoding="utf-8") as file:
+        file.write(folded)
+    with open(get_profile_path(profile_id, "json"), "w", encoding="utf-8") as file:
+        json.dump(summary, file, ensure_ascii=False, indent=2)
+
+
+def load_profile(profile_id: str, extension: str) -> str | None:
+    """
+    Загрузить файл профиля.
+
+    Returns:
+        str|None: содержимое файла или `None`, если профиль не найден.
+    """
+
+    if not profile_id.isalnum():
+        return None
+    try:
+        with open(get_profile_path(profile_id, extension), encoding="utf-8") as file:
+            return file.read()
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,189 @@
+"""
+Модуль журнала запросов к БД.
+
+Запросы дольше `SLOW_QUERY_THRESHOLD` секунд записываются в журнал
+в формате JSON, для доли `SLOW_QUERY_EXPLAIN_RATE` медленных запросов
+`SELECT` в журнал записывается план `EXPLAIN (ANALYZE, BUFFERS)`.
+Запросы к БД подсчитываются для каждого HTTP-запроса: число запросов
+и их общее время возвращаются в заголовках ответа, а превышение
+`QUERY_BUDGET` записывается в журнал.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src import api_constants, metrics
+from src.config import api_settings
+
+__all__ = ["QueryBudgetMiddleware", "instrument_engine", "observe_statement"]
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """
+    Запросы к БД, выполненные при обработке HTTP-запроса.
+
+    Атрибуты экземпляра:
+        count (int): число запросов.
+        duration (float): общее время выполнения запросов, с.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+request_queries: ContextVar[QueryStats | None] = ContextVar(
+    "request_queries", default=None
+)
+
+# Фоновые задачи EXPLAIN, ссылки хранятся до их завершения
+_explain_tasks: set[asyncio.Task] = set()
+
+
+def _log(message: str, **data: Any) -> None:
+    """Записать в журнал предупреждение с данными в формате JSON."""
+
+    logger.warning("%s %s", message, json.dumps(data, ensure_ascii=False, default=str))
+
+
+# MARK: Statements
+def observe_statement(
+    statement: str,
+    parameters: Any,
+    duration: float,
+    engine: AsyncEngine | None = None,
+) -> None:
+    """
+    Учесть выполненный запрос к БД.
+
+    Если задан `engine`, план медленного запроса
+    получается на отдельном соединении движка.
+    """
+
+    stats = request_queries.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += duration
+
+    if duration < api_settings.SLOW_QUERY_THRESHOLD:
+        return
+    _log(
+        "Медленный запрос",
+        duration_ms=round(duration * 1000, 3),
+        dao_method=metrics.dao_method.get(),
+        statement=statement,
+    )
+    if (
+        engine is not None
+        and statement.lstrip()[:6].upper() == "SELECT"
+        and random.random() < api_settings.SLOW_QUERY_EXPLAIN_RATE
+    ):
+        task = asyncio.get_running_loop().create_task(
+            explain(engine, statement, parameters)
+        )
+        _explain_tasks.add(task)
+        task.add_done_callback(_explain_tasks.discard)
+
+
+async def explain(engine: AsyncEngine, statement: str, parameters: Any) -> None:
+    """
+    Записать в журнал план выполнения запроса `EXPLAIN (ANALYZE, BUFFERS)`.
+
+    Запрос выполняется повторно в отдельной транзакции только для чтения,
+    которая затем откатывается, поэтому план получается без данных,
+    не зафиксированных исходной транзакцией.
+    """
+
+    try:
+        async with engine.connect() as conn:
+            await conn.exec_driver_sql("SET TRANSACTION READ ONLY")
+            plan = await conn.exec_driver_sql(
+                f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters
+            )
+            _log("План медленного запроса", statement=statement, plan=plan.scalar())
+    except Exception:
+        logger.exception("Ошибка получения плана медленного запроса")
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Учитывать запросы движка `engine` в журнале запросов."""
+
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        conn.info.setdefault("query_log_start", []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_log_start"].pop()
+        observe_statement(
+            statement,
+            parameters,
+            duration,
+            engine=None if executemany else engine,
+        )
+
+    def handle_error(exception_context) -> None:
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_log_start"):
+            connection.info["query_log_start"].pop()
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", handle_error)
+
+
+# MARK: Requests
+class QueryBudgetMiddleware:
+    """
+    ASGI middleware для подсчета запросов к БД при обработке HTTP-запроса.
+
+    В ответ добавляются заголовки `X-Query-Count` и `Server-Timing`
+    с числом и общим временем запросов к БД, выполненных до начала
+    отправки ответа. Если число запросов превышает `QUERY_BUDGET`,
+    HTTP-запрос записывается в журнал.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers[api_constants.QUERY_COUNT_HEADER] = str(stats.count)
+                headers.append("Server-Timing", f"db;dur={stats.duration * 1000:.3f}")
+                if stats.count > api_settings.QUERY_BUDGET:
+                    route = scope.get("route")
+                    _log(
+                        "Превышено число запросов к БД",
+                        method=scope["method"],
+                        route=route.path if route is not None else scope["path"],
+                        query_count=stats.count,
+                        query_budget=api_settings.QUERY_BUDGET,
+                        duration_ms=round(stats.duration * 1000, 3),
+                    )
+            await send(message)
+
+        token = request_queries.set(stats)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_queries.reset(token)
@@ -0,0 +1,230 @@
+"""Модуль маршрутизации чтения по репликам Postgres."""
+
+import asyncio
+import logging
+import math
+import time
+
+from fastapi import Request, Response
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from src import api_constants
+from src.config import api_settings
+from src.database import ReplicaEngines, create_session_factory
+
+__all__ = ["Replica", "ReplicaRouter", "replica_router"]
+
+logger = logging.getLogger(__name__)
+
+# Задержка репликации в секундах: 0, если реплика получает WAL с основной БД
+# и применила весь полученный WAL, иначе - время с момента последней
+# примененной транзакции. Без подключения к основной БД полученный WAL
+# не обновляется, поэтому его совпадение с примененным не означает
+# отсутствия задержки.
+REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()
+            AND EXISTS (
+                SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming'
+            )
+            THEN 0
+        ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp())
+    END
+    """
+)
+
+
+class Replica:
+    """
+    Реплика Postgres для чтения.
+
+    Атрибуты экземпляра:
+        engine (AsyncEngine): движок реплики.
+        session_factory (async_sessionmaker): фабрика сессий реплики.
+        snapshot_session_factory (async_sessionmaker): фабрика сессий реплики
+            для чтения в снимке БД.
+        lag (float|None): последняя измеренная задержка репликации, с,
+            или `None`, если реплика недоступна.
+        checked_at (float|None): время последней проверки задержки
+            по `time.monotonic()`.
+    """
+
+    def __init__(self, engine: AsyncEngine):
+        info = {api_constants.REPLICA_SESSION_INFO_KEY: True}
+        self.engine = engine
+        self.session_factory = create_session_factory(engine, **info)
+        self.snapshot_session_factory = create_session_factory(
+            engine, snapshot=True, **info
+        )
+        self.lag: float | None = None
+        self.checked_at: float | None = None
+
+    async def check_lag(self) -> float | None:
+        """
+        Измерить задержку репликации.
+
+        Returns:
+            float|None: задержка, с, или `None`, если реплика недоступна.
+        """
+
+        self.checked_at = time.monotonic()
+        try:
+            async with asyncio.timeout(api_constants.REPLICA_LAG_CHECK_TIMEOUT):
+                async with self.engine.connect() as conn:
+                    lag = await conn.scalar(REPLICA_LAG_SQL)
+        except Exception:
+            logger.warning("Реплика %s недоступна", self.engine.url.render_as_string())
+            self.lag = None
+        else:
+            self.lag = float(lag) if lag is not None else None
+        return self.lag
+
+
+class ReplicaRouter:
+    """
+    Маршрутизатор чтения по репликам.
+
+    Чтение распределяется по кругу между репликами, задержка репликации
+    которых не превышает `max_lag`. Задержка и доступность реплик
+    проверяются в фоновой задаче каждые `lag_check_interval` секунд,
+    а при выборе реплики используется только результат последней проверки,
+    поэтому недоступная реплика не задерживает запросы. Если подходящих
+    реплик нет или они еще не проверены, чтение выполняется с основной БД.
+
+    Атрибуты экземпляра:
+        replicas (list[Replica]): реплики.
+        max_lag (float): допустимая задержка репликации, с.
+        lag_check_interval (float): интервал проверки задержки, с.
+    """
+
+    def __init__(
+        self, engines: list[AsyncEngine], max_lag: float, lag_check_interval: float
+    ):
+        self.replicas = [Replica(engine) for engine in engines]
+        self.max_lag = max_lag
+        self.lag_check_interval = lag_check_interval
+        self._next = 0
+        self._task: asyncio.Task | None = None
+
+    @property
+    def enabled(self) -> bool:
+        """Настроены ли реплики."""
+
+        return bool(self.replicas)
+
+    def _is_available(self, replica: Replica) -> bool:
+        """Проверить, что задержка реплики не превышает `max_lag`."""
+
+        return replica.lag is not None and replica.lag <= self.max_lag
+
+    def choose(self) -> Replica | None:
+        """
+        Выбрать реплику для чтения.
+
+        Returns:
+            Replica|None: реплика или `None`, если чтение
+            нужно выполнить с основной БД.
+        """
+
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[self._next]
+            self._next = (self._next + 1) % len(self.replicas)
+            if self._is_available(replica):
+                return replica
+        return None
+
+    def get_session_factory(
+        self, snapshot: bool = False
+    ) -> async_sessionmaker[AsyncSession] | None:
+        """
+        Получить фабрику сессий выбранной реплики.
+
+        Returns:
+            async_sessionmaker|None: фабрика сессий или `None`, если чтение
+            нужно выполнить с основной БД.
+        """
+
+        replica = self.choose()
+        if replica is None:
+            return None
+        return replica.snapshot_session_factory if snapshot else replica.session_factory
+
+    # MARK: Lifecycle
+    async def check_lags(self) -> None:
+        """Измерить задержку всех реплик одновременно."""
+
+        await asyncio.gather(*(replica.check_lag() for replica in self.replicas))
+
+    async def run(self) -> None:
+        """Проверять реплики с интервалом `lag_check_interval` секунд до отмены."""
+
+        while True:
+            await self.check_lags()
+            await asyncio.sleep(self.lag_check_interval)
+
+    def start(self) -> None:
+        """Запустить проверку реплик в текущем цикле событий."""
+
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Остановить проверку реплик."""
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+replica_router = ReplicaRouter(
+    engines=ReplicaEngines,
+    max_lag=api_settings.REPLICA_MAX_LAG,
+    lag_check_interval=api_settings.REPLICA_LAG_CHECK_INTERVAL,
+)
+
+
+# MARK: Read your writes
+def mark_write(response: Response) -> None:
+    """
+    Отметить запись клиента: в течение `READ_YOUR_WRITES_WINDOW` секунд
+    чтение для клиента выполняется с основной БД, чтобы клиент видел
+    собственные изменения независимо от задержки репликации.
+
+    Время записи передается в cookie `LAST_WRITE_COOKIE` и в заголовке
+    `LAST_WRITE_HEADER`: клиенты, не сохраняющие cookie, должны передавать
+    значение заголовка в следующих запросах.
+    """
+
+    last_write_at = str(time.time())
+    response.headers[api_constants.LAST_WRITE_HEADER] = last_write_at
+    response.set_cookie(
+        api_constants.LAST_WRITE_COOKIE,
+        last_write_at,
+        max_age=math.ceil(api_settings.READ_YOUR_WRITES_WINDOW),
+        httponly=True,
+        samesite="lax",
+    )
+
+
+def has_recent_write(request: Request) -> bool:
+    """
+    Проверить, выполнял ли клиент запись в течение `READ_YOUR_WRITES_WINDOW`
+    по заголовку `LAST_WRITE_HEADER` или cookie `LAST_WRITE_COOKIE`.
+    """
+
+    last_write_at = request.headers.get(
+        api_constants.LAST_WRITE_HEADER,
+        request.cookies.get(api_constants.LAST_WRITE_COOKIE),
+    )
+    try:
+        last_write_at = float(last_write_at)
+    except (TypeError, ValueError):
+        return False
+    return time.time() - last_write_at < api_settings.READ_YOUR_WRITES_WINDOW
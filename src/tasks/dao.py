@@ -1,9 +1,32 @@
+import functools
 import uuid
+from collections.abc import AsyncIterator, Collection
+from datetime import datetime, timedelta
 
-from sqlalchemy import Label, case, func, select, text, update
-from sqlalchemy.engine.row import RowMapping
+from sqlalchemy import (
+    ColumnElement,
+    Integer,
+    Label,
+    Select,
+    Table,
+    Update,
+    and_,
+    bindparam,
+    case,
+    cast,
+    false,
+    func,
+    insert,
+    null,
+    or_,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.engine.row import Row, RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src import api_constants
 from src.dao import BaseDAO
 from src.tasks.models import TaskModel
 from src.tasks.schemas import TaskCreateSchema, TaskUpdateSchema
@@ -14,36 +37,141 @@ class TaskDAO(BaseDAO[TaskModel, TaskCreateSchema, TaskUpdateSchema]):
 
     model = TaskModel
 
+    # MARK: Expressions
+    # Выражения и запросы без параметров строятся один раз: конструкции
+    # SQLAlchemy неизменяемы и переиспользуются во всех запросах.
     @classmethod
+    @functools.cache
     def _get_task_completion_exp(cls) -> Label:
         """Получить выражение для вычисления прогресса выполнения задачи."""
 
-        interval_expr = cls.model.time_to_complete * text("interval '1 second'")
-        task_end_time = cls.model.created_at + interval_expr
-        task_time_left = task_end_time - func.now()
-        zero_interval = text("interval '0'")
-
-        completion_expr = func.floor(
-            (
-                1
-                - func.extract("epoch", task_time_left)
-                / func.extract("epoch", interval_expr)
-            )
-            * 100
+        task_seconds_left = func.extract("epoch", cls.model.completes_at - func.now())
+        # Результат приводится к целому, чтобы драйвер возвращал `int`, а не `Decimal`.
+        completion_expr = cast(
+            func.floor((1 - task_seconds_left / cls.model.time_to_complete) * 100),
+            Integer,
         )
 
         return case(
             (cls.model.is_completed.is_(True), 100),
             (
-                cls.model.time_to_complete.is_not(None),
+                cls.model.completes_at.is_not(None),
                 case(
-                    (task_time_left < zero_interval, 100),
+                    (cls.model.completes_at <= func.now(), 100),
                     else_=completion_expr,
                 ),
             ),
             else_=0,
         ).label("completion")
 
+    @classmethod
+    @functools.cache
+    def get_overdue_exp(cls) -> ColumnElement[bool]:
+        """
+        Получить условие для просроченных задач: срок `completes_at` наступил,
+        но задача еще не завершена.
+
+        Условие обслуживается частичным индексом `tasks_completes_at_pending_idx`.
+        Проверка `completes_at IS NOT NULL` нужна, чтобы отрицание условия
+        включало задачи без срока завершения.
+        """
+
+        return and_(
+            cls.model.is_completed.is_(False),
+            cls.model.completes_at.is_not(None),
+            cls.model.completes_at <= func.now(),
+        )
+
+    @classmethod
+    def get_min_completion_exp(cls, min_completion: int) -> ColumnElement[bool]:
+        """
+        Получить условие для задач с прогрессом выполнения не менее `min_completion`.
+
+        Условие на прогресс выражено через `completes_at`: задача выполнена
+        не менее чем на `min_completion` %, если до срока осталось не более
+        `(100 - min_completion) %` от `time_to_complete`. Дополнительная граница
+        по `MAX_TIME_TO_COMPLETE` не зависит от строки и позволяет выбирать
+        незавершенные задачи по индексу `completes_at`.
+        """
+
+        if min_completion <= 0:
+            return true()
+
+        remaining_share = (100 - min_completion) / 100
+        max_seconds_left = api_constants.MAX_TIME_TO_COMPLETE * remaining_share
+        return or_(
+            cls.model.is_completed.is_(True),
+            and_(
+                cls.model.completes_at
+                <= func.now() + timedelta(seconds=max_seconds_left),
+                cls.model.completes_at
+                <= func.now()
+                + func.make_interval(
+                    0, 0, 0, 0, 0, 0, cls.model.time_to_complete * remaining_share
+                ),
+            ),
+        )
+
+    @classmethod
+    def get_completes_at_exp(cls, time_to_complete: int) -> ColumnElement[datetime]:
+        """
+        Получить выражение срока автоматического завершения задачи,
+        создаваемой в текущей транзакции.
+
+        Время отсчитывается так же, как значение по умолчанию `created_at`.
+        """
+
+        return func.timezone("UTC", func.now()) + timedelta(seconds=time_to_complete)
+
+    @classmethod
+    @functools.cache
+    def get_reopened_completes_at_exp(cls) -> ColumnElement[datetime | None]:
+        """
+        Получить выражение срока `completes_at` задачи, отмечаемой незавершенной.
+
+        Наступивший срок сбрасывается, иначе планировщик снова завершит
+        задачу при ближайшей проверке. Срок, который еще не наступил,
+        сохраняется.
+        """
+
+        return case(
+            (cls.model.completes_at <= func.now(), null()),
+            else_=cls.model.completes_at,
+        )
+
+    @classmethod
+    def get_title_search_exp(cls, title: str) -> ColumnElement[bool]:
+        """
+        Получить условие поиска задач по подстроке в заголовке без учета регистра.
+
+        Условие `ILIKE '%...%'` обслуживается GIN-индексом `tasks_title_trgm_idx`
+        по триграммам (`pg_trgm`), если подстрока содержит не менее 3 символов.
+        Символы `%`, `_` и `\\` в подстроке экранируются, чтобы пользовательский
+        ввод не превращался в шаблон, для которого индекс неприменим.
+        """
+
+        escaped_title = (
+            title.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        )
+        return cls.model.title.ilike(f"%{escaped_title}%", escape="\\")
+
+    @classmethod
+    def _get_ts_query_exp(cls, q: str):
+        """Получить выражение полнотекстового запроса из строки поиска."""
+
+        return func.websearch_to_tsquery(api_constants.FULL_TEXT_SEARCH_CONFIG, q)
+
+    @classmethod
+    def get_full_text_search_exp(cls, q: str) -> ColumnElement[bool]:
+        """
+        Получить условие полнотекстового поиска задач по заголовку и описанию.
+
+        Условие обслуживается GIN-индексом `tasks_search_vector_idx`
+        по хранимому столбцу `search_vector`.
+        """
+
+        return cls.model.search_vector.bool_op("@@")(cls._get_ts_query_exp(q))
+
     @classmethod
     async def get_tasks_data(
         cls,
@@ -52,33 +180,260 @@ class TaskDAO(BaseDAO[TaskModel, TaskCreateSchema, TaskUpdateSchema]):
         limit: int | None,
         asc: bool,
         session: AsyncSession,
+        cursor: tuple[datetime, uuid.UUID] | None = None,
+        with_count: bool = False,
+        count_cap: int | None = None,
+        q: str | None = None,
+        highlight: bool = False,
+        fields: Collection[str] | None = None,
     ) -> list[RowMapping]:
         """
         Получить основные данные задач с учетом фильтрации и пагинации.
 
+        Если задан `cursor` - пара `(created_at, id)` последней задачи
+        предыдущей страницы, выборка начинается сразу после нее.
+
+        Если задан `with_count=True`, каждая строка дополнительно содержит
+        `total_count` - общее количество задач, соответствующих `where`
+        без учета пагинации. Страница и количество получаются одним запросом.
+        Если задан `count_cap`, подсчитывается не более `count_cap` задач.
+
+        Если задан `q`, задачи сортируются по релевантности `rank`, а при
+        `highlight=True` возвращаются `title_highlight` и `description_highlight`
+        с выделенными найденными словами. Условие поиска передается в `where`.
+
+        Если задан `fields`, из заголовка, описания, времени до завершения
+        и прогресса выполнения `completion` выбираются только перечисленные
+        поля. Поля `id`, `is_completed`, `completes_at`, `created_at`
+        и `updated_at` выбираются всегда, так как нужны для пагинации,
+        кэширования и формирования ETag.
+
         Returns:
             list[RowMapping]: список `RowMapping` с основными данными задач.
         """
 
-        stmt = (
-            select(
+        stmt = cls.get_tasks_data_stmt(
+            *where,
+            offset=offset,
+            limit=limit,
+            asc=asc,
+            cursor=cursor,
+            with_count=with_count,
+            count_cap=count_cap,
+            q=q,
+            highlight=highlight,
+            fields=fields,
+        )
+        result = await session.execute(stmt)
+        return result.mappings().all()
+
+    @classmethod
+    def get_tasks_data_stmt(
+        cls,
+        *where,
+        offset: int | None,
+        limit: int | None,
+        asc: bool,
+        cursor: tuple[datetime, uuid.UUID] | None = None,
+        with_count: bool = False,
+        count_cap: int | None = None,
+        q: str | None = None,
+        highlight: bool = False,
+        fields: Collection[str] | None = None,
+    ) -> Select:
+        """
+        Получить запрос `get_tasks_data`.
+
+        Основа запроса со списком столбцов строится один раз для каждого
+        набора полей `fields`, к ней добавляются условия и пагинация.
+        """
+
+        stmt = cls._get_tasks_base_stmt(None if fields is None else frozenset(fields))
+        columns = []
+        if with_count:
+            columns.append(cls._get_count_exp(*where, cap=count_cap))
+
+        order_by = cls._get_order_by(cls.model.created_at, asc)
+        if q is not None:
+            ts_query = cls._get_ts_query_exp(q)
+            rank_exp = func.ts_rank(cls.model.search_vector, ts_query)
+            columns.append(rank_exp.label("rank"))
+            if highlight:
+                columns += [
+                    func.ts_headline(
+                        api_constants.FULL_TEXT_SEARCH_CONFIG,
+                        cls.model.title,
+                        ts_query,
+                    ).label("title_highlight"),
+                    func.ts_headline(
+                        api_constants.FULL_TEXT_SEARCH_CONFIG,
+                        cls.model.description,
+                        ts_query,
+                    ).label("description_highlight"),
+                ]
+            order_by = (rank_exp.desc(), *order_by)
+
+        if cursor is not None:
+            where = (*where, cls._get_cursor_exp(cls.model.created_at, asc, cursor))
+
+        return (
+            stmt.add_columns(*columns)
+            .where(*where)
+            .offset(offset)
+            .limit(limit)
+            .order_by(*order_by)
+        )
+
+    @classmethod
+    @functools.cache
+    def _get_tasks_base_stmt(cls, fields: frozenset[str] | None) -> Select:
+        """
+        Получить основу запроса `get_tasks_data` со списком столбцов.
+
+        Из заголовка, описания, времени до завершения и прогресса
+        выполнения `completion` выбираются только поля из `fields`,
+        если они заданы. Запрос строится один раз для каждого набора полей.
+        """
+
+        columns = [
+            cls.model.id,
+            cls.model.is_completed,
+            cls.model.completes_at,
+            cls.model.created_at,
+            cls.model.updated_at,
+        ]
+        optional_columns = {
+            "title": cls.model.title,
+            "description": cls.model.description,
+            "time_to_complete": cls.model.time_to_complete,
+        }
+        columns += [
+            column
+            for name, column in optional_columns.items()
+            if fields is None or name in fields
+        ]
+        if fields is None or "completion" in fields:
+            columns.append(cls._get_task_completion_exp())
+        return select(*columns)
+
+    @classmethod
+    async def merge_staged_tasks(
+        cls, staging_table: Table, session: AsyncSession
+    ) -> int:
+        """
+        Добавить задачи из промежуточной таблицы одним запросом
+        `INSERT ... SELECT`.
+
+        Промежуточная таблица содержит столбцы `id`, `title`, `description`
+        и `time_to_complete`. Срок `completes_at` отсчитывается от времени
+        начала транзакции, как и значение по умолчанию `created_at`.
+
+        Returns:
+            int: количество добавленных задач.
+        """
+
+        staged = staging_table.c
+        stmt = insert(cls.model).from_select(
+            [
                 cls.model.id,
                 cls.model.title,
                 cls.model.description,
                 cls.model.is_completed,
-                cls._get_task_completion_exp(),
-            )
+                cls.model.time_to_complete,
+                cls.model.completes_at,
+            ],
+            select(
+                staged.id,
+                staged.title,
+                staged.description,
+                false(),
+                staged.time_to_complete,
+                func.timezone("UTC", func.now())
+                + func.make_interval(0, 0, 0, 0, 0, 0, staged.time_to_complete),
+            ),
+        )
+        result = await session.execute(stmt)
+        return result.rowcount
+
+    @classmethod
+    def get_tasks_export_columns(cls) -> list:
+        """Получить выгружаемые столбцы задач."""
+
+        return [
+            cls.model.id,
+            cls.model.title,
+            cls.model.description,
+            cls.model.is_completed,
+            cls.model.time_to_complete,
+            cls.model.completes_at,
+            cls.model.created_at,
+            cls.model.updated_at,
+            cls._get_task_completion_exp(),
+        ]
+
+    @classmethod
+    async def stream_tasks_data(
+        cls,
+        *where,
+        batch_size: int,
+        session: AsyncSession,
+    ) -> AsyncIterator[list[Row]]:
+        """
+        Получить задачи, соответствующие критериям, частями по `batch_size`
+        строк в порядке создания.
+
+        Строки читаются серверным курсором, поэтому в памяти одновременно
+        находится не более одной части выборки. Столбцы соответствуют
+        `get_tasks_export_columns`.
+
+        Returns:
+            AsyncIterator[list[Row]]: части выборки.
+        """
+
+        stmt = (
+            select(*cls.get_tasks_export_columns())
             .where(*where)
-            .offset(offset)
-            .limit(limit)
-            .order_by(
-                cls.model.created_at.asc() if asc else cls.model.created_at.desc()
-            )
+            .order_by(*cls._get_order_by(cls.model.created_at, asc=True))
+            .execution_options(yield_per=batch_size)
         )
+        result = await session.stream(stmt)
+        async for rows in result.partitions():
+            yield rows
 
-        result = await session.execute(stmt)
+    @classmethod
+    async def get_tasks_data_by_ids(
+        cls, ids: list[uuid.UUID], session: AsyncSession
+    ) -> list[RowMapping]:
+        """
+        Получить основные данные задач с `id` из `ids` одним запросом
+        `WHERE id = ANY(:ids)`.
+
+        Помимо полей задачи строки содержат `updated_at` для формирования ETag.
+
+        Returns:
+            list[RowMapping]: список `RowMapping` с основными данными
+                найденных задач в произвольном порядке.
+        """
+
+        result = await session.execute(cls._get_tasks_data_by_ids_stmt(), {"ids": ids})
         return result.mappings().all()
 
+    @classmethod
+    @functools.cache
+    def _get_tasks_data_by_ids_stmt(cls) -> Select:
+        """Получить запрос `get_tasks_data_by_ids` с параметром `ids`."""
+
+        return select(
+            cls.model.id,
+            cls.model.title,
+            cls.model.description,
+            cls.model.is_completed,
+            cls.model.time_to_complete,
+            cls.model.completes_at,
+            cls.model.updated_at,
+            cls._get_task_completion_exp(),
+        ).where(cls._get_ids_param_exp())
+
     @classmethod
     async def update_task_full_data(
         cls,
@@ -91,15 +446,113 @@ class TaskDAO(BaseDAO[TaskModel, TaskCreateSchema, TaskUpdateSchema]):
 
         Returns:
             RowMapping:
-                `RowMapping` из `id` задачи и прогресса выполнения `completion`
-                или `None`, если задача не найдена.
+                `RowMapping` из `id` задачи, срока завершения и прогресса
+                выполнения `completion` или `None`, если задача не найдена.
+        """
+
+        result = await session.execute(
+            cls._get_update_task_full_data_stmt(reopen=not task_data.is_completed),
+            {"task_id": task_id, **task_data.model_dump()},
+        )
+        return result.mappings().one_or_none()
+
+    @classmethod
+    @functools.cache
+    def _get_update_task_full_data_stmt(cls, reopen: bool) -> Update:
+        """
+        Получить запрос `update_task_full_data` с параметром `task_id`.
+
+        Обновляемые поля не задаются в запросе, а передаются
+        параметрами при выполнении вместе с `task_id`. Если задача
+        отмечается незавершенной (`reopen=True`), наступивший срок
+        `completes_at` сбрасывается.
+        """
+
+        stmt = update(cls.model).where(cls.model.id == bindparam("task_id"))
+        if reopen:
+            stmt = stmt.values(completes_at=cls.get_reopened_completes_at_exp())
+        return stmt.returning(
+            cls.model.id,
+            cls.model.time_to_complete,
+            cls.model.completes_at,
+            cls._get_task_completion_exp(),
+        )
+
+    @classmethod
+    async def complete_due_tasks(
+        cls,
+        limit: int,
+        session: AsyncSession,
+    ) -> list[float]:
         """
+        Завершить не более `limit` задач, срок `completes_at` которых наступил.
 
+        Задачи выбираются по частичному индексу `tasks_completes_at_pending_idx`
+        и блокируются с `FOR UPDATE SKIP LOCKED`, поэтому параллельные вызовы
+        из нескольких реплик API не завершают одни и те же задачи повторно.
+
+        Returns:
+            list[float]: задержки завершения задач относительно срока в секундах.
+        """
+
+        due_tasks = (
+            select(cls.model.id)
+            .where(
+                cls.model.is_completed.is_(False),
+                cls.model.completes_at <= func.now(),
+            )
+            .order_by(cls.model.completes_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("due_tasks")
+        )
         stmt = (
             update(cls.model)
-            .where(cls.model.id == task_id)
-            .values(**task_data.model_dump())
-            .returning(cls.model.id, cls._get_task_completion_exp())
+            .where(cls.model.id.in_(select(due_tasks.c.id)))
+            .values(is_completed=True)
+            .returning(func.extract("epoch", func.now() - cls.model.completes_at))
         )
         result = await session.execute(stmt)
-        return result.mappings().one_or_none()
+        return [float(lag) for lag in result.scalars().all()]
+
+    @classmethod
+    async def add_many_tasks(
+        cls,
+        tasks_data: list[TaskCreateSchema],
+        session: AsyncSession,
+    ) -> list[uuid.UUID]:
+        """
+        Добавить задачи в текущую сессию пакетно.
+
+        Менее `BULK_COPY_THRESHOLD` задач добавляются одним запросом
+        `INSERT ... VALUES ... RETURNING id`, большее число - командой `COPY`.
+        Срок `completes_at` отсчитывается от времени начала транзакции,
+        как и значение по умолчанию `created_at`.
+
+        Returns:
+            list[uuid.UUID]: `id` созданных задач в порядке `tasks_data`.
+        """
+
+        current_time = await session.scalar(select(func.timezone("UTC", func.now())))
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "title": task_data.title,
+                "description": task_data.description,
+                "is_completed": False,
+                "time_to_complete": task_data.time_to_complete,
+                "completes_at": None
+                if task_data.time_to_complete is None
+                else current_time + timedelta(seconds=task_data.time_to_complete),
+            }
+            for task_data in tasks_data
+        ]
+        if len(rows) < api_constants.BULK_COPY_THRESHOLD:
+            return await cls.add_many_returning_id(session=session, objs_in=rows)
+
+        await cls.copy_records(
+            session=session,
+            records=[tuple(row.values()) for row in rows],
+            columns=list(rows[0]),
+        )
+        return [row["id"] for row in rows]
@@ -0,0 +1,205 @@
+"""Модуль импорта задач из файлов CSV и NDJSON."""
+
+import asyncio
+import csv
+import io
+import itertools
+import time
+import uuid
+from collections.abc import Iterator
+from typing import Any, BinaryIO
+
+from pydantic import ValidationError
+from sqlalchemy import Column, Integer, MetaData, String, Table
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import api_constants, exceptions
+from src.tasks.dao import TaskDAO
+from src.tasks.schemas import (
+    TaskBulkItemErrorSchema,
+    TaskCreateSchema,
+    TaskFileFormat,
+    TaskImportResultSchema,
+)
+from src.tasks.service import TaskService
+
+__all__ = ["TaskImporter"]
+
+# Временная таблица удаляется при завершении транзакции импорта.
+TASKS_STAGING_TABLE = Table(
+    "tasks_import",
+    MetaData(),
+    Column("id", UUID),
+    Column("title", String),
+    Column("description", String),
+    Column("time_to_complete", Integer),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+
+class TaskImporter:
+    """
+    Класс для импорта задач из файлов CSV и NDJSON.
+
+    Файл читается и проверяется частями по `IMPORT_CHUNK_SIZE` записей
+    в отдельном потоке, поэтому потребление памяти не зависит от размера
+    файла, а разбор файла не блокирует цикл событий. Записи,
+    прошедшие валидацию, копируются командой `COPY` во временную таблицу,
+    после чего добавляются в `tasks` одним запросом `INSERT ... SELECT`.
+    Импорт выполняется в одной транзакции.
+    """
+
+    @classmethod
+    def _iter_raw_records(
+        cls, text_file: io.TextIOWrapper, file_format: TaskFileFormat
+    ) -> Iterator[dict[str, Any] | str]:
+        """
+        Получить записи файла: словари для CSV с заголовком
+        и строки JSON для NDJSON. Пустые значения CSV не передаются.
+        """
+
+        if file_format == "csv":
+            for row in csv.DictReader(text_file):
+                yield {
+                    key: value
+                    for key, value in row.items()
+                    if key is not None and value not in ("", None)
+                }
+        else:
+            for line in text_file:
+                if line.strip():
+                    yield line
+
+    @classmethod
+    def _validate_chunk(
+        cls, raw_records: list[dict[str, Any] | str], start_index: int
+    ) -> tuple[list[tuple], list[TaskBulkItemErrorSchema]]:
+        """
+        Проверить часть записей схемой `TaskCreateSchema`.
+
+        Returns:
+            tuple: значения столбцов `TASKS_STAGING_TABLE` для записей,
+                прошедших валидацию, и ошибки остальных записей.
+        """
+
+        records, errors = [], []
+        for index, raw_record in enumerate(raw_records, start=start_index):
+            try:
+                if isinstance(raw_record, str):
+                    task_data = TaskCreateSchema.model_validate_json(raw_record)
+                else:
+                    task_data = TaskCreateSchema.model_validate(raw_record)
+            except ValidationError as ex:
+                errors.append(
+                    TaskBulkItemErrorSchema(
+                        index=index,
+                        errors=ex.errors(
+                            include_url=False,
+                            include_context=False,
+                            include_input=False,
+                        ),
+                    )
+                )
+                continue
+
+            records.append(
+                (
+                    uuid.uuid4(),
+                    task_data.title,
+                    task_data.description,
+                    task_data.time_to_complete,
+                )
+            )
+        return records, errors
+
+    @classmethod
+    def _read_chunk(
+        cls, raw_records: Iterator[dict[str, Any] | str], start_index: int
+    ) -> tuple[int, list[tuple], list[TaskBulkItemErrorSchema]]:
+        """
+        Прочитать из файла и проверить следующие `IMPORT_CHUNK_SIZE` записей.
+
+        Returns:
+            tuple: количество прочитанных записей, значения столбцов
+                `TASKS_STAGING_TABLE` для записей, прошедших валидацию,
+                и ошибки остальных записей.
+        """
+
+        chunk = list(itertools.islice(raw_records, api_constants.IMPORT_CHUNK_SIZE))
+        records, errors = cls._validate_chunk(chunk, start_index=start_index)
+        return len(chunk), records, errors
+
+    @classmethod
+    async def import_tasks(
+        cls,
+        file: BinaryIO,
+        file_format: TaskFileFormat,
+        session: AsyncSession,
+    ) -> TaskImportResultSchema:
+        """
+        Импортировать задачи из файла CSV или NDJSON в кодировке UTF-8.
+
+        Записи, не прошедшие валидацию, пропускаются, в результате
+        возвращаются ошибки первых `IMPORT_MAX_ERRORS` из них.
+
+        Raises:
+            InvalidRequestBody: Файл не удается прочитать `HTTP_400_BAD_REQUEST`.
+        """
+
+        start = time.perf_counter()
+        total = rejected = 0
+        errors = []
+
+        connection = await session.connection()
+        await connection.run_sync(TASKS_STAGING_TABLE.create)
+
+        text_file = io.TextIOWrapper(file, encoding="utf-8", newline="")
+        try:
+            raw_records = cls._iter_raw_records(text_file, file_format)
+            while True:
+                # Разбор и валидация выполняются в отдельном потоке,
+                # чтобы не блокировать цикл событий на больших файлах.
+                chunk_size, records, chunk_errors = await asyncio.to_thread(
+                    cls._read_chunk, raw_records, start_index=total
+                )
+                if not chunk_size:
+                    break
+                total += chunk_size
+                rejected += len(chunk_errors)
+                errors.extend(
+                    chunk_errors[: api_constants.IMPORT_MAX_ERRORS - len(errors)]
+                )
+                if records:
+                    await TaskDAO.copy_records(
+                        session=session,
+                        records=records,
+                        columns=[column.name for column in TASKS_STAGING_TABLE.c],
+                        table_name=TASKS_STAGING_TABLE.name,
+                    )
+        except (UnicodeDecodeError, csv.Error) as ex:
+            await session.rollback()
+            raise exceptions.InvalidRequestBody from ex
+        finally:
+            # Файл закрывает вызывающая сторона.
+            text_file.detach()
+
+        imported = 0
+        if total > rejected:
+            imported = await TaskDAO.merge_staged_tasks(
+                staging_table=TASKS_STAGING_TABLE, session=session
+            )
+        await session.commit()
+        if imported:
+            TaskService.invalidate_cache()
+
+        duration = time.perf_counter() - start
+        return TaskImportResultSchema(
+            total=total,
+            imported=imported,
+            rejected=rejected,
+            duration=duration,
+            rows_per_second=imported / duration if duration else 0,
+            errors=errors,
+        )
@@ -1,11 +1,11 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import TIMESTAMP
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import TIMESTAMP, Computed, Index, text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
-from src.api_constants import CURRENT_TIMESTAMP_UTC
+from src.api_constants import CURRENT_TIMESTAMP_UTC, FULL_TEXT_SEARCH_CONFIG
 from src.database import Base
 
 
@@ -13,6 +13,21 @@ class TaskModel(Base):
     """Модель задач."""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("tasks_created_at_idx", "created_at", "id"),
+        Index(
+            "tasks_title_trgm_idx",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index("tasks_search_vector_idx", "search_vector", postgresql_using="gin"),
+        Index(
+            "tasks_completes_at_pending_idx",
+            "completes_at",
+            postgresql_where=text("is_completed IS false"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID, primary_key=True, default=uuid.uuid4)
     title: Mapped[str] = mapped_column(comment="Заголовок задачи")
@@ -26,13 +41,28 @@ class TaskModel(Base):
         nullable=True,
         comment="Время до завершения задачи в секундах, задаваемое при создании",
     )
+    completes_at: Mapped[datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=True,
+        comment="Дата и время автоматического завершения задачи",
+    )
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
         server_default=CURRENT_TIMESTAMP_UTC,
-        index=True,
     )
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
         server_default=CURRENT_TIMESTAMP_UTC,
         onupdate=CURRENT_TIMESTAMP_UTC,
     )
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{FULL_TEXT_SEARCH_CONFIG}', title), 'A') || "
+            f"setweight(to_tsvector('{FULL_TEXT_SEARCH_CONFIG}', "
+            "coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+        comment="Вектор полнотекстового поиска по заголовку и описанию задачи",
+    )
@@ -0,0 +1,222 @@
+import functools
+import time
+import uuid
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import ColumnElement
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import metrics, tracing
+from src.tasks.dao import TaskDAO
+from src.tasks.schemas import TaskFilterSchema, TaskQuerySchema
+
+
+@tracing.instrument_class
+@metrics.instrument_dao
+class TaskRawDAO:
+    """
+    DAO для чтения задач запросами asyncpg без построения запросов SQLAlchemy
+    и без обработки результатов ORM.
+
+    Запросы выполняются на соединении asyncpg сессии, поэтому используют
+    пул движка и транзакцию сессии. Текст запроса зависит только от набора
+    фильтров, а значения передаются позиционными параметрами, поэтому
+    asyncpg кэширует подготовленные выражения на соединении.
+    Выражения прогресса выполнения и просроченности задачи компилируются
+    из выражений `TaskDAO`, чтобы результаты совпадали с ORM.
+
+    Поддерживаются фильтры `ids`, `is_completed`, `overdue` и `due_before`,
+    остальные запросы выполняются через `TaskDAO`.
+
+    Запросы выполняются в обход событий SQLAlchemy, поэтому учитываются
+    в метриках и журнале запросов явно.
+    """
+
+    table_name = TaskDAO.model.__tablename__
+
+    @classmethod
+    def supports(cls, query: TaskQuerySchema) -> bool:
+        """Проверить, может ли список задач быть получен через `TaskRawDAO`."""
+
+        return (
+            query.title is None
+            and query.q is None
+            and query.min_completion is None
+            and query.fields is None
+            and query.count_strategy != "estimated"
+        )
+
+    # MARK: SQL
+    @staticmethod
+    def _compile(exp: ColumnElement) -> str:
+        """Скомпилировать выражение SQLAlchemy без параметров в текст SQL."""
+
+        return str(
+            exp.compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+        )
+
+    @classmethod
+    @functools.cache
+    def _get_columns_sql(cls) -> str:
+        """Получить список столбцов основных данных задачи."""
+
+        completion_sql = cls._compile(TaskDAO._get_task_completion_exp().element)
+        return (
+            "id, title, description, is_completed, time_to_complete, completes_at, "
+            f"{completion_sql} AS completion"
+        )
+
+    @classmethod
+    @functools.cache
+    def _get_overdue_sql(cls) -> str:
+        """Получить условие для просроченных задач."""
+
+        return cls._compile(TaskDAO.get_overdue_exp())
+
+    @staticmethod
+    def _add_param(args: list[Any], value: Any) -> str:
+        """Добавить значение параметра и получить его позиционную ссылку."""
+
+        args.append(value)
+        return f"${len(args)}"
+
+    @classmethod
+    def _get_where_sql(cls, query: TaskFilterSchema, args: list[Any]) -> list[str]:
+        """Получить условия фильтрации задач по параметрам фильтрации."""
+
+        where = []
+        if query.ids is not None:
+            where.append(f"id = ANY({cls._add_param(args, query.ids)}::uuid[])")
+        if query.is_completed is not None:
+            where.append(f"is_completed IS {str(query.is_completed).lower()}")
+        if query.overdue is not None:
+            overdue_sql = cls._get_overdue_sql()
+            where.append(overdue_sql if query.overdue else f"NOT ({overdue_sql})")
+        if query.due_before is not None:
+            param = cls._add_param(args, query.due_before)
+            where.append(f"completes_at <= {param}::timestamptz")
+        return where
+
+    @classmethod
+    def _get_count_sql(cls, where: list[str], cap: int | None, args: list[Any]) -> str:
+        """
+        Получить запрос для подсчета задач, соответствующих условиям `where`.
+
+        Если задан `cap`, подсчитывается не более `cap` задач.
+        """
+
+        where_sql = f" WHERE {' AND '.join(where)}" if where else ""
+        if cap is None:
+            return f"SELECT count(*) FROM {cls.table_name}{where_sql}"
+        return (
+            f"SELECT count(*) FROM (SELECT 1 FROM {cls.table_name}{where_sql} "
+            f"LIMIT {cls._add_param(args, cap)}) AS capped"
+        )
+
+    # MARK: Read
+    @classmethod
+    async def _fetch(
+        cls, sql: str, args: list[Any], session: AsyncSession
+    ) -> list[dict[str, Any]]:
+        """Выполнить запрос на соединении asyncpg сессии."""
+
+        connection = await TaskDAO.get_driver_connection(session)
+        start = time.perf_counter()
+        records = await connection.fetch(sql, *args)
+        TaskDAO.observe_driver_statement(sql, args, start=start)
+        return [dict(record) for record in records]
+
+    @classmethod
+    async def get_tasks_data(
+        cls,
+        query: TaskFilterSchema,
+        offset: int | None,
+        limit: int | None,
+        asc: bool,
+        session: AsyncSession,
+        cursor: tuple[datetime, uuid.UUID] | None = None,
+        with_count: bool = False,
+        count_cap: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Получить основные данные задач с учетом фильтрации и пагинации.
+
+        Аналог `TaskDAO.get_tasks_data` для фильтров, поддерживаемых
+        `TaskRawDAO`: строки содержат те же поля, включая `created_at`,
+        `updated_at` и `total_count` при `with_count=True`.
+
+        Returns:
+            list[dict]: основные данные задач.
+        """
+
+        args: list[Any] = []
+        where = cls._get_where_sql(query, args)
+
+        columns_sql = f"{cls._get_columns_sql()}, created_at, updated_at"
+        if with_count:
+            count_sql = cls._get_count_sql(where, cap=count_cap, args=args)
+            columns_sql += f", ({count_sql}) AS total_count"
+
+        if cursor is not None:
+            created_at_param = cls._add_param(args, cursor[0])
+            id_param = cls._add_param(args, cursor[1])
+            where = [
+                *where,
+                f"(created_at, id) {'>' if asc else '<'} "
+                f"({created_at_param}::timestamptz, {id_param}::uuid)",
+            ]
+
+        direction = "ASC" if asc else "DESC"
+        sql = f"SELECT {columns_sql} FROM {cls.table_name}"
+        if where:
+            sql += f" WHERE {' AND '.join(where)}"
+        sql += f" ORDER BY created_at {direction}, id {direction}"
+        if limit is not None:
+            sql += f" LIMIT {cls._add_param(args, limit)}"
+        if offset:
+            sql += f" OFFSET {cls._add_param(args, offset)}"
+
+        return await cls._fetch(sql, args, session=session)
+
+    @classmethod
+    async def count(
+        cls, query: TaskFilterSchema, session: AsyncSession, cap: int | None = None
+    ) -> int:
+        """
+        Посчитать задачи, соответствующие параметрам фильтрации.
+
+        Если задан `cap`, подсчитывается не более `cap` задач.
+        """
+
+        args: list[Any] = []
+        where = cls._get_where_sql(query, args)
+        sql = cls._get_count_sql(where, cap=cap, args=args)
+        connection = await TaskDAO.get_driver_connection(session)
+        start = time.perf_counter()
+        count = await connection.fetchval(sql, *args)
+        TaskDAO.observe_driver_statement(sql, args, start=start)
+        return count
+
+    @classmethod
+    async def get_tasks_data_by_ids(
+        cls, ids: list[uuid.UUID], session: AsyncSession
+    ) -> list[dict[str, Any]]:
+        """
+        Получить основные данные задач с `id` из `ids` одним запросом.
+
+        Аналог `TaskDAO.get_tasks_data_by_ids`: помимо полей задачи
+        строки содержат `updated_at` для формирования ETag.
+
+        Returns:
+            list[dict]: основные данные найденных задач в произвольном порядке.
+        """
+
+        sql = (
+            f"SELECT {cls._get_columns_sql()}, updated_at "
+            f"FROM {cls.table_name} WHERE id = ANY($1::uuid[])"
+        )
+        return await cls._fetch(sql, [ids], session=session)
@@ -1,21 +1,51 @@
 import uuid
 
-from fastapi import APIRouter, BackgroundTasks, Depends, Query, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Header,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.dependencies import get_session
+from src import api_constants, etag, negotiation, tracing
+from src.base_schemas import BaseListReadSchema
+from src.config import api_settings
+from src.dependencies import get_read_session, get_snapshot_session, get_write_session
+from src.tasks.importer import TaskImporter
+from src.tasks.scheduler import task_completion_scheduler
 from src.tasks.schemas import (
+    TaskBulkCreateResultSchema,
+    TaskBulkResultSchema,
+    TaskBulkSelectorSchema,
+    TaskBulkUpdateSchema,
+    TaskCacheStatsSchema,
     TaskCreateSchema,
+    TaskExportQuerySchema,
+    TaskFileFormat,
+    TaskImportResultSchema,
     TaskQuerySchema,
     TaskReadListSchema,
     TaskReadSchema,
+    TaskSchedulerStatsSchema,
     TaskUpdateSchema,
 )
 from src.tasks.service import TaskService
 
 __all__ = ["tasks_router"]
 
-tasks_router = APIRouter(prefix="/tasks", tags=["Задачи"])
+tasks_router = APIRouter(
+    prefix="/tasks",
+    tags=["Задачи"],
+    route_class=negotiation.NegotiatedRoute,
+    default_response_class=negotiation.NegotiatedResponse,
+)
 
 
 # MARK: Get
@@ -24,20 +54,185 @@ tasks_router = APIRouter(prefix="/tasks", tags=["Задачи"])
     summary="Получить список задач",
     status_code=status.HTTP_200_OK,
     response_model=None,
-    responses={status.HTTP_200_OK: {"model": TaskReadListSchema}},
+    responses={
+        status.HTTP_200_OK: {"model": TaskReadListSchema},
+        status.HTTP_304_NOT_MODIFIED: {"description": "Список задач не изменился"},
+    },
 )
+@tracing.traced()
 async def get_tasks_route(
+    response: Response,
     query: TaskQuerySchema = Query(),
-    session: AsyncSession = Depends(get_session),
-) -> TaskReadListSchema:
+    if_none_match: str | None = Header(default=None),
+    session: AsyncSession = Depends(get_read_session),
+) -> BaseListReadSchema | Response:
     """
     Получить список задач с фильтрацией по переданным
     query-параметрам и с учетом пагинации.
 
-    По умолчанию сортировка выполняется по дате создания задачи.
+    По умолчанию сортировка выполняется по дате создания задачи,
+    при полнотекстовом поиске `q` - по релевантности.
+    Для обхода глубоких страниц передайте `next_cursor` предыдущего
+    ответа в параметре `cursor`.
+
+    Параметр `fields` ограничивает поля задач в ответе и столбцы,
+    выбираемые из БД.
+
+    Ответ возвращается в формате MessagePack, если он запрошен
+    в заголовке `Accept: application/msgpack`.
+
+    Ответ содержит заголовок `ETag`, если список не содержит задач
+    с растущим прогрессом выполнения. ETag формируется по странице задач.
+    Если значение передано в заголовке `If-None-Match`, сначала выбираются
+    только служебные поля задач страницы, и если страница не изменилась,
+    возвращается `304 Not Modified` без получения данных задач.
+    """
+
+    if if_none_match:
+        # Условный запрос проверяется до получения и сериализации задач.
+        tasks_etag = await TaskService.get_tasks_etag(query=query, session=session)
+        if tasks_etag is not None:
+            tasks_etag = negotiation.representation_etag(tasks_etag)
+            if etag.etag_matches(if_none_match, tasks_etag):
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED,
+                    headers={"ETag": tasks_etag},
+                )
+
+    as_json = (
+        api_settings.TASKS_FAST_JSON
+        and negotiation.get_response_media_type() == api_constants.JSON_MEDIA_TYPE
+    )
+    if as_json:
+        tasks_list, tasks_etag = await TaskService.get_tasks_json(
+            query=query, session=session
+        )
+    else:
+        tasks_list, tasks_etag = await TaskService.get_tasks(
+            query=query, session=session
+        )
+
+    if tasks_etag is not None:
+        response.headers["ETag"] = negotiation.representation_etag(tasks_etag)
+
+    if as_json:
+        return Response(
+            content=tasks_list,
+            media_type=api_constants.JSON_MEDIA_TYPE,
+            headers=response.headers,
+        )
+    return tasks_list
+
+
+@tasks_router.get(
+    "/export",
+    summary="Выгрузить задачи",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {
+                api_constants.NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}},
+                api_constants.CSV_MEDIA_TYPE: {"schema": {"type": "string"}},
+            }
+        }
+    },
+)
+@tracing.traced()
+async def export_tasks_route(
+    query: TaskExportQuerySchema = Query(),
+    session: AsyncSession = Depends(get_snapshot_session),
+) -> StreamingResponse:
+    """
+    Выгрузить задачи с фильтрацией по переданным query-параметрам
+    в формате NDJSON или CSV в порядке создания.
+
+    Задачи передаются потоком из одного снимка БД, поэтому выгрузка
+    согласована и не зависит от объема таблицы.
+    """
+
+    media_type = (
+        api_constants.CSV_MEDIA_TYPE
+        if query.format == "csv"
+        else api_constants.NDJSON_MEDIA_TYPE
+    )
+    return StreamingResponse(
+        TaskService.export_tasks(query=query, session=session),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="tasks.{query.format}"'},
+    )
+
+
+@tasks_router.get(
+    "/cache",
+    summary="Получить метрики кэшей задач",
+    status_code=status.HTTP_200_OK,
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": TaskCacheStatsSchema}},
+)
+@tracing.traced()
+async def get_cache_stats_route() -> TaskCacheStatsSchema:
+    """Получить метрики кэшей задач в текущем процессе API."""
+
+    return TaskService.get_cache_stats()
+
+
+@tasks_router.get(
+    "/scheduler",
+    summary="Получить метрики планировщика завершения задач",
+    status_code=status.HTTP_200_OK,
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": TaskSchedulerStatsSchema}},
+)
+@tracing.traced()
+async def get_scheduler_stats_route() -> TaskSchedulerStatsSchema:
+    """
+    Получить метрики планировщика автоматического завершения задач
+    в текущем процессе API, включая задержку завершения относительно срока.
     """
 
-    return await TaskService.get_tasks(query=query, session=session)
+    return task_completion_scheduler.stats
+
+
+@tasks_router.get(
+    "/{task_id}",
+    summary="Получить задачу по id",
+    status_code=status.HTTP_200_OK,
+    response_model=None,
+    responses={
+        status.HTTP_200_OK: {"model": TaskReadSchema},
+        status.HTTP_304_NOT_MODIFIED: {"description": "Задача не изменилась"},
+    },
+)
+@tracing.traced()
+async def get_task_route(
+    task_id: uuid.UUID,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    session: AsyncSession = Depends(get_read_session),
+) -> TaskReadSchema | Response:
+    """
+    Получить задачу по id.
+
+    Ответ содержит заголовок `ETag`, если прогресс выполнения задачи
+    не растет. Если значение передано в заголовке `If-None-Match`
+    и задача не изменилась, возвращается `304 Not Modified`.
+
+    Raises:
+
+        TaskNotFound: Задача не найдена `HTTP_404_NOT_FOUND`.
+    """
+
+    task, task_etag = await TaskService.get_task(task_id=task_id, session=session)
+    if task_etag is not None:
+        task_etag = negotiation.representation_etag(task_etag)
+        if etag.etag_matches(if_none_match, task_etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": task_etag}
+            )
+        response.headers["ETag"] = task_etag
+
+    return task
 
 
 # MARK: Post
@@ -48,24 +243,169 @@ async def get_tasks_route(
     response_model=None,
     responses={status.HTTP_201_CREATED: {"model": TaskReadSchema}},
 )
+@tracing.traced()
 async def create_task_route(
-    background_tasks: BackgroundTasks,
     task_data: TaskCreateSchema,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_write_session),
 ) -> TaskReadSchema:
     """
     Создать новую задачу.
 
-    Если задан параметр `to_be_completed_at`, то запустится
-    фоновая задача FastAPI, которая изменит статус задачи
-    на `is_completed=True` по истечении указанного времени.
+    Если задан параметр `time_to_complete`, то по истечении указанного
+    времени планировщик изменит статус задачи на `is_completed=True`.
     """
 
-    return await TaskService.create_task(
-        background_tasks=background_tasks, task_data=task_data, session=session
+    return await TaskService.create_task(task_data=task_data, session=session)
+
+
+@tasks_router.post(
+    "/bulk",
+    summary="Создать задачи пакетно",
+    status_code=status.HTTP_201_CREATED,
+    response_model=None,
+    responses={status.HTTP_201_CREATED: {"model": TaskBulkCreateResultSchema}},
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/TaskCreateSchema"},
+                    }
+                },
+                api_constants.NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}},
+                api_constants.MSGPACK_MEDIA_TYPE: {
+                    "schema": {"type": "string", "format": "binary"}
+                },
+            },
+        }
+    },
+)
+@tracing.traced()
+async def create_tasks_bulk_route(
+    request: Request,
+    session: AsyncSession = Depends(get_write_session),
+) -> TaskBulkCreateResultSchema:
+    """
+    Создать задачи пакетно в одной транзакции.
+
+    Задачи передаются массивом JSON, массивом MessagePack
+    (`Content-Type: application/msgpack`) или в формате NDJSON
+    (`Content-Type: application/x-ndjson`, по одной задаче в строке).
+    Задачи, не прошедшие валидацию, возвращаются в `errors`
+    с порядковым номером в запросе, остальные задачи создаются.
+
+    Raises:
+
+        InvalidRequestBody: Тело запроса не удается разобрать `HTTP_400_BAD_REQUEST`.
+        TooManyItems: Превышено число задач в запросе `HTTP_413_REQUEST_ENTITY_TOO_LARGE`.
+    """
+
+    return await TaskService.create_tasks_bulk(
+        body=await request.body(),
+        content_type=request.headers.get("content-type", ""),
+        session=session,
     )
 
 
+@tasks_router.post(
+    "/import",
+    summary="Импортировать задачи из файла",
+    status_code=status.HTTP_201_CREATED,
+    response_model=None,
+    responses={status.HTTP_201_CREATED: {"model": TaskImportResultSchema}},
+)
+@tracing.traced()
+async def import_tasks_route(
+    file: UploadFile = File(description="Файл CSV с заголовком или NDJSON"),
+    file_format: TaskFileFormat = Query(
+        default="ndjson", alias="format", description="Формат файла"
+    ),
+    session: AsyncSession = Depends(get_write_session),
+) -> TaskImportResultSchema:
+    """
+    Импортировать задачи из файла CSV или NDJSON в кодировке UTF-8.
+
+    Записи файла проверяются так же, как при создании задачи. Записи,
+    не прошедшие валидацию, пропускаются, остальные задачи создаются
+    в одной транзакции. В ответе возвращается скорость импорта
+    и ошибки валидации первых отклоненных записей.
+
+    Raises:
+
+        InvalidRequestBody: Файл не удается прочитать `HTTP_400_BAD_REQUEST`.
+    """
+
+    return await TaskImporter.import_tasks(
+        file=file.file, file_format=file_format, session=session
+    )
+
+
+@tasks_router.post(
+    "/bulk/complete",
+    summary="Отметить задачи выполненными пакетно",
+    status_code=status.HTTP_200_OK,
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": TaskBulkResultSchema}},
+)
+@tracing.traced()
+async def complete_tasks_bulk_route(
+    selector: TaskBulkSelectorSchema,
+    session: AsyncSession = Depends(get_write_session),
+) -> TaskBulkResultSchema:
+    """
+    Отметить выполненными задачи, выбранные по списку `ids`
+    или по параметрам фильтрации `filter`.
+
+    В ответе возвращаются задачи, статус которых был изменен.
+    """
+
+    return await TaskService.complete_tasks_bulk(selector=selector, session=session)
+
+
+@tasks_router.post(
+    "/bulk/update",
+    summary="Обновить задачи пакетно",
+    status_code=status.HTTP_200_OK,
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": TaskBulkResultSchema}},
+)
+@tracing.traced()
+async def update_tasks_bulk_route(
+    update_data: TaskBulkUpdateSchema,
+    session: AsyncSession = Depends(get_write_session),
+) -> TaskBulkResultSchema:
+    """
+    Частично обновить задачи, выбранные по списку `ids`
+    или по параметрам фильтрации `filter`.
+
+    Обновляются только поля, явно переданные в `data`.
+    """
+
+    return await TaskService.update_tasks_bulk(update_data=update_data, session=session)
+
+
+@tasks_router.post(
+    "/bulk/delete",
+    summary="Удалить задачи пакетно",
+    status_code=status.HTTP_200_OK,
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": TaskBulkResultSchema}},
+)
+@tracing.traced()
+async def delete_tasks_bulk_route(
+    selector: TaskBulkSelectorSchema,
+    session: AsyncSession = Depends(get_write_session),
+) -> TaskBulkResultSchema:
+    """
+    Удалить задачи, выбранные по списку `ids`
+    или по параметрам фильтрации `filter`.
+    """
+
+    return await TaskService.delete_tasks_bulk(selector=selector, session=session)
+
+
 # MARK: Put
 @tasks_router.put(
     "",
@@ -74,10 +414,11 @@ async def create_task_route(
     response_model=None,
     responses={status.HTTP_200_OK: {"model": TaskReadSchema}},
 )
+@tracing.traced()
 async def update_task_route(
     task_data: TaskUpdateSchema,
     task_id: uuid.UUID = Query(description="Идентификатор задачи"),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_write_session),
 ) -> TaskReadSchema:
     """
     Обновить задачу по id.
@@ -99,9 +440,10 @@ async def update_task_route(
     status_code=status.HTTP_204_NO_CONTENT,
     response_model=None,
 )
+@tracing.traced()
 async def delete_task_route(
     task_id: uuid.UUID = Query(description="Идентификатор задачи"),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_write_session),
 ) -> None:
     """
     Удалить задачу по id.
@@ -0,0 +1,121 @@
+"""Модуль планировщика автоматического завершения задач."""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import api_settings
+from src.database import SessionLocal
+from src.tasks.dao import TaskDAO
+from src.tasks.schemas import TaskSchedulerStatsSchema
+from src.tasks.service import TaskService
+
+__all__ = ["TaskCompletionScheduler", "task_completion_scheduler"]
+
+logger = logging.getLogger(__name__)
+
+
+class TaskCompletionScheduler:
+    """
+    Планировщик автоматического завершения задач.
+
+    Срок завершения хранится в `TaskModel.completes_at`, поэтому задачи
+    не теряются при перезапуске API. Планировщик периодически завершает
+    задачи с наступившим сроком пакетами по `batch_size` задач.
+    Реплики API могут выполнять проверки одновременно: строки блокируются
+    с `FOR UPDATE SKIP LOCKED` и не завершаются повторно.
+
+    Атрибуты экземпляра:
+        stats (TaskSchedulerStatsSchema): метрики планировщика в текущем процессе.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = SessionLocal,
+        interval: float = api_settings.SCHEDULER_INTERVAL,
+        batch_size: int = api_settings.SCHEDULER_BATCH_SIZE,
+    ):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.batch_size = batch_size
+        self.stats = TaskSchedulerStatsSchema()
+        self._task: asyncio.Task | None = None
+
+    # MARK: Sweep
+    async def sweep(self, session: AsyncSession) -> int:
+        """
+        Завершить одну партию задач с наступившим сроком и обновить метрики.
+
+        Returns:
+            int: количество завершенных задач.
+        """
+
+        start = time.perf_counter()
+        lags = await TaskDAO.complete_due_tasks(limit=self.batch_size, session=session)
+        await session.commit()
+        if lags:
+            TaskService.invalidate_cache()
+
+        self.stats.sweeps += 1
+        self.stats.completed_tasks += len(lags)
+        self.stats.last_sweep_at = datetime.now(timezone.utc)
+        self.stats.last_sweep_duration = time.perf_counter() - start
+        if lags:
+            self.stats.last_lag = max(lags)
+            self.stats.max_lag = max(self.stats.max_lag, self.stats.last_lag)
+
+        return len(lags)
+
+    async def sweep_due_tasks(self) -> int:
+        """
+        Завершить все задачи с наступившим сроком.
+
+        Партии выполняются в отдельных транзакциях, пока очередная
+        партия заполнена полностью, чтобы не удерживать блокировки долго.
+
+        Returns:
+            int: количество завершенных задач.
+        """
+
+        completed_tasks = 0
+        while True:
+            async with self.session_factory() as session:
+                batch_size = await self.sweep(session=session)
+            completed_tasks += batch_size
+            if batch_size < self.batch_size:
+                return completed_tasks
+
+    # MARK: Lifecycle
+    async def run(self) -> None:
+        """Выполнять проверки с интервалом `interval` секунд до отмены."""
+
+        while True:
+            try:
+                await self.sweep_due_tasks()
+            except Exception:
+                self.stats.errors += 1
+                logger.exception("Ошибка автоматического завершения задач")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Запустить планировщик в текущем цикле событий."""
+
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Остановить планировщик."""
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+task_completion_scheduler = TaskCompletionScheduler()
@@ -1,15 +1,118 @@
+import functools
 import uuid
+from datetime import datetime
+from typing import Any, Literal, Self
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    create_model,
+    field_validator,
+    model_validator,
+)
 
-from src.base_schemas import BaseListReadSchema, BaseQuerySchema
+from src import api_constants
+from src.base_schemas import BaseListReadSchema, BaseQuerySchema, CacheStatsSchema
+
+TaskFileFormat = Literal["ndjson", "csv"]
+TaskField = Literal[
+    "id",
+    "title",
+    "description",
+    "is_completed",
+    "completion",
+    "time_to_complete",
+    "completes_at",
+]
 
 
 # MARK: Query
-class TaskQuerySchema(BaseQuerySchema):
-    """Схема query-параметров для поиска задач."""
+class TaskFilterSchema(BaseModel):
+    """Схема параметров фильтрации задач."""
 
+    ids: list[uuid.UUID] | None = Field(
+        default=None,
+        max_length=api_constants.DEFAULT_QUERY_LIMIT,
+        description="Идентификаторы задач",
+    )
     title: str | None = Field(default=None, description="Заголовок задачи")
+    q: str | None = Field(
+        default=None,
+        min_length=1,
+        description="Полнотекстовый поиск по заголовку и описанию задачи "
+        "с синтаксисом `websearch_to_tsquery`. "
+        "Задачи сортируются по убыванию релевантности.",
+    )
+    is_completed: bool | None = Field(
+        default=None, description="Статус выполнения задачи"
+    )
+    overdue: bool | None = Field(
+        default=None,
+        description="Просрочена ли задача: срок `completes_at` наступил, "
+        "но задача еще не завершена.",
+    )
+    due_before: datetime | None = Field(
+        default=None,
+        description="Срок автоматического завершения задачи `completes_at` "
+        "не позднее указанной даты и времени. Вместе с `is_completed=false` "
+        "выборка выполняется по индексу незавершенных задач.",
+    )
+    min_completion: int | None = Field(
+        default=None, ge=0, le=100, description="Минимальный прогресс выполнения, %"
+    )
+
+
+class TaskQuerySchema(BaseQuerySchema, TaskFilterSchema):
+    """Схема query-параметров для поиска задач."""
+
+    highlight: bool = Field(
+        default=False,
+        description="Выделять ли найденные слова в `title_highlight` "
+        "и `description_highlight`. Учитывается только вместе с `q`.",
+    )
+    fields: list[TaskField] | None = Field(
+        default=None,
+        min_length=1,
+        description="Поля задач в ответе, например `fields=id,title`. "
+        "По умолчанию возвращаются все поля. "
+        "Прогресс `completion` вычисляется, только если он запрошен.",
+    )
+
+    @field_validator("fields", mode="before")
+    @classmethod
+    def split_fields(cls, value: Any) -> Any:
+        """
+        Поля можно передать как повтором параметра, так и через запятую.
+        Повторы удаляются, а порядок полей не учитывается.
+        """
+
+        if isinstance(value, str):
+            value = [value]
+        if isinstance(value, list):
+            return sorted(
+                {
+                    field.strip()
+                    for item in value
+                    for field in str(item).split(",")
+                    if field.strip()
+                }
+            )
+        return value
+
+    @model_validator(mode="after")
+    def check_cursor_without_q(self) -> Self:
+        """Курсорная пагинация недоступна при сортировке по релевантности."""
+
+        if self.q is not None and self.cursor is not None:
+            raise ValueError("Параметр `cursor` не поддерживается вместе с `q`")
+        return self
+
+
+class TaskExportQuerySchema(TaskFilterSchema):
+    """Схема query-параметров для выгрузки задач."""
+
+    format: TaskFileFormat = Field(default="ndjson", description="Формат выгрузки")
 
 
 # MARK: Tasks
@@ -19,7 +122,10 @@ class TaskCreateSchema(BaseModel):
     title: str = Field(description="Заголовок задачи")
     description: str | None = Field(default=None, description="Описание задачи")
     time_to_complete: int | None = Field(
-        default=None, description="Время до завершения задачи в секундах", ge=10, le=300
+        default=None,
+        description="Время до завершения задачи в секундах",
+        ge=api_constants.MIN_TIME_TO_COMPLETE,
+        le=api_constants.MAX_TIME_TO_COMPLETE,
     )
 
 
@@ -39,11 +145,194 @@ class TaskReadSchema(TaskUpdateSchema):
         default=0,
         description="Прогресс выполнения задачи, %",
     )
+    time_to_complete: int | None = Field(
+        default=None, description="Время до завершения задачи в секундах"
+    )
+    completes_at: datetime | None = Field(
+        default=None,
+        description="Дата и время автоматического завершения задачи. "
+        "Прогресс до этого момента растет равномерно за `time_to_complete` секунд.",
+    )
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class TaskSearchReadSchema(TaskReadSchema):
+    """Схема для отображения задачи в списке с результатами поиска."""
+
+    rank: float | None = Field(
+        default=None, description="Релевантность задачи запросу `q`"
+    )
+    title_highlight: str | None = Field(
+        default=None, description="Заголовок с выделенными найденными словами"
+    )
+    description_highlight: str | None = Field(
+        default=None, description="Описание с выделенными найденными словами"
+    )
+
+
 class TaskReadListSchema(BaseListReadSchema):
     """Схема для отображения списка задач."""
 
-    tasks: list[TaskReadSchema] = Field(description="Список задач")
+    tasks: list[TaskSearchReadSchema] = Field(description="Список задач")
+
+
+@functools.cache
+def get_task_projection_schema(fields: tuple[str, ...]) -> type[BaseModel]:
+    """
+    Получить схему для отображения задачи в списке,
+    содержащую только поля `fields` из `TaskSearchReadSchema`.
+    """
+
+    return create_model(
+        "TaskProjectionReadSchema",
+        __config__=ConfigDict(from_attributes=True),
+        **{
+            name: (field.annotation, field)
+            for name, field in TaskSearchReadSchema.model_fields.items()
+            if name in fields
+        },
+    )
+
+
+@functools.cache
+def get_task_list_projection_schema(
+    fields: tuple[str, ...],
+) -> type[BaseListReadSchema]:
+    """Получить схему для отображения списка задач только с полями `fields`."""
+
+    return create_model(
+        "TaskProjectionReadListSchema",
+        __base__=BaseListReadSchema,
+        tasks=(
+            list[get_task_projection_schema(fields)],
+            Field(description="Список задач"),
+        ),
+    )
+
+
+# MARK: Bulk
+class TaskBulkItemErrorSchema(BaseModel):
+    """Схема ошибок валидации элемента пакетного запроса."""
+
+    index: int = Field(description="Порядковый номер элемента в запросе, с 0")
+    errors: list[dict[str, Any]] = Field(description="Ошибки валидации элемента")
+
+
+class TaskBulkCreateResultSchema(BaseModel):
+    """Схема результата пакетного создания задач."""
+
+    created: int = Field(description="Количество созданных задач")
+    ids: list[uuid.UUID] = Field(
+        description="Идентификаторы созданных задач в порядке элементов запроса"
+    )
+    errors: list[TaskBulkItemErrorSchema] = Field(
+        description="Элементы запроса, не прошедшие валидацию"
+    )
+
+
+class TaskImportResultSchema(BaseModel):
+    """Схема результата импорта задач из файла."""
+
+    total: int = Field(description="Количество записей в файле")
+    imported: int = Field(description="Количество импортированных задач")
+    rejected: int = Field(description="Количество записей, не прошедших валидацию")
+    duration: float = Field(description="Длительность импорта, с")
+    rows_per_second: float = Field(description="Скорость импорта, записей в секунду")
+    errors: list[TaskBulkItemErrorSchema] = Field(
+        description="Ошибки валидации первых "
+        f"{api_constants.IMPORT_MAX_ERRORS} отклоненных записей"
+    )
+
+
+class TaskBulkSelectorSchema(BaseModel):
+    """
+    Схема выбора задач для пакетной операции:
+    по списку идентификаторов или по параметрам фильтрации.
+    """
+
+    ids: list[uuid.UUID] | None = Field(
+        default=None,
+        min_length=1,
+        max_length=api_constants.BULK_MAX_IDS,
+        description="Идентификаторы задач",
+    )
+    filter: TaskFilterSchema | None = Field(
+        default=None,
+        description="Параметры фильтрации задач. Пустой объект выбирает все задачи.",
+    )
+
+    @model_validator(mode="after")
+    def check_selector(self) -> Self:
+        """Должен быть задан ровно один способ выбора задач."""
+
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Необходимо указать либо `ids`, либо `filter`")
+        return self
+
+
+class TaskBulkPatchSchema(BaseModel):
+    """Схема для частичного обновления задач в пакетной операции."""
+
+    title: str | None = Field(default=None, description="Заголовок задачи")
+    description: str | None = Field(default=None, description="Описание задачи")
+    is_completed: bool | None = Field(
+        default=None, description="Статус выполнения задачи"
+    )
+
+    @model_validator(mode="after")
+    def check_fields(self) -> Self:
+        """Должно быть задано хотя бы одно поле, `title` и `is_completed` не `null`."""
+
+        if not self.model_fields_set:
+            raise ValueError("Необходимо указать хотя бы одно поле для обновления")
+        for field in ("title", "is_completed"):
+            if field in self.model_fields_set and getattr(self, field) is None:
+                raise ValueError(f"Поле `{field}` не может быть `null`")
+        return self
+
+
+class TaskBulkUpdateSchema(TaskBulkSelectorSchema):
+    """Схема пакетного частичного обновления задач."""
+
+    data: TaskBulkPatchSchema = Field(description="Обновляемые поля задач")
+
+
+class TaskBulkResultSchema(BaseModel):
+    """Схема результата пакетной операции над задачами."""
+
+    count: int = Field(description="Количество затронутых задач")
+    ids: list[uuid.UUID] = Field(description="Идентификаторы затронутых задач")
+
+
+# MARK: Cache
+class TaskCacheStatsSchema(BaseModel):
+    """Схема метрик кэшей задач."""
+
+    lists: CacheStatsSchema = Field(description="Метрики кэша списков задач")
+    tasks: CacheStatsSchema = Field(description="Метрики кэша задач по id")
+
+
+# MARK: Scheduler
+class TaskSchedulerStatsSchema(BaseModel):
+    """Схема метрик планировщика автоматического завершения задач."""
+
+    sweeps: int = Field(default=0, description="Количество выполненных проверок")
+    completed_tasks: int = Field(
+        default=0, description="Количество автоматически завершенных задач"
+    )
+    errors: int = Field(default=0, description="Количество неудачных проверок")
+    last_sweep_at: datetime | None = Field(
+        default=None, description="Дата и время последней проверки"
+    )
+    last_sweep_duration: float | None = Field(
+        default=None, description="Длительность последней проверки, с"
+    )
+    last_lag: float | None = Field(
+        default=None,
+        description="Наибольшая задержка завершения задачи относительно срока "
+        "в последней проверке с завершенными задачами, с",
+    )
+    max_lag: float = Field(
+        default=0, description="Наибольшая задержка завершения задачи, с"
+    )
@@ -1,111 +1,798 @@
-import asyncio
+import json
+import time
 import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Mapping
+from datetime import UTC, datetime
+from typing import Any
 
-from fastapi import BackgroundTasks
+import msgpack
+import orjson
+from pydantic import ValidationError
+from sqlalchemy import not_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src import exceptions
+from src import (
+    api_constants,
+    etag,
+    exceptions,
+    export,
+    negotiation,
+    pagination,
+    tracing,
+)
+from src.base_schemas import BaseListReadSchema
+from src.cache import TTLCache
+from src.config import api_settings
 from src.tasks.dao import TaskDAO
 from src.tasks.models import TaskModel
+from src.tasks.raw_dao import TaskRawDAO
 from src.tasks.schemas import (
+    TaskBulkCreateResultSchema,
+    TaskBulkItemErrorSchema,
+    TaskBulkResultSchema,
+    TaskBulkSelectorSchema,
+    TaskBulkUpdateSchema,
+    TaskCacheStatsSchema,
     TaskCreateSchema,
+    TaskExportQuerySchema,
+    TaskFilterSchema,
     TaskQuerySchema,
     TaskReadListSchema,
     TaskReadSchema,
+    TaskSearchReadSchema,
     TaskUpdateSchema,
+    get_task_list_projection_schema,
 )
 
 
+@tracing.instrument_class(include_private=True)
 class TaskService:
     """
     Класс для работы с задачами.
 
     Позволяет выполнять CRUD операции.
+
+    Списки задач кэшируются в памяти процесса. Ключ кэша содержит поколение
+    `_cache_generation`, которое увеличивается при любом изменении задач
+    в текущем процессе, поэтому после изменения устаревшие записи
+    не используются и со временем вытесняются. Изменения, выполненные
+    другими процессами API, учитываются по истечении `TASKS_CACHE_TTL`.
+
+    Задачи, запрошенные по id, кэшируются отдельно и удаляются из кэша
+    при изменении или удалении этих задач.
+
+    Данные, прочитанные с реплики в течение `REPLICA_MAX_LAG` секунд
+    после изменения задач, не кэшируются, так как реплика может еще
+    не содержать изменений.
     """
 
-    # MARK: BackgroundTasks
+    _tasks_cache: TTLCache[tuple[BaseListReadSchema | bytes, str | None]] = TTLCache(
+        maxsize=api_settings.TASKS_CACHE_MAX_SIZE, ttl=api_settings.TASKS_CACHE_TTL
+    )
+    _cache_generation: int = 0
+    _invalidated_at: float = float("-inf")
+    _task_cache: TTLCache[tuple[TaskReadSchema, str | None]] = TTLCache(
+        maxsize=api_settings.TASK_BY_ID_CACHE_MAX_SIZE,
+        ttl=api_settings.TASKS_CACHE_TTL,
+    )
+
+    # MARK: Cache
     @classmethod
-    async def _update_task_status_in_background(
-        cls,
-        task_id: uuid.UUID,
-        time_to_complete: int,
-        session: AsyncSession,
-    ) -> None:
-        """Фоновая задача для обновления статуса задачи по истечении времени."""
+    def invalidate_cache(cls, task_ids: Iterable[uuid.UUID] = ()) -> None:
+        """
+        Сделать недействительными все закэшированные списки задач
+        и удалить из кэша задачи с `id` из `task_ids`.
+        """
 
-        await asyncio.sleep(time_to_complete)
-        await TaskDAO.partial_update(
-            TaskModel.id == task_id, obj_in={"is_completed": True}, session=session
+        cls._cache_generation += 1
+        cls._invalidated_at = time.monotonic()
+        for task_id in task_ids:
+            cls._task_cache.delete(task_id)
+
+    @classmethod
+    def _can_cache(cls, session: AsyncSession) -> bool:
+        """Проверить, можно ли кэшировать данные, прочитанные в сессии `session`."""
+
+        if not api_settings.TASKS_CACHE_ENABLED:
+            return False
+        from_replica = session.info.get(api_constants.REPLICA_SESSION_INFO_KEY, False)
+        return not (
+            from_replica
+            and time.monotonic() - cls._invalidated_at < api_settings.REPLICA_MAX_LAG
         )
-        await session.commit()
+
+    @classmethod
+    def get_cache_stats(cls) -> TaskCacheStatsSchema:
+        """Получить метрики кэшей задач."""
+
+        return TaskCacheStatsSchema(
+            lists=cls._tasks_cache.stats, tasks=cls._task_cache.stats
+        )
+
+    @classmethod
+    def _get_cache_ttl(cls, query: TaskQuerySchema, pending: bool) -> float:
+        """
+        Получить время жизни списка задач в кэше.
+
+        Статус и прогресс незавершенных задач со сроком завершения
+        (`pending=True`) меняются со временем, а планировщик в другом
+        процессе API завершает их без сброса кэша этого процесса.
+        Выборка по фильтрам `overdue` и `min_completion` также меняется
+        со временем. Поэтому такие списки хранятся не дольше
+        `TASKS_CACHE_COMPLETION_TOLERANCE` секунд, независимо от того,
+        какие поля задач запрошены в `fields`.
+        """
+
+        time_dependent = query.overdue is not None or query.min_completion is not None
+        if time_dependent or pending:
+            return min(
+                api_settings.TASKS_CACHE_TTL,
+                api_settings.TASKS_CACHE_COMPLETION_TOLERANCE,
+            )
+        return api_settings.TASKS_CACHE_TTL
 
     # MARK: Create
     @classmethod
     async def create_task(
         cls,
-        background_tasks: BackgroundTasks,
         task_data: TaskCreateSchema,
         session: AsyncSession,
     ) -> TaskReadSchema:
         """
         Создать новую задачу.
 
-        Если задан параметр `task_data.to_be_completed_at`, то запустится
-        фоновая задача FastAPI, которая изменит статус задачи
-        на `is_completed=True` по истечении указанного времени.
+        Если задан параметр `task_data.time_to_complete`, для задачи сохраняется
+        срок `completes_at`, по наступлении которого планировщик изменит статус
+        задачи на `is_completed=True`.
         """
 
-        created_task_id = await TaskDAO.add_returning_id(
-            session=session, obj_in=task_data
-        )
-        await session.commit()
-
+        create_data = task_data.model_dump(exclude_unset=True)
         if task_data.time_to_complete is not None:
-            background_tasks.add_task(
-                func=cls._update_task_status_in_background,
-                task_id=created_task_id,
-                time_to_complete=task_data.time_to_complete,
-                session=session,
+            create_data["completes_at"] = TaskDAO.get_completes_at_exp(
+                task_data.time_to_complete
             )
 
-        return TaskReadSchema(
-            title=task_data.title,
-            description=task_data.description,
-            is_completed=False,
-            id=created_task_id,
-        )
+        created_task = await TaskDAO.add(session=session, obj_in=create_data)
+        await session.commit()
+        cls.invalidate_cache()
+
+        return TaskReadSchema.model_validate(created_task)
+
+    @classmethod
+    def _parse_tasks_bulk(
+        cls, body: bytes, content_type: str
+    ) -> tuple[list[TaskCreateSchema], list[TaskBulkItemErrorSchema]]:
+        """
+        Разобрать тело пакетного запроса на создание задач.
+
+        Тело передается массивом JSON, массивом MessagePack
+        (`application/msgpack`) или в формате NDJSON
+        (`application/x-ndjson`, по одной задаче в строке).
+
+        Returns:
+            tuple: задачи, прошедшие валидацию, и ошибки остальных элементов.
+
+        Raises:
+            InvalidRequestBody: Тело запроса не удается разобрать `HTTP_400_BAD_REQUEST`.
+            TooManyItems: Превышено число задач в запросе `HTTP_413_REQUEST_ENTITY_TOO_LARGE`.
+        """
+
+        if content_type.startswith(api_constants.NDJSON_MEDIA_TYPE):
+            # Некорректный JSON в строке считается ошибкой валидации элемента.
+            raw_items = [line for line in body.splitlines() if line.strip()]
+            validate = TaskCreateSchema.model_validate_json
+        else:
+            try:
+                if negotiation.is_msgpack(content_type):
+                    raw_items = msgpack.unpackb(body)
+                else:
+                    raw_items = json.loads(body)
+            except (ValueError, msgpack.UnpackException) as ex:
+                raise exceptions.InvalidRequestBody from ex
+            if not isinstance(raw_items, list):
+                raise exceptions.InvalidRequestBody
+            validate = TaskCreateSchema.model_validate
+
+        if len(raw_items) > api_constants.BULK_CREATE_MAX_ITEMS:
+            raise exceptions.TooManyItems(api_constants.BULK_CREATE_MAX_ITEMS)
+
+        tasks_data, errors = [], []
+        for index, raw_item in enumerate(raw_items):
+            try:
+                tasks_data.append(validate(raw_item))
+            except ValidationError as ex:
+                errors.append(
+                    TaskBulkItemErrorSchema(
+                        index=index,
+                        errors=ex.errors(
+                            include_url=False,
+                            include_context=False,
+                            include_input=False,
+                        ),
+                    )
+                )
+        return tasks_data, errors
+
+    @classmethod
+    async def create_tasks_bulk(
+        cls, body: bytes, content_type: str, session: AsyncSession
+    ) -> TaskBulkCreateResultSchema:
+        """
+        Создать задачи пакетно в одной транзакции.
+
+        Задачи, не прошедшие валидацию, не создаются и возвращаются
+        в `errors`, остальные задачи создаются. Для задач с `time_to_complete`
+        сохраняется срок `completes_at` для планировщика.
+
+        Raises:
+            InvalidRequestBody: Тело запроса не удается разобрать `HTTP_400_BAD_REQUEST`.
+            TooManyItems: Превышено число задач в запросе `HTTP_413_REQUEST_ENTITY_TOO_LARGE`.
+        """
+
+        tasks_data, errors = cls._parse_tasks_bulk(body=body, content_type=content_type)
+
+        ids = []
+        if tasks_data:
+            ids = await TaskDAO.add_many_tasks(tasks_data=tasks_data, session=session)
+            await session.commit()
+            cls.invalidate_cache()
+
+        return TaskBulkCreateResultSchema(created=len(ids), ids=ids, errors=errors)
 
     # MARK: Read
+    @classmethod
+    def _get_filters(cls, query: TaskFilterSchema) -> list:
+        """Получить условия фильтрации задач по параметрам фильтрации."""
+
+        where = []
+        if query.ids is not None:
+            where.append(TaskDAO.get_ids_exp(query.ids))
+        if query.title is not None:
+            where.append(TaskDAO.get_title_search_exp(query.title))
+        if query.q is not None:
+            where.append(TaskDAO.get_full_text_search_exp(query.q))
+        if query.is_completed is not None:
+            where.append(TaskModel.is_completed.is_(query.is_completed))
+        if query.overdue is not None:
+            overdue_exp = TaskDAO.get_overdue_exp()
+            where.append(overdue_exp if query.overdue else not_(overdue_exp))
+        if query.due_before is not None:
+            where.append(TaskModel.completes_at <= query.due_before)
+        if query.min_completion is not None:
+            where.append(TaskDAO.get_min_completion_exp(query.min_completion))
+        return where
+
+    @classmethod
+    async def get_tasks_by_ids(
+        cls, ids: list[uuid.UUID], session: AsyncSession
+    ) -> dict[uuid.UUID, tuple[TaskReadSchema, str | None]]:
+        """
+        Получить задачи по id вместе с их ETag.
+
+        Задачи, отсутствующие в кэше, запрашиваются одним запросом.
+        ETag задачи формируется по `updated_at` и не формируется, пока
+        прогресс выполнения задачи растет. Незавершенные задачи со сроком
+        завершения хранятся в кэше не дольше `TASKS_CACHE_COMPLETION_TOLERANCE`
+        секунд, так как их прогресс и статус меняются со временем.
+        Если кэш был сброшен во время запроса к БД, полученные задачи
+        могут быть устаревшими и в кэш не сохраняются.
+
+        Returns:
+            dict: задачи и их ETag по id. Ненайденные задачи отсутствуют.
+        """
+
+        tasks = {}
+        missing_ids = []
+        for task_id in dict.fromkeys(ids):
+            cached_task = (
+                cls._task_cache.get(task_id)
+                if api_settings.TASKS_CACHE_ENABLED
+                else None
+            )
+            if cached_task is None:
+                missing_ids.append(task_id)
+            else:
+                tasks[task_id] = cached_task
+
+        if not missing_ids:
+            return tasks
+
+        cache_generation = cls._cache_generation
+        if api_settings.TASKS_DAO_BACKEND == "asyncpg":
+            task_mappings = await TaskRawDAO.get_tasks_data_by_ids(
+                ids=missing_ids, session=session
+            )
+        else:
+            task_mappings = await TaskDAO.get_tasks_data_by_ids(
+                ids=missing_ids, session=session
+            )
+        for task_mapping in task_mappings:
+            task = TaskReadSchema.model_validate(task_mapping)
+            time_dependent = not task.is_completed and task.completes_at is not None
+            task_etag = None
+            if not (time_dependent and task.completion < 100):
+                task_etag = etag.make_etag(task.id, task_mapping["updated_at"])
+
+            tasks[task.id] = (task, task_etag)
+            if cls._can_cache(session) and cls._cache_generation == cache_generation:
+                cls._task_cache.set(
+                    task.id,
+                    (task, task_etag),
+                    ttl=api_settings.TASKS_CACHE_COMPLETION_TOLERANCE
+                    if time_dependent
+                    else None,
+                )
+        return tasks
+
+    @classmethod
+    async def get_task(
+        cls, task_id: uuid.UUID, session: AsyncSession
+    ) -> tuple[TaskReadSchema, str | None]:
+        """
+        Получить задачу по id вместе с ее ETag.
+
+        Raises:
+            TaskNotFound: Задача не найдена `HTTP_404_NOT_FOUND`.
+        """
+
+        tasks = await cls.get_tasks_by_ids(ids=[task_id], session=session)
+        if task_id not in tasks:
+            raise exceptions.TaskNotFound
+        return tasks[task_id]
+
     @classmethod
     async def get_tasks(
         cls, query: TaskQuerySchema, session: AsyncSession
-    ) -> TaskReadListSchema:
+    ) -> tuple[BaseListReadSchema, str | None]:
         """
         Получить список задач с фильтрацией по переданным
+        query-параметрам и с учетом пагинации вместе с его ETag.
+
+        Если задан параметр `fields`, список возвращается по схеме,
+        содержащей только перечисленные поля задач.
+
+        Если включен кэш `TASKS_CACHE_ENABLED`, список задач
+        возвращается из кэша по нормализованным query-параметрам.
+        """
+
+        return await cls._get_cached_tasks(query=query, as_json=False, session=session)
+
+    @classmethod
+    async def get_tasks_json(
+        cls, query: TaskQuerySchema, session: AsyncSession
+    ) -> tuple[bytes, str | None]:
+        """
+        Получить список задач, сериализованный в JSON, без построения
+        Pydantic-моделей для каждой задачи, вместе с его ETag.
+
+        Результат совпадает с JSON-представлением `TaskReadListSchema`.
+        """
+
+        return await cls._get_cached_tasks(query=query, as_json=True, session=session)
+
+    @classmethod
+    async def _get_cached_tasks(
+        cls, query: TaskQuerySchema, as_json: bool, session: AsyncSession
+    ) -> tuple[BaseListReadSchema | bytes, str | None]:
+        """
+        Получить список задач из кэша или из БД в виде схемы или JSON
+        вместе с его ETag.
+        """
+
+        query_key = query.model_dump_json()
+        cache_key = (cls._cache_generation, "json" if as_json else "schema", query_key)
+        if api_settings.TASKS_CACHE_ENABLED:
+            cached_tasks = cls._tasks_cache.get(cache_key)
+            if cached_tasks is not None:
+                return cached_tasks
+
+        task_mappings, list_data = await cls._get_tasks_page(
+            query=query, session=session
+        )
+        fields = cls._get_task_fields(query)
+        with tracing.span("TaskService.build_tasks_list", as_json=as_json):
+            if as_json:
+                tasks_list = cls._dump_tasks_json(
+                    task_mappings, list_data, fields=fields
+                )
+            elif fields is not None:
+                tasks_list = get_task_list_projection_schema(fields)(
+                    **list_data, tasks=task_mappings
+                )
+            else:
+                tasks_list = TaskReadListSchema(
+                    **list_data,
+                    tasks=[
+                        TaskSearchReadSchema.model_validate(task)
+                        for task in task_mappings
+                    ],
+                )
+
+        pending_tasks = cls._get_pending_tasks(task_mappings)
+        tasks_etag = cls._make_tasks_etag(
+            query, query_key, task_mappings, list_data, pending_tasks
+        )
+        if cls._can_cache(session):
+            cls._tasks_cache.set(
+                cache_key,
+                (tasks_list, tasks_etag),
+                ttl=cls._get_cache_ttl(query, pending=bool(pending_tasks)),
+            )
+        return tasks_list, tasks_etag
+
+    @classmethod
+    async def get_tasks_etag(
+        cls, query: TaskQuerySchema, session: AsyncSession
+    ) -> str | None:
+        """
+        Получить ETag списка задач без получения и сериализации данных задач.
+
+        ETag берется из кэша списков, а при его отсутствии формируется
+        по той же странице задач, из которой выбираются только служебные
+        поля. Запрос ограничен размером страницы, как и запрос списка.
+
+        Returns:
+            str|None: ETag или `None`, если ETag не может быть сформирован.
+        """
+
+        query_key = query.model_dump_json()
+        if api_settings.TASKS_CACHE_ENABLED:
+            for representation in ("schema", "json"):
+                cached_tasks = cls._tasks_cache.get(
+                    (cls._cache_generation, representation, query_key)
+                )
+                if cached_tasks is not None:
+                    return cached_tasks[1]
+
+        task_mappings, list_data = await cls._get_tasks_page(
+            query=query, session=session, probe=True
+        )
+        return cls._make_tasks_etag(
+            query,
+            query_key,
+            task_mappings,
+            list_data,
+            cls._get_pending_tasks(task_mappings),
+        )
+
+    @classmethod
+    def _get_pending_tasks(
+        cls, task_mappings: list[Mapping[str, Any]]
+    ) -> list[Mapping[str, Any]]:
+        """Получить незавершенные задачи страницы со сроком завершения."""
+
+        return [
+            task
+            for task in task_mappings
+            if not task["is_completed"] and task["completes_at"] is not None
+        ]
+
+    @classmethod
+    def _make_tasks_etag(
+        cls,
+        query: TaskQuerySchema,
+        query_key: str,
+        task_mappings: list[Mapping[str, Any]],
+        list_data: dict[str, Any],
+        pending_tasks: list[Mapping[str, Any]],
+    ) -> str | None:
+        """
+        Получить ETag страницы задач по нормализованным query-параметрам,
+        полям списка и `id` и `updated_at` задач страницы.
+
+        Представление с растущим прогрессом выполнения меняется со временем
+        без изменения задач, поэтому, если прогресс запрошен в ответе
+        и среди задач страницы есть задачи со сроком в будущем,
+        ETag не формируется.
+
+        Returns:
+            str|None: ETag или `None`, если ETag не может быть сформирован.
+        """
+
+        now = datetime.now(UTC)
+        if (query.fields is None or "completion" in query.fields) and any(
+            task["completes_at"] > now for task in pending_tasks
+        ):
+            return None
+        return etag.make_etag(
+            query_key,
+            *list_data.values(),
+            *((task["id"], task["updated_at"]) for task in task_mappings),
+        )
+
+    @classmethod
+    def _get_task_fields(cls, query: TaskQuerySchema) -> tuple[str, ...] | None:
+        """
+        Получить поля задач в ответе по параметру `fields` или `None`,
+        если возвращаются все поля. При полнотекстовом поиске `q`
+        к полям добавляются релевантность и выделенные найденные слова.
+        """
+
+        if query.fields is None:
+            return None
+        fields = tuple(query.fields)
+        if query.q is not None:
+            fields += ("rank", "title_highlight", "description_highlight")
+        return fields
+
+    @classmethod
+    def _dump_tasks_json(
+        cls,
+        task_mappings: list[Mapping[str, Any]],
+        list_data: dict[str, Any],
+        fields: tuple[str, ...] | None = None,
+    ) -> bytes:
+        """
+        Сериализовать страницу задач в JSON по полям `TaskReadListSchema`
+        и `TaskSearchReadSchema` с помощью orjson. Если задан `fields`,
+        сериализуются только перечисленные поля задач.
+
+        Даты сериализуются orjson напрямую, даты в UTC - с суффиксом `Z`,
+        как и в Pydantic.
+        """
+
+        task_fields = [
+            (name, field.get_default())
+            for name, field in TaskSearchReadSchema.model_fields.items()
+            if fields is None or name in fields
+        ]
+        tasks = [
+            {name: task.get(name, default) for name, default in task_fields}
+            for task in task_mappings
+        ]
+        return orjson.dumps(
+            {**list_data, "tasks": tasks},
+            default=export.json_default,
+            option=orjson.OPT_UTC_Z,
+        )
+
+    @classmethod
+    async def _get_tasks_page(
+        cls, query: TaskQuerySchema, session: AsyncSession, probe: bool = False
+    ) -> tuple[list[Mapping[str, Any]], dict[str, Any]]:
+        """
+        Получить страницу задач из БД с фильтрацией по переданным
         query-параметрам и с учетом пагинации.
 
         По умолчанию сортировка выполняется по дате создания задачи.
+
+        Если задан `TASKS_DAO_BACKEND=asyncpg` и фильтры поддерживаются
+        `TaskRawDAO`, запросы выполняются без ORM.
+
+        При `probe=True` для той же выборки задач выбираются только
+        служебные поля, необходимые для формирования ETag, без заголовка,
+        описания, прогресса выполнения и выделения найденных слов.
+
+        Returns:
+            tuple: данные задач страницы и поля `TaskReadListSchema`
+                `count`, `count_strategy` и `next_cursor`.
         """
 
-        where = []
-        if query.title is not None:
-            where.append(TaskModel.title.ilike(f"%{query.title}%"))
+        use_raw_dao = api_settings.TASKS_DAO_BACKEND == "asyncpg" and (
+            TaskRawDAO.supports(query)
+        )
+        where = [] if use_raw_dao else cls._get_filters(query)
+        cursor = pagination.decode_cursor(query.cursor) if query.cursor else None
+
+        count = count_strategy = None
+        if query.with_count and query.count_strategy == "estimated":
+            count = await TaskDAO.estimate_count(*where, session=session)
+            if count is not None:
+                count_strategy = "estimated"
+
+        # Если оценка недоступна, используется точный подсчет.
+        with_count = query.with_count and count is None
+        count_cap = (
+            api_constants.COUNT_CAP if query.count_strategy == "capped" else None
+        )
 
-        count = await TaskDAO.count(*where, session=session)
-        if count:
+        # Запрашивается на одну задачу больше, чтобы определить,
+        # есть ли следующая страница.
+        offset = None if cursor else query.offset
+        limit = None if query.limit is None else query.limit + 1
+        if use_raw_dao:
+            task_mappings = await TaskRawDAO.get_tasks_data(
+                query,
+                offset=offset,
+                limit=limit,
+                asc=query.asc,
+                cursor=cursor,
+                with_count=with_count,
+                count_cap=count_cap,
+                session=session,
+            )
+        else:
             task_mappings = await TaskDAO.get_tasks_data(
                 *where,
-                offset=query.offset,
-                limit=query.limit,
+                offset=offset,
+                limit=limit,
                 asc=query.asc,
+                cursor=cursor,
+                with_count=with_count,
+                count_cap=count_cap,
+                q=query.q,
+                highlight=query.highlight and not probe,
+                fields=() if probe else query.fields,
                 session=session,
             )
-            tasks = [TaskReadSchema.model_validate(task) for task in task_mappings]
 
-        else:
-            tasks = []
+        if with_count:
+            if task_mappings:
+                count = task_mappings[0]["total_count"]
+            elif cursor or query.offset:
+                # Страница за пределами выборки не содержит строк,
+                # поэтому количество запрашивается отдельно.
+                count = (
+                    await TaskRawDAO.count(query, cap=count_cap, session=session)
+                    if use_raw_dao
+                    else await TaskDAO.count(*where, cap=count_cap, session=session)
+                )
+            else:
+                count = 0
 
-        return TaskReadListSchema(count=count, tasks=tasks)
+            # Если предел подсчета не достигнут, количество точное.
+            count_strategy = (
+                "capped" if count_cap is not None and count >= count_cap else "exact"
+            )
+
+        # Курсор строится по `created_at` и недоступен при сортировке
+        # по релевантности `q`, следующая страница запрашивается по `offset`.
+        next_cursor = None
+        if query.limit is not None and len(task_mappings) > query.limit:
+            task_mappings = task_mappings[: query.limit]
+            if query.q is None:
+                last_task = task_mappings[-1]
+                next_cursor = pagination.encode_cursor(
+                    last_task["created_at"], last_task["id"]
+                )
+
+        return task_mappings, {
+            "count": count,
+            "count_strategy": count_strategy,
+            "next_cursor": next_cursor,
+        }
+
+    @classmethod
+    async def export_tasks(
+        cls, query: TaskExportQuerySchema, session: AsyncSession
+    ) -> AsyncIterator[str]:
+        """
+        Выгрузить задачи, соответствующие параметрам фильтрации,
+        в формате NDJSON или CSV частями по `EXPORT_BATCH_SIZE` задач.
+
+        Выгрузка выполняется в одной транзакции сессии `session`, после
+        чего сессия закрывается, в том числе при разрыве соединения клиентом.
+        """
+
+        where = cls._get_filters(query)
+        columns = [column.key for column in TaskDAO.get_tasks_export_columns()]
+
+        async with session:
+            batches = TaskDAO.stream_tasks_data(
+                *where, batch_size=api_constants.EXPORT_BATCH_SIZE, session=session
+            )
+            if query.format == "csv":
+                yield export.rows_to_csv([columns])
+                async for rows in batches:
+                    yield export.rows_to_csv(rows)
+            else:
+                async for rows in batches:
+                    yield export.rows_to_ndjson(rows, columns)
+
+    # MARK: Bulk
+    @classmethod
+    async def _iter_selected_ids(
+        cls, selector: TaskBulkSelectorSchema, where: list, session: AsyncSession
+    ) -> AsyncIterator[list[uuid.UUID]]:
+        """
+        Получить идентификаторы выбранных задач частями
+        не более `BULK_CHUNK_SIZE` идентификаторов.
+
+        Задачи, выбранные по фильтру, обходятся по возрастанию `id`.
+        """
+
+        chunk_size = api_constants.BULK_CHUNK_SIZE
+        if selector.ids is not None:
+            for start in range(0, len(selector.ids), chunk_size):
+                yield selector.ids[start : start + chunk_size]
+            return
+
+        after_id = None
+        while True:
+            ids = await TaskDAO.find_ids_after(
+                *where, after_id=after_id, limit=chunk_size, session=session
+            )
+            if ids:
+                yield ids
+            if len(ids) < chunk_size:
+                return
+            after_id = ids[-1]
+
+    @classmethod
+    async def _apply_bulk(
+        cls,
+        selector: TaskBulkSelectorSchema,
+        operation: Callable[[list[uuid.UUID], list], Awaitable[list[uuid.UUID]]],
+        session: AsyncSession,
+    ) -> TaskBulkResultSchema:
+        """
+        Применить пакетную операцию к выбранным задачам.
+
+        Операция выполняется частями по `BULK_CHUNK_SIZE` задач, каждая часть
+        фиксируется отдельной транзакцией, чтобы не удерживать блокировки строк
+        до окончания всей операции. Для задач, выбранных по фильтру, условия
+        фильтрации проверяются повторно при изменении строк.
+        """
+
+        where = [] if selector.filter is None else cls._get_filters(selector.filter)
+        affected_ids = []
+        async for ids in cls._iter_selected_ids(
+            selector=selector, where=where, session=session
+        ):
+            chunk_affected_ids = await operation(ids, where)
+            await session.commit()
+            cls.invalidate_cache(task_ids=chunk_affected_ids)
+            affected_ids.extend(chunk_affected_ids)
+
+        return TaskBulkResultSchema(count=len(affected_ids), ids=affected_ids)
+
+    @classmethod
+    async def complete_tasks_bulk(
+        cls, selector: TaskBulkSelectorSchema, session: AsyncSession
+    ) -> TaskBulkResultSchema:
+        """Отметить выбранные задачи выполненными."""
+
+        async def operation(ids: list[uuid.UUID], where: list) -> list[uuid.UUID]:
+            return await TaskDAO.update_by_ids_returning_id(
+                ids,
+                *where,
+                TaskModel.is_completed.is_(False),
+                obj_in={"is_completed": True},
+                session=session,
+            )
+
+        return await cls._apply_bulk(
+            selector=selector, operation=operation, session=session
+        )
+
+    @classmethod
+    async def update_tasks_bulk(
+        cls, update_data: TaskBulkUpdateSchema, session: AsyncSession
+    ) -> TaskBulkResultSchema:
+        """
+        Частично обновить выбранные задачи.
+
+        Если задачи отмечаются незавершенными, наступивший срок
+        `completes_at` сбрасывается, чтобы планировщик не завершил их снова.
+        """
+
+        obj_in = update_data.data.model_dump(exclude_unset=True)
+        if obj_in.get("is_completed") is False:
+            obj_in["completes_at"] = TaskDAO.get_reopened_completes_at_exp()
+
+        async def operation(ids: list[uuid.UUID], where: list) -> list[uuid.UUID]:
+            return await TaskDAO.update_by_ids_returning_id(
+                ids, *where, obj_in=obj_in, session=session
+            )
+
+        return await cls._apply_bulk(
+            selector=update_data, operation=operation, session=session
+        )
+
+    @classmethod
+    async def delete_tasks_bulk(
+        cls, selector: TaskBulkSelectorSchema, session: AsyncSession
+    ) -> TaskBulkResultSchema:
+        """Удалить выбранные задачи."""
+
+        async def operation(ids: list[uuid.UUID], where: list) -> list[uuid.UUID]:
+            return await TaskDAO.delete_by_ids_returning_id(
+                ids, *where, session=session
+            )
+
+        return await cls._apply_bulk(
+            selector=selector, operation=operation, session=session
+        )
 
     # MARK: Update
     @classmethod
@@ -115,6 +802,9 @@ class TaskService:
         """
         Обновить задачу по id.
 
+        Если задача отмечается незавершенной, наступивший срок
+        `completes_at` сбрасывается, чтобы планировщик не завершил ее снова.
+
         Raises:
             TaskNotFound: Задача не найдена `HTTP_404_NOT_FOUND`.
         """
@@ -126,6 +816,7 @@ class TaskService:
             raise exceptions.TaskNotFound
 
         await session.commit()
+        cls.invalidate_cache(task_ids=[task_id])
 
         return TaskReadSchema(
             title=task_data.title,
@@ -133,6 +824,8 @@ class TaskService:
             is_completed=task_data.is_completed,
             id=task_id,
             completion=updated_task_data["completion"],
+            time_to_complete=updated_task_data["time_to_complete"],
+            completes_at=updated_task_data["completes_at"],
         )
 
     # MARK: Delete
@@ -145,10 +838,11 @@ class TaskService:
             TaskNotFound: Задача не найдена `HTTP_404_NOT_FOUND`.
         """
 
-        deleted_task_id = await TaskDAO.delete_returning_id(
-            TaskModel.id == task_id, session=session
+        deleted_task_id = await TaskDAO.delete_by_id_returning_id(
+            id=task_id, session=session
         )
         if deleted_task_id is None:
             raise exceptions.TaskNotFound
 
         await session.commit()
+        cls.invalidate_cache(task_ids=[task_id])
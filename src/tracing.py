@@ -0,0 +1,355 @@
+"""
+Модуль трассировки запросов API.
+
+Для доли `TRACING_SAMPLE_RATE` HTTP-запросов записываются вложенные
+интервалы (span) обработки запроса: эндпоинт, методы `TaskService` и DAO.
+Идентификатор трассировки берется из заголовка `X-Trace-Id` запроса
+или создается и возвращается в заголовке ответа.
+
+Завершенные трассировки передаются экспортеру `TRACING_EXPORTER`:
+    memory - кольцевой буфер в памяти процесса, см. `GET /debug/traces`;
+    jsonl - файл `TRACING_JSONL_PATH`, один интервал в строке,
+        запись выполняется фоновым потоком.
+
+Если запрос не трассируется, обертки методов сводятся к проверке
+контекстной переменной.
+"""
+
+import atexit
+import contextlib
+import functools
+import inspect
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from typing import Any
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src import api_constants
+from src.config import api_settings
+
+__all__ = [
+    "JSONLinesExporter",
+    "MemoryExporter",
+    "TracingMiddleware",
+    "instrument_class",
+    "span",
+    "traced",
+]
+
+logger = logging.getLogger(__name__)
+
+TRACE_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class Span:
+    """
+    Интервал обработки запроса.
+
+    Атрибуты экземпляра:
+        name (str): название интервала.
+        trace_id (str): id трассировки.
+        span_id (str): id интервала.
+        parent (Span|None): родительский интервал.
+        attributes (dict): атрибуты интервала.
+        spans (list[Span]): завершенные интервалы трассировки,
+            общий список для всех интервалов трассировки.
+    """
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent",
+        "attributes",
+        "spans",
+        "start_time",
+        "start",
+        "duration",
+        "error",
+    )
+
+    def __init__(self, name: str, trace_id: str, parent: "Span | None" = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent = parent
+        self.attributes: dict[str, Any] = {}
+        self.spans: list[Span] = parent.spans if parent is not None else []
+        self.start_time = time.time()
+        self.start = time.perf_counter()
+        self.duration: float | None = None
+        self.error: str | None = None
+
+    def finish(self) -> None:
+        """Завершить интервал, корневой интервал - вместе с трассировкой."""
+
+        self.duration = time.perf_counter() - self.start
+        self.spans.append(self)
+        if self.parent is None:
+            exporter.export([child.to_dict() for child in self.spans])
+
+    def to_dict(self) -> dict[str, Any]:
+        """Получить интервал в виде словаря для экспорта."""
+
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent.span_id if self.parent is not None else None,
+            "name": self.name,
+            "start_time": datetime.fromtimestamp(self.start_time, UTC).isoformat(),
+            "duration_ms": round(self.duration * 1000, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+# MARK: Exporters
+class MemoryExporter:
+    """
+    Экспортер интервалов в кольцевой буфер в памяти процесса.
+
+    Атрибуты экземпляра:
+        spans (deque[dict]): последние `maxlen` интервалов.
+    """
+
+    def __init__(self, maxlen: int):
+        self.spans: deque[dict[str, Any]] = deque(maxlen=maxlen)
+
+    def export(self, spans: list[dict[str, Any]]) -> None:
+        self.spans.extend(spans)
+
+    def get_spans(self, trace_id: str | None = None) -> list[dict[str, Any]]:
+        """Получить интервалы из буфера, при заданном `trace_id` - одной трассировки."""
+
+        return [
+            span_data
+            for span_data in self.spans
+            if trace_id is None or span_data["trace_id"] == trace_id
+        ]
+
+
+class JSONLinesExporter:
+    """
+    Экспортер интервалов в файл JSON Lines.
+
+    Интервалы накапливаются в буфере и дописываются в файл фоновым
+    потоком каждые `flush_interval` секунд, а также при завершении
+    процесса, поэтому запись на диск не блокирует цикл событий.
+
+    Атрибуты экземпляра:
+        path (str): путь к файлу.
+        flush_interval (float): интервал записи буфера в файл, с.
+    """
+
+    def __init__(
+        self, path: str, flush_interval: float = api_constants.TRACING_FLUSH_INTERVAL
+    ):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._lines: list[str] = []
+        self._lock = threading.Lock()
+        # Запись в файл выполняется по одному буферу за раз,
+        # чтобы интервалы не переставлялись
+        self._flush_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        atexit.register(self.flush)
+
+    def export(self, spans: list[dict[str, Any]]) -> None:
+        lines = "".join(
+            json.dumps(span_data, ensure_ascii=False) + "\n" for span_data in spans
+        )
+        with self._lock:
+            self._lines.append(lines)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def flush(self) -> None:
+        """Дописать накопленные интервалы в файл."""
+
+        with self._flush_lock:
+            with self._lock:
+                lines, self._lines = self._lines, []
+            if lines:
+                with open(self.path, "a", encoding="utf-8") as file:
+                    file.write("".join(lines))
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except OSError:
+                logger.exception("Ошибка записи трассировки в %s", self.path)
+
+
+def create_exporter() -> MemoryExporter | JSONLinesExporter:
+    """Создать экспортер по настройке `TRACING_EXPORTER`."""
+
+    if api_settings.TRACING_EXPORTER == "jsonl":
+        return JSONLinesExporter(api_settings.TRACING_JSONL_PATH)
+    return MemoryExporter(maxlen=api_settings.TRACING_BUFFER_SIZE)
+
+
+exporter = create_exporter()
+
+
+# MARK: Spans
+@contextlib.contextmanager
+def span(name: str, **attributes) -> Iterator[Span | None]:
+    """
+    Записать интервал `name` в текущей трассировке.
+
+    Вне трассировки ничего не записывает и возвращает `None`.
+    """
+
+    parent = current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    child = Span(name, trace_id=parent.trace_id, parent=parent)
+    child.attributes.update(attributes)
+    token = current_span.set(child)
+    try:
+        yield child
+    except BaseException as ex:
+        child.error = repr(ex)
+        raise
+    finally:
+        current_span.reset(token)
+        child.finish()
+
+
+def traced(name: str | None = None) -> Callable:
+    """
+    Декоратор асинхронной функции, записывающий интервал ее выполнения.
+
+    По умолчанию интервал называется по `__qualname__` функции.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if current_span.get() is None:
+                return await func(*args, **kwargs)
+            with span(span_name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def instrument_class(cls: type | None = None, *, include_private: bool = False):
+    """
+    Записывать интервалы асинхронных методов класса `cls`.
+
+    Оборачиваются методы класса, объявленные в самом классе,
+    по умолчанию только публичные. Интервал называется по классу,
+    для которого метод вызван, например `TaskDAO.count`
+    для метода `BaseDAO.count`.
+    """
+
+    def decorator(cls: type) -> type:
+        for name, attr in list(vars(cls).items()):
+            if (
+                (name.startswith("_") and not include_private)
+                or name.startswith("__")
+                or not isinstance(attr, classmethod)
+                or not inspect.iscoroutinefunction(attr.__func__)
+            ):
+                continue
+            setattr(cls, name, classmethod(_traced_method(attr.__func__)))
+        return cls
+
+    return decorator if cls is None else decorator(cls)
+
+
+def _traced_method(func: Callable) -> Callable:
+    """Обернуть метод класса записью интервала с именем класса и метода."""
+
+    @functools.wraps(func)
+    async def wrapper(cls, *args, **kwargs):
+        if current_span.get() is None:
+            return await func(cls, *args, **kwargs)
+        with span(f"{cls.__name__}.{func.__name__}"):
+            return await func(cls, *args, **kwargs)
+
+    return wrapper
+
+
+# MARK: Requests
+def get_trace_id(scope: Scope) -> str:
+    """Получить id трассировки из заголовка запроса или создать новый."""
+
+    header = api_constants.TRACE_ID_HEADER.lower().encode()
+    for name, value in scope["headers"]:
+        if name == header:
+            trace_id = value.decode("latin-1")
+            if TRACE_ID_PATTERN.match(trace_id):
+                return trace_id
+    return uuid.uuid4().hex
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware трассировки HTTP-запросов.
+
+    Возвращает id трассировки в заголовке `X-Trace-Id` и для доли
+    `TRACING_SAMPLE_RATE` запросов записывает корневой интервал запроса.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace_id = get_trace_id(scope)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)[api_constants.TRACE_ID_HEADER] = trace_id
+            await send(message)
+
+        if random.random() >= api_settings.TRACING_SAMPLE_RATE:
+            await self.app(scope, receive, send_wrapper)
+            return
+
+        root_span = Span(f"{scope['method']} {scope['path']}", trace_id=trace_id)
+        token = current_span.set(root_span)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as ex:
+            root_span.error = repr(ex)
+            raise
+        finally:
+            current_span.reset(token)
+            route = scope.get("route")
+            if route is not None:
+                root_span.name = f"{scope['method']} {route.path}"
+            root_span.attributes["http.status_code"] = status_code
+            root_span.finish()
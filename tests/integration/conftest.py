@@ -7,10 +7,11 @@ from faker import Faker
 from fastapi import APIRouter, FastAPI
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.dependencies import get_session
+from src.dependencies import get_read_session, get_session, get_snapshot_session
 from src.tasks.dao import TaskDAO
 from src.tasks.models import TaskModel
 from src.tasks.schemas import TaskCreateSchema, TaskUpdateSchema
+from src.tasks.service import TaskService
 
 faker = Faker()
 
@@ -33,6 +34,8 @@ class BaseTestRouter:
         app = FastAPI()
         app.include_router(self.router)
         app.dependency_overrides[get_session] = lambda: session
+        app.dependency_overrides[get_read_session] = lambda: session
+        app.dependency_overrides[get_snapshot_session] = lambda: session
 
         transport = httpx.ASGITransport(app=app)
         async with httpx.AsyncClient(
@@ -41,6 +44,17 @@ class BaseTestRouter:
             yield async_client
 
 
+# MARK: Cache
+@pytest_asyncio.fixture(autouse=True)
+async def invalidate_tasks_cache():
+    """
+    Сбросить кэш списков задач перед каждым тестом,
+    так как данные тестов не фиксируются в БД.
+    """
+
+    TaskService.invalidate_cache()
+
+
 # MARK: Task
 @pytest_asyncio.fixture
 async def task_data_without_completion() -> TaskCreateSchema:
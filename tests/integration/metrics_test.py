@@ -0,0 +1,105 @@
+import httpx
+from fastapi import FastAPI, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import metrics
+from src.config import Settings
+from src.dependencies import get_read_session, get_session
+from src.main import app
+from src.tasks.models import TaskModel
+from src.tasks.router import tasks_router
+
+
+def get_sample(name: str, labels: str) -> float:
+    """Получить значение метрики `name` с метками `labels`."""
+
+    prefix = f"{name}{{{labels}}} "
+    for line in metrics.render_metrics().splitlines():
+        if line.startswith(prefix):
+            return float(line.removeprefix(prefix))
+    return 0.0
+
+
+class TestMetrics:
+    """Класс для тестирования метрик src.metrics."""
+
+    def test_metrics_enabled_default(self):
+        """Метрики по умолчанию включены только в режимах `DEBUG_MODES`."""
+
+        assert Settings(MODE="TEST").METRICS_ENABLED is True
+        assert Settings(MODE="LOCAL").METRICS_ENABLED is True
+        assert Settings(MODE="DEV").METRICS_ENABLED is False
+        assert Settings(MODE="DEV", METRICS_ENABLED=True).METRICS_ENABLED is True
+
+    def test_histogram(self):
+        """Корзины гистограммы накопительные, значения вне корзин учитываются в +Inf."""
+
+        histogram = metrics.Histogram(
+            "test_histogram_seconds", "Тест.", labelnames=("name",), buckets=(0.1, 1.0)
+        )
+        for value in (0.05, 0.5, 5):
+            histogram.observe(value, name='a"b')
+
+        assert histogram.render().splitlines() == [
+            "# HELP test_histogram_seconds Тест.",
+            "# TYPE test_histogram_seconds histogram",
+            'test_histogram_seconds_bucket{name="a\\"b",le="0.1"} 1',
+            'test_histogram_seconds_bucket{name="a\\"b",le="1.0"} 2',
+            'test_histogram_seconds_bucket{name="a\\"b",le="+Inf"} 3',
+            'test_histogram_seconds_sum{name="a\\"b"} 5.55',
+            'test_histogram_seconds_count{name="a\\"b"} 3',
+        ]
+        metrics.REGISTRY.remove(histogram)
+
+    async def test_request_metrics(self, session: AsyncSession, task_db_not_completed):
+        """
+        Время запросов учитывается по шаблону маршрута,
+        время запросов к БД - по методам DAO.
+        """
+
+        test_app = FastAPI()
+        test_app.add_middleware(metrics.MetricsMiddleware)
+        test_app.include_router(tasks_router)
+        test_app.dependency_overrides[get_session] = lambda: session
+        test_app.dependency_overrides[get_read_session] = lambda: session
+
+        route_labels = 'method="GET",route="/tasks/{task_id}",status="200"'
+        dao_labels = 'method="TaskDAO.get_tasks_data_by_ids"'
+        requests_before = get_sample(
+            "http_request_duration_seconds_count", route_labels
+        )
+        statements_before = get_sample(
+            "db_statement_duration_seconds_count", dao_labels
+        )
+
+        transport = httpx.ASGITransport(app=test_app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            response = await client.get(f"/tasks/{task_db_not_completed.id}")
+        assert response.status_code == status.HTTP_200_OK
+
+        assert (
+            get_sample("http_request_duration_seconds_count", route_labels)
+            == requests_before + 1
+        )
+        assert (
+            get_sample("db_statement_duration_seconds_count", dao_labels)
+            > statements_before
+        )
+        assert get_sample("db_pool_checkout_seconds_count", 'pool="primary"') > 0
+        assert get_sample("db_pool_connections_in_use", 'pool="primary"') >= 1
+
+    async def test_metrics_route(self, task_db_not_completed: TaskModel):
+        """Эндпоинт `/metrics` возвращает метрики в формате Prometheus."""
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            response = await client.get("/metrics")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == metrics.METRICS_MEDIA_TYPE
+        assert "# TYPE db_pool_checkout_seconds histogram" in response.text
+        assert 'db_pool_size{pool="primary"}' in response.text
@@ -0,0 +1,93 @@
+import json
+import sys
+
+import httpx
+import pytest
+from fastapi import FastAPI, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import api_constants, profiling
+from src.config import api_settings
+from src.dependencies import get_read_session, get_session
+from src.tasks.router import tasks_router
+
+
+@pytest.fixture
+async def profiling_client(session: AsyncSession, tmp_path, monkeypatch):
+    """Клиент API с профилированием запросов в каталог `tmp_path`."""
+
+    monkeypatch.setattr(api_settings, "PROFILING_DIR", str(tmp_path))
+    app = FastAPI()
+    app.add_middleware(profiling.ProfilingMiddleware)
+    app.include_router(tasks_router)
+    app.dependency_overrides[get_session] = lambda: session
+    app.dependency_overrides[get_read_session] = lambda: session
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+class TestProfiling:
+    """Класс для тестирования профилирования запросов src.profiling."""
+
+    def test_profiling_allowed(self, monkeypatch: pytest.MonkeyPatch):
+        """Профилирование разрешено только в режимах `PROFILING_MODES`."""
+
+        monkeypatch.setattr(api_settings, "PROFILING_MODES", ["LOCAL"])
+        monkeypatch.setattr(api_settings, "MODE", "DEV")
+        assert profiling.is_profiling_allowed() is False
+        monkeypatch.setattr(api_settings, "MODE", "LOCAL")
+        assert profiling.is_profiling_allowed() is True
+
+    def test_profile_flag(self):
+        """Профилирование запрашивается заголовком или query-параметром."""
+
+        scope = {"headers": [(b"x-profile", b"1")], "query_string": b"limit=1"}
+        assert profiling.pop_profile_flag(scope) is True
+        assert scope["query_string"] == b"limit=1"
+
+        scope = {"headers": [], "query_string": b"limit=1&profile=true&q=a+b"}
+        assert profiling.pop_profile_flag(scope) is True
+        assert scope["query_string"] == b"limit=1&q=a+b"
+
+        scope = {"headers": [], "query_string": b"profile=0"}
+        assert profiling.pop_profile_flag(scope) is False
+        assert scope["query_string"] == b""
+
+    async def test_profile_request(self, profiling_client: httpx.AsyncClient, tmp_path):
+        """Профиль запроса сохраняется, его id возвращается в заголовке ответа."""
+
+        response = await profiling_client.get("/tasks", params={"limit": 1})
+        assert response.status_code == status.HTTP_200_OK
+        assert api_constants.PROFILE_ID_HEADER not in response.headers
+
+        response = await profiling_client.get(
+            "/tasks", params={"limit": 1, "profile": 1}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert "tasks" in response.json()
+        profile_id = response.headers[api_constants.PROFILE_ID_HEADER]
+
+        summary = json.loads(profiling.load_profile(profile_id, "json"))
+        assert summary["path"] == "/tasks"
+        assert summary["duration_ms"] > 0
+        assert summary["peak_memory_kib"] > 0
+        assert all(
+            allocation["file"] != profiling.__file__
+            for allocation in summary["top_allocations"]
+        )
+        assert (tmp_path / f"{profile_id}.folded").exists()
+        assert profiling.load_profile("../" + profile_id, "json") is None
+
+    def test_stack_sampler(self):
+        """Стеки семплов записываются от корня в формате folded."""
+
+        sampler = profiling.StackSampler(thread_id=0, interval=1)
+        stack = profiling.StackSampler._fold(sys._getframe())
+        sampler.stacks[stack] += 2
+
+        assert stack.split(";")[-1].startswith(
+            "TestProfiling.test_stack_sampler (profiling_test.py:"
+        )
+        assert sampler.get_folded() == f"{stack} 2\n"
@@ -0,0 +1,133 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import api_constants, query_log
+from src.config import Settings, api_settings
+from src.dependencies import get_read_session, get_session
+from src.tasks.models import TaskModel
+from src.tasks.router import tasks_router
+from src.tasks.service import TaskService
+
+
+@pytest.fixture
+async def query_log_client(session: AsyncSession):
+    """Клиент API с подсчетом запросов к БД."""
+
+    app = FastAPI()
+    app.add_middleware(query_log.QueryBudgetMiddleware)
+    app.include_router(tasks_router)
+    app.dependency_overrides[get_session] = lambda: session
+    app.dependency_overrides[get_read_session] = lambda: session
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+class TestQueryLog:
+    """Класс для тестирования журнала запросов src.query_log."""
+
+    def test_query_log_enabled_default(self):
+        """Журнал запросов по умолчанию включен только в режимах `DEBUG_MODES`."""
+
+        assert Settings(MODE="TEST").QUERY_LOG_ENABLED is True
+        assert Settings(MODE="DEV").QUERY_LOG_ENABLED is False
+        assert Settings(MODE="DEV", QUERY_LOG_ENABLED=True).QUERY_LOG_ENABLED is True
+
+    async def test_query_count(
+        self,
+        query_log_client: httpx.AsyncClient,
+        task_db_not_completed: TaskModel,
+        monkeypatch: pytest.MonkeyPatch,
+        caplog: pytest.LogCaptureFixture,
+    ):
+        """
+        Число запросов к БД возвращается в заголовках ответа,
+        превышение `QUERY_BUDGET` записывается в журнал.
+        """
+
+        response = await query_log_client.get("/tasks")
+        assert response.status_code == status.HTTP_200_OK
+        query_count = int(response.headers[api_constants.QUERY_COUNT_HEADER])
+        assert 0 < query_count <= api_settings.QUERY_BUDGET
+        assert response.headers["Server-Timing"].startswith("db;dur=")
+        assert "Превышено число запросов" not in caplog.text
+
+        response = await query_log_client.get(f"/tasks/{task_db_not_completed.id}")
+        assert int(response.headers[api_constants.QUERY_COUNT_HEADER]) > 0
+
+        monkeypatch.setattr(api_settings, "QUERY_BUDGET", 0)
+        await query_log_client.get("/tasks", params={"limit": 1})
+        assert "Превышено число запросов" in caplog.text
+        assert '"route": "/tasks"' in caplog.text
+
+    async def test_tasks_list_query_count(
+        self,
+        session: AsyncSession,
+        query_log_client: httpx.AsyncClient,
+        task_db_not_completed: TaskModel,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """
+        Список задач с количеством и ETag получается одним запросом к БД,
+        в том числе при условном запросе с `If-None-Match`, при котором
+        страница задач не сериализуется.
+        """
+
+        monkeypatch.setattr(api_settings, "TASKS_CACHE_ENABLED", False)
+        # Транзакция тестовой сессии открывается до запросов к API,
+        # чтобы ее `SAVEPOINT` не учитывался в числе запросов.
+        await session.execute(select(TaskModel.id))
+
+        response = await query_log_client.get("/tasks")
+        assert response.status_code == status.HTTP_200_OK
+        assert "ETag" in response.headers
+        assert response.headers[api_constants.QUERY_COUNT_HEADER] == "1"
+
+        def dump_tasks_json(*args, **kwargs):
+            raise AssertionError("Страница задач не должна сериализоваться")
+
+        monkeypatch.setattr(TaskService, "_dump_tasks_json", dump_tasks_json)
+        response = await query_log_client.get(
+            "/tasks", headers={"If-None-Match": response.headers["ETag"]}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers[api_constants.QUERY_COUNT_HEADER] == "1"
+
+    async def test_slow_query(
+        self,
+        session: AsyncSession,
+        task_db_not_completed: TaskModel,
+        monkeypatch: pytest.MonkeyPatch,
+        caplog: pytest.LogCaptureFixture,
+    ):
+        """
+        Медленные запросы записываются в журнал, для запросов `SELECT`
+        записывается план выполнения.
+        """
+
+        monkeypatch.setattr(api_settings, "SLOW_QUERY_THRESHOLD", 0)
+        monkeypatch.setattr(api_settings, "SLOW_QUERY_EXPLAIN_RATE", 1)
+
+        await session.execute(
+            update(TaskModel)
+            .where(TaskModel.id == task_db_not_completed.id)
+            .values(title="Новое название")
+        )
+        assert not query_log._explain_tasks
+
+        await session.execute(
+            select(TaskModel.id).where(TaskModel.id == task_db_not_completed.id)
+        )
+        assert query_log._explain_tasks
+        await asyncio.gather(*query_log._explain_tasks)
+
+        assert "Медленный запрос" in caplog.text
+        assert "UPDATE tasks" in caplog.text
+        assert "План медленного запроса" in caplog.text
+        assert '"Actual Total Time"' in caplog.text
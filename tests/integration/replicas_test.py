@@ -0,0 +1,219 @@
+import asyncio
+import time
+import uuid
+
+import httpx
+import pytest
+from fastapi import Request, status
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import api_constants
+from src.config import api_settings
+from src.database import create_engine
+from src.dependencies import get_read_session, get_snapshot_session
+from src.replicas import Replica, ReplicaRouter, replica_router
+from src.tasks.router import tasks_router
+from src.tasks.schemas import TaskCreateSchema
+from src.tasks.service import TaskService
+from tests.integration.conftest import BaseTestRouter
+
+pytestmark = pytest.mark.skipif(
+    not replica_router.enabled, reason="Реплики не настроены в REPLICA_DATABASE_URLS"
+)
+
+
+def make_request(last_write_at: float | None = None, cookie: bool = True) -> Request:
+    """
+    Создать запрос с временем последней записи клиента в cookie
+    или, если `cookie=False`, в заголовке.
+    """
+
+    headers = []
+    if last_write_at is not None and cookie:
+        cookie_value = f"{api_constants.LAST_WRITE_COOKIE}={last_write_at}"
+        headers.append((b"cookie", cookie_value.encode()))
+    elif last_write_at is not None:
+        header = api_constants.LAST_WRITE_HEADER.lower().encode()
+        headers.append((header, str(last_write_at).encode()))
+    return Request({"type": "http", "headers": headers})
+
+
+async def is_replica(session: AsyncSession) -> bool:
+    """Проверить, что сессия открыта на реплике."""
+
+    return await session.scalar(text("SELECT pg_is_in_recovery()"))
+
+
+async def wait_for_replica(replica: Replica) -> None:
+    """Дождаться, пока реплика применит весь WAL основной БД."""
+
+    async with asyncio.timeout(10):
+        while await replica.check_lag() != 0:
+            await asyncio.sleep(0.05)
+
+
+class TestReplicaRouting(BaseTestRouter):
+    """Класс для тестирования маршрутизации чтения по репликам src.replicas."""
+
+    router = tasks_router
+
+    async def test_read_session(self, session: AsyncSession):
+        """
+        Чтение без недавней записи клиента выполняется с реплики,
+        данные реплики не кэшируются сразу после изменения задач.
+        """
+
+        for replica in replica_router.replicas:
+            await wait_for_replica(replica)
+        async for read_session in get_read_session(make_request()):
+            assert await is_replica(read_session) is True
+            assert TaskService._can_cache(read_session) is False
+        assert TaskService._can_cache(session) is True
+
+        last_write_at = time.time() - api_settings.READ_YOUR_WRITES_WINDOW
+        async for read_session in get_read_session(make_request(last_write_at)):
+            assert await is_replica(read_session) is True
+
+        async with await get_snapshot_session(make_request()) as snapshot_session:
+            assert await is_replica(snapshot_session) is True
+            isolation_level = await snapshot_session.scalar(
+                text("SHOW transaction_isolation")
+            )
+            assert isolation_level == "repeatable read"
+
+    async def test_read_your_writes(
+        self,
+        router_client: httpx.AsyncClient,
+        task_data_without_completion: TaskCreateSchema,
+    ):
+        """
+        После записи клиента чтение выполняется с основной БД,
+        если клиент передает время записи в cookie или в заголовке.
+        Неуспешная запись не отмечается.
+        """
+
+        response = await router_client.put(
+            "/tasks",
+            params={"task_id": str(uuid.uuid4())},
+            json={"title": "title", "description": None, "is_completed": True},
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert api_constants.LAST_WRITE_HEADER not in response.headers
+        assert api_constants.LAST_WRITE_COOKIE not in response.cookies
+
+        response = await router_client.post(
+            "/tasks", json=task_data_without_completion.model_dump()
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        last_write_at = float(response.cookies[api_constants.LAST_WRITE_COOKIE])
+        assert last_write_at <= time.time()
+        assert response.headers[api_constants.LAST_WRITE_HEADER] == str(last_write_at)
+
+        for request in (
+            make_request(last_write_at),
+            make_request(last_write_at, cookie=False),
+        ):
+            async for read_session in get_read_session(request):
+                assert await is_replica(read_session) is False
+
+        snapshot_session = await get_snapshot_session(make_request(last_write_at))
+        async with snapshot_session:
+            assert await is_replica(snapshot_session) is False
+
+    async def test_replica_lag(self):
+        """
+        Реплика с задержкой больше допустимой не используется,
+        при выборе реплики задержка не проверяется.
+        """
+
+        router = ReplicaRouter(
+            engines=[replica.engine for replica in replica_router.replicas],
+            max_lag=api_settings.REPLICA_MAX_LAG,
+            lag_check_interval=60,
+        )
+        replica = router.replicas[0]
+        # До первой проверки реплика не используется.
+        assert router.choose() is None
+        assert replica.checked_at is None
+
+        await router.check_lags()
+        assert replica.lag is not None
+        checked_at = replica.checked_at
+        assert router.choose() is replica
+        assert router.get_session_factory() is replica.session_factory
+
+        router.max_lag = -1
+        assert router.choose() is None
+        assert replica.checked_at == checked_at
+
+    async def test_replica_lag_without_receiver(self):
+        """
+        Реплика без подключения к основной БД не считается реплицированной
+        без задержки.
+        """
+
+        replica = replica_router.replicas[0]
+        await wait_for_replica(replica)
+
+        async with replica.engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            primary_conninfo = await conn.scalar(text("SHOW primary_conninfo"))
+            await conn.execute(text("ALTER SYSTEM SET primary_conninfo = ''"))
+            await conn.execute(text("SELECT pg_reload_conf()"))
+            try:
+                async with asyncio.timeout(5):
+                    while await conn.scalar(
+                        text("SELECT count(*) FROM pg_stat_wal_receiver")
+                    ):
+                        await asyncio.sleep(0.05)
+
+                await replica.check_lag()
+                assert replica.lag is None or replica.lag > 0
+            finally:
+                # ALTER SYSTEM не поддерживает параметры запроса.
+                primary_conninfo = primary_conninfo.replace("'", "''")
+                await conn.exec_driver_sql(
+                    f"ALTER SYSTEM SET primary_conninfo = '{primary_conninfo}'"
+                )
+                await conn.execute(text("SELECT pg_reload_conf()"))
+
+        await wait_for_replica(replica)
+
+    async def test_replica_checks(self):
+        """Реплики проверяются в фоновой задаче до ее остановки."""
+
+        router = ReplicaRouter(
+            engines=[replica.engine for replica in replica_router.replicas],
+            max_lag=api_settings.REPLICA_MAX_LAG,
+            lag_check_interval=0.01,
+        )
+        replica = router.replicas[0]
+        router.start()
+        try:
+            async with asyncio.timeout(5):
+                while replica.checked_at is None:
+                    await asyncio.sleep(0.01)
+            assert router.choose() is replica
+        finally:
+            await router.stop()
+        assert router._task is None
+
+    async def test_replica_unavailable(self):
+        """Если реплика недоступна, чтение выполняется с основной БД."""
+
+        url = replica_router.replicas[0].engine.url.set(port=1)
+        engine = create_engine(
+            url.render_as_string(hide_password=False), name="replica_unavailable"
+        )
+        try:
+            router = ReplicaRouter(
+                engines=[engine],
+                max_lag=api_settings.REPLICA_MAX_LAG,
+                lag_check_interval=0,
+            )
+            await router.check_lags()
+            assert router.replicas[0].lag is None
+            assert router.get_session_factory() is None
+        finally:
+            await engine.dispose()
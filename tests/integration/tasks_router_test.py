@@ -1,16 +1,29 @@
+import csv
+import io
+import json
+import uuid
+from datetime import timedelta
+
 import httpx
+import msgpack
+import pytest
 from fastapi import status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.tasks.dao import TaskDAO
 from src.tasks.models import TaskModel
+from src.tasks.raw_dao import TaskRawDAO
 from src.tasks.router import tasks_router
 from src.tasks.schemas import (
+    TaskBulkCreateResultSchema,
+    TaskBulkResultSchema,
     TaskCreateSchema,
+    TaskImportResultSchema,
     TaskReadListSchema,
     TaskReadSchema,
     TaskUpdateSchema,
 )
+from src.tasks.service import TaskService
 from tests.integration.conftest import BaseTestRouter
 
 
@@ -82,20 +95,718 @@ class TestTasksRouter(BaseTestRouter):
         assert tasks_data.tasks[0].is_completed is False
         assert tasks_data.tasks[0].completion == 0
 
-    # MARK: Post
-    async def test_create_task_without_completion(
+    async def test_get_tasks_query_wildcard(
+        self,
+        router_client: httpx.AsyncClient,
+        task_db_not_completed: TaskModel,
+    ):
+        """Символы шаблона `LIKE` в заголовке ищутся как обычные символы."""
+
+        response = await router_client.get(url="/tasks", params={"title": "%"})
+        assert response.status_code == status.HTTP_200_OK
+
+        tasks_data = TaskReadListSchema(**response.json())
+        assert tasks_data.count == 0
+        assert tasks_data.tasks == []
+
+    async def test_get_tasks_completion_filters(
         self,
         session: AsyncSession,
         router_client: httpx.AsyncClient,
+        task_db_not_completed: TaskModel,
+        task_db_completed: TaskModel,
+        task_data_with_completion: TaskCreateSchema,
+    ):
+        """
+        Возможно отфильтровать задачи по статусу, просрочке,
+        сроку завершения и прогрессу выполнения.
+        """
+
+        task_db_overdue = await TaskDAO.add(
+            session=session,
+            obj_in={
+                **task_data_with_completion.model_dump(),
+                "completes_at": TaskDAO.get_completes_at_exp(-1),
+            },
+        )
+        task_db_in_progress = await TaskDAO.add(
+            session=session,
+            obj_in={
+                **task_data_with_completion.model_dump(),
+                "completes_at": TaskDAO.get_completes_at_exp(
+                    task_data_with_completion.time_to_complete // 2
+                ),
+            },
+        )
+        await session.commit()
+
+        for params, tasks_db in (
+            ({"is_completed": True}, [task_db_completed]),
+            ({"overdue": True}, [task_db_overdue]),
+            ({"due_before": task_db_overdue.completes_at}, [task_db_overdue]),
+            (
+                {"min_completion": 40},
+                [task_db_completed, task_db_overdue, task_db_in_progress],
+            ),
+            ({"min_completion": 60}, [task_db_completed, task_db_overdue]),
+        ):
+            response = await router_client.get(
+                url="/tasks", params={**params, "with_count": False}
+            )
+            assert response.status_code == status.HTTP_200_OK
+
+            tasks_data = TaskReadListSchema(**response.json())
+            assert {task.id for task in tasks_data.tasks} == {
+                task_db.id for task_db in tasks_db
+            }
+
+        response = await router_client.get(
+            url="/tasks", params={"overdue": False, "is_completed": False}
+        )
+        tasks_data = TaskReadListSchema(**response.json())
+        assert [task.id for task in tasks_data.tasks] == [
+            task_db_not_completed.id,
+            task_db_in_progress.id,
+        ]
+        assert tasks_data.tasks[1].completes_at == task_db_in_progress.completes_at
+        assert tasks_data.tasks[1].time_to_complete == 10
+        assert 50 <= tasks_data.tasks[1].completion < 60
+
+    async def test_get_tasks_full_text_search(
+        self,
+        router_client: httpx.AsyncClient,
+        task_db_not_completed: TaskModel,
+        task_db_completed: TaskModel,
+    ):
+        """
+        Возможно найти задачи полнотекстовым поиском по заголовку и описанию
+        с выделением найденных слов.
+        """
+
+        response = await router_client.get(
+            url="/tasks", params={"q": "отложенные задачи", "highlight": True}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        tasks_data = TaskReadListSchema(**response.json())
+        assert tasks_data.count == 1
+        assert tasks_data.tasks[0].id == task_db_completed.id
+        assert tasks_data.tasks[0].rank > 0
+        assert tasks_data.tasks[0].title_highlight == "<b>Отложенная</b> <b>задача</b>"
+
+        response = await router_client.get(
+            url="/tasks", params={"q": "задача", "cursor": "cursor"}
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    async def test_get_tasks_cursor(
+        self,
+        router_client: httpx.AsyncClient,
+        task_db_not_completed: TaskModel,
+        task_db_completed: TaskModel,
+    ):
+        """
+        Возможно получить задачи постранично с использованием курсора
+        в обоих направлениях сортировки.
+        """
+
+        for asc, tasks_db in (
+            (True, [task_db_not_completed, task_db_completed]),
+            (False, [task_db_completed, task_db_not_completed]),
+        ):
+            response = await router_client.get(
+                url="/tasks", params={"limit": 1, "asc": asc}
+            )
+            assert response.status_code == status.HTTP_200_OK
+
+            first_page = TaskReadListSchema(**response.json())
+            assert first_page.count == 2
+            assert [task.id for task in first_page.tasks] == [tasks_db[0].id]
+            assert first_page.next_cursor is not None
+
+            response = await router_client.get(
+                url="/tasks",
+                params={"limit": 1, "asc": asc, "cursor": first_page.next_cursor},
+            )
+            assert response.status_code == status.HTTP_200_OK
+
+            second_page = TaskReadListSchema(**response.json())
+            assert second_page.count == 2
+            assert [task.id for task in second_page.tasks] == [tasks_db[1].id]
+            assert second_page.next_cursor is None
+
+    async def test_get_tasks_full_text_search_pages(
+        self,
+        router_client: httpx.AsyncClient,
+        task_db_not_completed: TaskModel,
+        task_db_completed: TaskModel,
+    ):
+        """
+        При полнотекстовом поиске курсор следующей страницы не возвращается,
+        следующая страница запрашивается по `offset`.
+        """
+
+        pages = []
+        for offset in (0, 1):
+            response = await router_client.get(
+                url="/tasks", params={"q": "задача", "limit": 1, "offset": offset}
+            )
+            assert response.status_code == status.HTTP_200_OK
+
+            page = TaskReadListSchema(**response.json())
+            assert page.next_cursor is None
+            pages += [task.id for task in page.tasks]
+
+        assert sorted(pages) == sorted([task_db_not_completed.id, task_db_completed.id])
+
+    async def test_get_tasks_without_count(
+        self,
+        router_client: httpx.AsyncClient,
+        task_db_not_completed: TaskModel,
+        task_db_completed: TaskModel,
+    ):
+        """Возможно получить задачи без подсчета их общего количества."""
+
+        response = await router_client.get(
+            url="/tasks", params={"with_count": False, "limit": 1}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        tasks_data = TaskReadListSchema(**response.json())
+        assert tasks_data.count is None
+        assert [task.id for task in tasks_data.tasks] == [task_db_not_completed.id]
+
+    async def test_get_tasks_count_out_of_range(
+        self,
+        router_client: httpx.AsyncClient,
+        task_db_not_completed: TaskModel,
+        task_db_completed: TaskModel,
+    ):
+        """Общее количество задач возвращается для страницы за пределами выборки."""
+
+        response = await router_client.get(url="/tasks", params={"offset": 10})
+        assert response.status_code == status.HTTP_200_OK
+
+        tasks_data = TaskReadListSchema(**response.json())
+        assert tasks_data.count == 2
+        assert tasks_data.tasks == []
+
+    async def test_get_tasks_count_capped(
+        self,
+        router_client: httpx.AsyncClient,
+        task_db_not_completed: TaskModel,
+        task_db_completed: TaskModel,
+        mocker,
+    ):
+        """
+        Подсчет задач со стратегией `capped` останавливается на пределе подсчета,
+        а ниже предела возвращается точное количество.
+        """
+
+        mocker.patch("src.api_constants.COUNT_CAP", 1)
+
+        response = await router_client.get(
+            url="/tasks", params={"count_strategy": "capped"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        tasks_data = TaskReadListSchema(**response.json())
+        assert tasks_data.count == 1
+        assert tasks_data.count_strategy == "capped"
+        assert len(tasks_data.tasks) == 2
+
+        mocker.patch("src.api_constants.COUNT_CAP", 3)
+        # Предел подсчета не входит в ключ кэша списков задач.
+        TaskService.invalidate_cache()
+
+        response = await router_client.get(
+            url="/tasks", params={"count_strategy": "capped"}
+        )
+        tasks_data = TaskReadListSchema(**response.json())
+        assert tasks_data.count == 2
+        assert tasks_data.count_strategy == "exact"
+
+    async def test_get_tasks_count_estimated(
+        self,
+        router_client: httpx.AsyncClient,
+        task_db_not_completed: TaskModel,
+    ):
+        """Возможно получить оценку количества задач по статистике планировщика."""
+
+        response = await router_client.get(
+            url="/tasks", params={"count_strategy": "estimated", "title": "обычная"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        tasks_data = TaskReadListSchema(**response.json())
+        assert tasks_data.count_strategy == "estimated"
+        assert tasks_data.count >= 0
+        assert [task.id for task in tasks_data.tasks] == [task_db_not_completed.id]
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"title": "a :foo"},
+            {"q": "обычная задача"},
+            {"ids": "{task_id}"},
+        ],
+    )
+    async def test_get_tasks_count_estimated_filters(
+        self,
+        router_client: httpx.AsyncClient,
+        task_db_not_completed: TaskModel,
+        params: dict,
+    ):
+        """
+        Оценка количества задач возможна с любыми параметрами фильтрации,
+        параметры не подставляются в текст запроса `EXPLAIN`.
+        """
+
+        params = {
+            name: value.format(task_id=task_db_not_completed.id)
+            for name, value in params.items()
+        }
+        response = await router_client.get(
+            url="/tasks", params={"count_strategy": "estimated", **params}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        tasks_data = TaskReadListSchema(**response.json())
+        assert tasks_data.count_strategy == "estimated"
+        assert tasks_data.count >= 0
+
+    async def test_get_tasks_invalid_cursor(self, router_client: httpx.AsyncClient):
+        """Невозможно получить задачи с некорректным курсором."""
+
+        response = await router_client.get(url="/tasks", params={"cursor": "invalid"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    async def test_get_tasks_cache(
+        self,
+        router_client: httpx.AsyncClient,
+        task_db_not_completed: TaskModel,
         task_data_without_completion: TaskCreateSchema,
+    ):
+        """
+        Повторный запрос списка задач возвращается из кэша,
+        а создание задачи делает кэш недействительным.
+        """
+
+        stats = (await router_client.get(url="/tasks/cache")).json()
+
+        for _ in range(2):
+            response = await router_client.get(url="/tasks")
+            assert TaskReadListSchema(**response.json()).count == 1
+
+        # Список задач хранится в кэше вместе с его ETag.
+        cache_stats = (await router_client.get(url="/tasks/cache")).json()
+        assert cache_stats["lists"]["misses"] == stats["lists"]["misses"] + 1
+        assert cache_stats["lists"]["hits"] == stats["lists"]["hits"] + 1
+
+        await router_client.post(
+            url="/tasks", json=task_data_without_completion.model_dump(mode="json")
+        )
+        response = await router_client.get(url="/tasks")
+        assert TaskReadListSchema(**response.json()).count == 2
+
+    async def test_get_tasks_cache_pending(
+        self,
+        router_client: httpx.AsyncClient,
+        task_data_with_completion: TaskCreateSchema,
         mocker,
     ):
-        """Возможно создать задачу без указания параметра `time_to_complete`."""
+        """
+        Список с незавершенными задачами со сроком завершения хранится
+        в кэше не дольше `TASKS_CACHE_COMPLETION_TOLERANCE` секунд,
+        даже если прогресс выполнения не запрошен.
+        """
+
+        await router_client.post(
+            url="/tasks", json=task_data_with_completion.model_dump(mode="json")
+        )
+        mocker.patch("src.config.api_settings.TASKS_CACHE_COMPLETION_TOLERANCE", 0)
+        stats = (await router_client.get(url="/tasks/cache")).json()
+
+        for _ in range(2):
+            response = await router_client.get(
+                url="/tasks", params={"fields": "title,is_completed"}
+            )
+            assert response.status_code == status.HTTP_200_OK
+
+        cache_stats = (await router_client.get(url="/tasks/cache")).json()
+        assert cache_stats["lists"]["misses"] == stats["lists"]["misses"] + 2
+        assert cache_stats["lists"]["hits"] == stats["lists"]["hits"]
+
+    async def test_get_tasks_etag(
+        self,
+        router_client: httpx.AsyncClient,
+        task_db_not_completed: TaskModel,
+        task_db_completed: TaskModel,
+    ):
+        """
+        Список задач возвращается с заголовком `ETag`, при совпадении
+        `If-None-Match` возвращается `304 Not Modified` без тела,
+        а после изменения задач - новый список.
+        """
+
+        response = await router_client.get(url="/tasks")
+        assert response.status_code == status.HTTP_200_OK
+        tasks_etag = response.headers["ETag"]
+
+        response = await router_client.get(
+            url="/tasks", headers={"If-None-Match": tasks_etag}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["ETag"] == tasks_etag
+        assert response.content == b""
+
+        response = await router_client.get(
+            url="/tasks",
+            params={"is_completed": True},
+            headers={"If-None-Match": tasks_etag},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != tasks_etag
+
+        await router_client.delete(
+            url="/tasks", params={"task_id": task_db_completed.id}
+        )
+        response = await router_client.get(
+            url="/tasks", headers={"If-None-Match": tasks_etag}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert TaskReadListSchema(**response.json()).count == 1
+
+    async def test_get_tasks_etag_in_progress(
+        self,
+        router_client: httpx.AsyncClient,
+        task_data_with_completion: TaskCreateSchema,
+    ):
+        """
+        Для списка с задачами, прогресс выполнения которых растет,
+        заголовок `ETag` не формируется.
+        """
+
+        await router_client.post(
+            url="/tasks", json=task_data_with_completion.model_dump(mode="json")
+        )
+        response = await router_client.get(url="/tasks")
+        assert response.status_code == status.HTTP_200_OK
+        assert "ETag" not in response.headers
+
+    async def test_get_tasks_fast_json(
+        self,
+        router_client: httpx.AsyncClient,
+        task_db_not_completed: TaskModel,
+        task_db_completed: TaskModel,
+        mocker,
+    ):
+        """
+        Список задач, сериализованный без Pydantic при `TASKS_FAST_JSON=True`,
+        совпадает со списком, сериализованным через `TaskReadListSchema`.
+        """
+
+        for params in (
+            {"limit": 1},
+            {"q": "задача", "highlight": True},
+            {"with_count": False},
+            {"fields": "id,completion", "q": "задача"},
+        ):
+            mocker.patch("src.config.api_settings.TASKS_FAST_JSON", False)
+            response = await router_client.get(url="/tasks", params=params)
+            assert response.status_code == status.HTTP_200_OK
+
+            mocker.patch("src.config.api_settings.TASKS_FAST_JSON", True)
+            fast_response = await router_client.get(url="/tasks", params=params)
+            assert fast_response.status_code == status.HTTP_200_OK
+            assert fast_response.headers["content-type"] == "application/json"
+            assert fast_response.headers.get("ETag") == response.headers.get("ETag")
+            assert fast_response.content == response.content
+
+    async def test_get_tasks_fields(
+        self,
+        session: AsyncSession,
+        router_client: httpx.AsyncClient,
+        task_data_with_completion: TaskCreateSchema,
+    ):
+        """
+        Параметр `fields` ограничивает поля задач в ответе и выборку из БД.
+
+        Если прогресс выполнения не запрошен, он не вычисляется,
+        а список с растущим прогрессом задач получает `ETag`.
+        """
+
+        await router_client.post(
+            url="/tasks", json=task_data_with_completion.model_dump(mode="json")
+        )
+
+        response = await router_client.get(
+            url="/tasks", params={"fields": "title, is_completed"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["tasks"] == [
+            {"title": task_data_with_completion.title, "is_completed": False}
+        ]
+        assert "ETag" in response.headers
+
+        response = await router_client.get(
+            url="/tasks", params=[("fields", "id"), ("fields", "completion")]
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["tasks"][0].keys() == {"id", "completion"}
+        assert "ETag" not in response.headers
+
+        response = await router_client.get(url="/tasks", params={"fields": "secret"})
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
-        background_task = mocker.patch(
-            "src.tasks.service.TaskService._update_task_status_in_background",
-            return_value=None,
+        task_mappings = await TaskDAO.get_tasks_data(
+            offset=None, limit=None, asc=True, fields=["title"], session=session
         )
+        assert "completion" not in task_mappings[0]
+        assert "description" not in task_mappings[0]
+
+    async def test_get_tasks_asyncpg_backend(
+        self,
+        router_client: httpx.AsyncClient,
+        task_db_not_completed: TaskModel,
+        task_db_completed: TaskModel,
+        task_data_with_completion: TaskCreateSchema,
+        mocker,
+    ):
+        """
+        Список задач и задача по id, полученные запросами asyncpg
+        при `TASKS_DAO_BACKEND=asyncpg`, совпадают с полученными через ORM.
+        """
+
+        await router_client.post(
+            url="/tasks", json=task_data_with_completion.model_dump(mode="json")
+        )
+        raw_get_tasks_data = mocker.spy(TaskRawDAO, "get_tasks_data")
+
+        first_page = await router_client.get(url="/tasks", params={"limit": 1})
+        for params in (
+            {},
+            {"limit": 1, "asc": False, "count_strategy": "capped"},
+            {"cursor": first_page.json()["next_cursor"]},
+            {"offset": 10},
+            {"is_completed": False, "overdue": False},
+            {"ids": [str(task_db_completed.id)], "due_before": "2100-01-01T00:00:00Z"},
+        ):
+            responses = {}
+            for backend in ("orm", "asyncpg"):
+                mocker.patch("src.config.api_settings.TASKS_DAO_BACKEND", backend)
+                TaskService.invalidate_cache()
+                response = await router_client.get(url="/tasks", params=params)
+                assert response.status_code == status.HTTP_200_OK
+                responses[backend] = response.json()
+            assert responses["asyncpg"] == responses["orm"]
+
+        assert raw_get_tasks_data.call_count == 6
+
+        responses = {}
+        for backend in ("orm", "asyncpg"):
+            mocker.patch("src.config.api_settings.TASKS_DAO_BACKEND", backend)
+            TaskService.invalidate_cache()
+            response = await router_client.get(url=f"/tasks/{task_db_not_completed.id}")
+            assert response.status_code == status.HTTP_200_OK
+            responses[backend] = (response.json(), response.headers["ETag"])
+        assert responses["asyncpg"] == responses["orm"]
+
+    async def test_get_tasks_by_ids(
+        self,
+        router_client: httpx.AsyncClient,
+        task_db_not_completed: TaskModel,
+        task_db_completed: TaskModel,
+    ):
+        """Возможно получить задачи по списку `ids`."""
+
+        response = await router_client.get(
+            url="/tasks", params={"ids": [str(task_db_completed.id), str(uuid.uuid4())]}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        tasks_data = TaskReadListSchema(**response.json())
+        assert tasks_data.count == 1
+        assert [task.id for task in tasks_data.tasks] == [task_db_completed.id]
+
+    async def test_get_tasks_by_ids_invalidated(
+        self,
+        session: AsyncSession,
+        task_db_not_completed: TaskModel,
+        mocker,
+    ):
+        """
+        Задачи, полученные из БД во время сброса кэша, не сохраняются в кэш.
+        """
+
+        get_tasks_data_by_ids = TaskDAO.get_tasks_data_by_ids
+
+        async def get_tasks_data_invalidated(ids, session):
+            task_mappings = await get_tasks_data_by_ids(ids=ids, session=session)
+            TaskService.invalidate_cache()
+            return task_mappings
+
+        mocker.patch("src.config.api_settings.TASKS_DAO_BACKEND", "orm")
+        patched = mocker.patch.object(
+            TaskDAO, "get_tasks_data_by_ids", side_effect=get_tasks_data_invalidated
+        )
+        TaskService.invalidate_cache()
+
+        tasks = await TaskService.get_tasks_by_ids(
+            ids=[task_db_not_completed.id], session=session
+        )
+        assert task_db_not_completed.id in tasks
+        assert TaskService._task_cache.get(task_db_not_completed.id) is None
+
+        patched.side_effect = get_tasks_data_by_ids
+        tasks = await TaskService.get_tasks_by_ids(
+            ids=[task_db_not_completed.id], session=session
+        )
+        assert task_db_not_completed.id in tasks
+        assert TaskService._task_cache.get(task_db_not_completed.id) is not None
+
+    async def test_get_task(
+        self,
+        router_client: httpx.AsyncClient,
+        task_db_not_completed: TaskModel,
+        task_data_update: TaskUpdateSchema,
+    ):
+        """
+        Возможно получить задачу по id с заголовком `ETag`, повторный запрос
+        возвращается из кэша, а после обновления задачи кэш задачи сбрасывается.
+        """
+
+        stats = (await router_client.get(url="/tasks/cache")).json()["tasks"]
+
+        response = await router_client.get(url=f"/tasks/{task_db_not_completed.id}")
+        assert response.status_code == status.HTTP_200_OK
+        task_data = TaskReadSchema(**response.json())
+        assert task_data.id == task_db_not_completed.id
+        assert task_data.title == task_db_not_completed.title
+        task_etag = response.headers["ETag"]
+
+        response = await router_client.get(
+            url=f"/tasks/{task_db_not_completed.id}",
+            headers={"If-None-Match": task_etag},
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        cache_stats = (await router_client.get(url="/tasks/cache")).json()["tasks"]
+        assert cache_stats["hits"] == stats["hits"] + 1
+
+        await router_client.put(
+            url="/tasks",
+            params={"task_id": task_db_not_completed.id},
+            json=task_data_update.model_dump(mode="json"),
+        )
+        response = await router_client.get(url=f"/tasks/{task_db_not_completed.id}")
+        assert response.status_code == status.HTTP_200_OK
+        assert TaskReadSchema(**response.json()).title == task_data_update.title
+
+    async def test_get_task_not_found(self, router_client: httpx.AsyncClient):
+        """Невозможно получить несуществующую задачу."""
+
+        response = await router_client.get(url=f"/tasks/{uuid.uuid4()}")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_get_tasks_msgpack(
+        self,
+        router_client: httpx.AsyncClient,
+        task_db_not_completed: TaskModel,
+        mocker,
+    ):
+        """
+        Возможно получить задачу и список задач в формате MessagePack
+        с отдельным `ETag`, в том числе при сериализации списков без Pydantic.
+        """
+
+        mocker.patch("src.config.api_settings.TASKS_FAST_JSON", True)
+        headers = {"Accept": "application/json;q=0.5, application/msgpack"}
+
+        response = await router_client.get(
+            url=f"/tasks/{task_db_not_completed.id}", headers=headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["Content-Type"] == "application/msgpack"
+        assert "Accept" in response.headers["Vary"]
+        task_data = TaskReadSchema(**msgpack.unpackb(response.content))
+        assert task_data.id == task_db_not_completed.id
+
+        json_response = await router_client.get(
+            url=f"/tasks/{task_db_not_completed.id}"
+        )
+        assert json_response.headers["ETag"] != response.headers["ETag"]
+
+        response = await router_client.get(
+            url=f"/tasks/{task_db_not_completed.id}",
+            headers={**headers, "If-None-Match": response.headers["ETag"]},
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        response = await router_client.get(url="/tasks", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["Content-Type"] == "application/msgpack"
+        tasks_list = TaskReadListSchema(**msgpack.unpackb(response.content))
+        assert tasks_list.tasks[0].id == task_db_not_completed.id
+
+    # MARK: Export
+    async def test_export_tasks_ndjson(
+        self,
+        router_client: httpx.AsyncClient,
+        task_db_not_completed: TaskModel,
+        task_db_completed: TaskModel,
+    ):
+        """Возможно выгрузить задачи в формате NDJSON с фильтрацией."""
+
+        response = await router_client.get(
+            url="/tasks/export", params={"is_completed": False}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        tasks = [json.loads(line) for line in response.text.splitlines()]
+        assert len(tasks) == 1
+        assert tasks[0]["id"] == str(task_db_not_completed.id)
+        assert tasks[0]["title"] == task_db_not_completed.title
+        assert tasks[0]["is_completed"] is False
+        assert tasks[0]["completion"] == 0
+
+    async def test_export_tasks_csv(
+        self,
+        router_client: httpx.AsyncClient,
+        task_db_not_completed: TaskModel,
+        task_db_completed: TaskModel,
+        mocker,
+    ):
+        """
+        Возможно выгрузить задачи в формате CSV в порядке создания,
+        задачи читаются частями по `EXPORT_BATCH_SIZE`.
+        """
+
+        mocker.patch("src.api_constants.EXPORT_BATCH_SIZE", 1)
+
+        response = await router_client.get(
+            url="/tasks/export", params={"format": "csv"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["id"] for row in rows] == [
+            str(task_db_not_completed.id),
+            str(task_db_completed.id),
+        ]
+        assert rows[0]["time_to_complete"] == ""
+        assert rows[1]["is_completed"] == "True"
+
+    # MARK: Post
+    async def test_create_task_without_completion(
+        self,
+        session: AsyncSession,
+        router_client: httpx.AsyncClient,
+        task_data_without_completion: TaskCreateSchema,
+    ):
+        """Возможно создать задачу без указания параметра `time_to_complete`."""
 
         response = await router_client.post(
             url="/tasks", json=task_data_without_completion.model_dump(mode="json")
@@ -118,24 +829,21 @@ class TestTasksRouter(BaseTestRouter):
         assert task_db.description == task_data.description
         assert task_db.is_completed is False
         assert task_db.time_to_complete is None
+        assert task_db.completes_at is None
         assert task_db.created_at is not None
         assert task_db.updated_at is not None
 
-        background_task.assert_not_called()
-
     async def test_create_task_with_completion(
         self,
         session: AsyncSession,
         router_client: httpx.AsyncClient,
         task_data_with_completion: TaskCreateSchema,
-        mocker,
     ):
-        """Возможно создать задачу c указанием параметра `time_to_complete`."""
+        """
+        Возможно создать задачу c указанием параметра `time_to_complete`.
 
-        background_task = mocker.patch(
-            "src.tasks.service.TaskService._update_task_status_in_background",
-            return_value=None,
-        )
+        Для задачи сохраняется срок автоматического завершения `completes_at`.
+        """
 
         response = await router_client.post(
             url="/tasks", json=task_data_with_completion.model_dump(mode="json")
@@ -160,12 +868,234 @@ class TestTasksRouter(BaseTestRouter):
         assert task_db.time_to_complete == task_data_with_completion.time_to_complete
         assert task_db.created_at is not None
         assert task_db.updated_at is not None
+        assert task_db.completes_at == task_db.created_at + timedelta(
+            seconds=task_data_with_completion.time_to_complete
+        )
 
-        background_task.assert_called_once_with(
-            task_id=task_data.id,
-            time_to_complete=task_data_with_completion.time_to_complete,
-            session=session,
+    async def test_create_task_msgpack(
+        self,
+        router_client: httpx.AsyncClient,
+        task_data_with_completion: TaskCreateSchema,
+    ):
+        """
+        Возможно создать задачу с телом запроса и ответом в формате MessagePack.
+
+        Некорректное тело запроса в формате MessagePack отклоняется.
+        """
+
+        headers = {
+            "Content-Type": "application/msgpack",
+            "Accept": "application/msgpack",
+        }
+        response = await router_client.post(
+            url="/tasks",
+            content=msgpack.packb(task_data_with_completion.model_dump(mode="json")),
+            headers=headers,
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.headers["Content-Type"] == "application/msgpack"
+
+        task_data = TaskReadSchema(**msgpack.unpackb(response.content))
+        assert task_data.title == task_data_with_completion.title
+        assert task_data.completion == 0
+
+        response = await router_client.post(
+            url="/tasks", content=b"\xc1", headers=headers
         )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = await router_client.post(
+            url="/tasks",
+            content=msgpack.packb({"description": "Без заголовка"}),
+            headers=headers,
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    async def test_create_tasks_bulk(
+        self,
+        session: AsyncSession,
+        router_client: httpx.AsyncClient,
+        task_data_without_completion: TaskCreateSchema,
+        task_data_with_completion: TaskCreateSchema,
+    ):
+        """
+        Возможно создать задачи пакетно массивом JSON.
+
+        Элементы, не прошедшие валидацию, возвращаются в `errors`.
+        """
+
+        response = await router_client.post(
+            url="/tasks/bulk",
+            json=[
+                task_data_without_completion.model_dump(mode="json"),
+                {"description": "Задача без заголовка"},
+                task_data_with_completion.model_dump(mode="json"),
+            ],
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+        result = TaskBulkCreateResultSchema(**response.json())
+        assert result.created == 2
+        assert [error.index for error in result.errors] == [1]
+        assert result.errors[0].errors[0]["loc"] == ["title"]
+
+        task_db = await TaskDAO.find_one_or_none(
+            TaskModel.id == result.ids[1], session=session
+        )
+        assert task_db.title == task_data_with_completion.title
+        assert task_db.is_completed is False
+        assert task_db.completes_at == task_db.created_at + timedelta(
+            seconds=task_data_with_completion.time_to_complete
+        )
+
+    async def test_create_tasks_bulk_ndjson_copy(
+        self,
+        session: AsyncSession,
+        router_client: httpx.AsyncClient,
+        task_data_without_completion: TaskCreateSchema,
+        task_data_with_completion: TaskCreateSchema,
+        mocker,
+    ):
+        """
+        Возможно создать задачи пакетно в формате NDJSON,
+        начиная с порога задачи создаются командой `COPY`.
+        """
+
+        mocker.patch("src.api_constants.BULK_COPY_THRESHOLD", 1)
+
+        lines = [
+            task_data_without_completion.model_dump_json(),
+            "{invalid",
+            task_data_with_completion.model_dump_json(),
+        ]
+        response = await router_client.post(
+            url="/tasks/bulk",
+            content="\n".join(lines),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+        result = TaskBulkCreateResultSchema(**response.json())
+        assert result.created == 2
+        assert [error.index for error in result.errors] == [1]
+
+        tasks_db = [
+            await TaskDAO.find_one_or_none(TaskModel.id == task_id, session=session)
+            for task_id in result.ids
+        ]
+        assert tasks_db[0].title == task_data_without_completion.title
+        assert tasks_db[0].completes_at is None
+        assert tasks_db[1].is_completed is False
+        assert tasks_db[1].completes_at == tasks_db[1].created_at + timedelta(
+            seconds=task_data_with_completion.time_to_complete
+        )
+
+    async def test_create_tasks_bulk_msgpack(
+        self,
+        router_client: httpx.AsyncClient,
+        task_data_without_completion: TaskCreateSchema,
+        task_data_with_completion: TaskCreateSchema,
+    ):
+        """Возможно создать задачи пакетно массивом MessagePack."""
+
+        response = await router_client.post(
+            url="/tasks/bulk",
+            content=msgpack.packb(
+                [
+                    task_data_without_completion.model_dump(mode="json"),
+                    task_data_with_completion.model_dump(mode="json"),
+                ]
+            ),
+            headers={"Content-Type": "application/msgpack"},
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.headers["Content-Type"] == "application/json"
+
+        result = TaskBulkCreateResultSchema(**response.json())
+        assert result.created == 2
+        assert result.errors == []
+
+    async def test_create_tasks_bulk_invalid_body(
+        self, router_client: httpx.AsyncClient, mocker
+    ):
+        """
+        Невозможно создать задачи пакетно, если тело запроса не является
+        массивом JSON или превышено число задач в запросе.
+        """
+
+        response = await router_client.post(url="/tasks/bulk", json={"title": "Задача"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        mocker.patch("src.api_constants.BULK_CREATE_MAX_ITEMS", 1)
+
+        response = await router_client.post(
+            url="/tasks/bulk", content=json.dumps([{"title": "1"}, {"title": "2"}])
+        )
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+    async def test_import_tasks_csv(
+        self,
+        session: AsyncSession,
+        router_client: httpx.AsyncClient,
+        mocker,
+    ):
+        """
+        Возможно импортировать задачи из файла CSV, записи проверяются
+        частями по `IMPORT_CHUNK_SIZE`, отклоненные записи возвращаются в `errors`.
+        """
+
+        mocker.patch("src.api_constants.IMPORT_CHUNK_SIZE", 2)
+
+        content = (
+            "title,description,time_to_complete\n"
+            'Первая задача,"Описание, с запятой",\n'
+            ",Задача без заголовка,\n"
+            "Вторая задача,,30\n"
+        )
+        response = await router_client.post(
+            url="/tasks/import",
+            params={"format": "csv"},
+            files={"file": ("tasks.csv", content.encode(), "text/csv")},
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+        result = TaskImportResultSchema(**response.json())
+        assert result.total == 3
+        assert result.imported == 2
+        assert result.rejected == 1
+        assert [error.index for error in result.errors] == [1]
+
+        task_db = await TaskDAO.find_one_or_none(
+            TaskModel.title == "Первая задача", session=session
+        )
+        assert task_db.description == "Описание, с запятой"
+        assert task_db.completes_at is None
+
+        task_db = await TaskDAO.find_one_or_none(
+            TaskModel.title == "Вторая задача", session=session
+        )
+        assert task_db.description is None
+        assert task_db.is_completed is False
+        assert task_db.completes_at == task_db.created_at + timedelta(seconds=30)
+
+    async def test_import_tasks_ndjson(
+        self,
+        router_client: httpx.AsyncClient,
+        task_data_with_completion: TaskCreateSchema,
+    ):
+        """Возможно импортировать задачи из файла NDJSON."""
+
+        content = f"{task_data_with_completion.model_dump_json()}\n{{invalid\n"
+        response = await router_client.post(
+            url="/tasks/import",
+            files={"file": ("tasks.ndjson", content.encode())},
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+        result = TaskImportResultSchema(**response.json())
+        assert result.imported == 1
+        assert result.rejected == 1
+        assert result.rows_per_second > 0
 
     # MARK: Put
     async def test_update_task(
@@ -210,3 +1140,98 @@ class TestTasksRouter(BaseTestRouter):
             TaskModel.id == task_db_not_completed.id, session=session
         )
         assert task_db is None
+
+    # MARK: Bulk
+    async def test_complete_tasks_bulk(
+        self,
+        session: AsyncSession,
+        router_client: httpx.AsyncClient,
+        task_db_not_completed: TaskModel,
+        task_db_completed: TaskModel,
+    ):
+        """
+        Возможно отметить задачи выполненными пакетно по списку `ids`,
+        в ответе возвращаются только задачи с измененным статусом.
+        """
+
+        response = await router_client.post(
+            url="/tasks/bulk/complete",
+            json={"ids": [str(task_db_not_completed.id), str(task_db_completed.id)]},
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        result = TaskBulkResultSchema(**response.json())
+        assert result.count == 1
+        assert result.ids == [task_db_not_completed.id]
+
+        await session.refresh(task_db_not_completed)
+        assert task_db_not_completed.is_completed is True
+
+    async def test_update_tasks_bulk_filter(
+        self,
+        session: AsyncSession,
+        router_client: httpx.AsyncClient,
+        task_db_not_completed: TaskModel,
+        task_db_completed: TaskModel,
+        mocker,
+    ):
+        """
+        Возможно частично обновить задачи пакетно по параметрам фильтрации,
+        задачи обрабатываются частями по `BULK_CHUNK_SIZE`.
+        """
+
+        mocker.patch("src.api_constants.BULK_CHUNK_SIZE", 1)
+
+        response = await router_client.post(
+            url="/tasks/bulk/update",
+            json={"filter": {}, "data": {"description": "Новое описание"}},
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        result = TaskBulkResultSchema(**response.json())
+        assert result.count == 2
+        assert set(result.ids) == {task_db_not_completed.id, task_db_completed.id}
+
+        for task_db in (task_db_not_completed, task_db_completed):
+            await session.refresh(task_db)
+            assert task_db.description == "Новое описание"
+
+    async def test_delete_tasks_bulk_filter(
+        self,
+        session: AsyncSession,
+        router_client: httpx.AsyncClient,
+        task_db_not_completed: TaskModel,
+        task_db_completed: TaskModel,
+    ):
+        """Возможно удалить задачи пакетно по параметрам фильтрации."""
+
+        response = await router_client.post(
+            url="/tasks/bulk/delete", json={"filter": {"is_completed": True}}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        result = TaskBulkResultSchema(**response.json())
+        assert result.ids == [task_db_completed.id]
+        assert await TaskDAO.count(session=session) == 1
+
+    async def test_tasks_bulk_invalid_selector(self, router_client: httpx.AsyncClient):
+        """
+        Невозможно выполнить пакетную операцию без способа выбора задач,
+        с обоими способами сразу или без обновляемых полей.
+        """
+
+        for json_data in (
+            {},
+            {"ids": [], "filter": {}},
+            {"ids": ["00000000-0000-0000-0000-000000000000"], "filter": {}},
+        ):
+            response = await router_client.post(
+                url="/tasks/bulk/delete", json=json_data
+            )
+            assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+        for data in ({}, {"title": None}):
+            response = await router_client.post(
+                url="/tasks/bulk/update", json={"filter": {}, "data": data}
+            )
+            assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
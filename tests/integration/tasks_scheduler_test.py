@@ -0,0 +1,123 @@
+from datetime import timedelta
+
+import httpx
+from fastapi import status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.tasks.dao import TaskDAO
+from src.tasks.router import tasks_router
+from src.tasks.scheduler import TaskCompletionScheduler
+from src.tasks.schemas import TaskCreateSchema, TaskSchedulerStatsSchema
+from tests.integration.conftest import BaseTestRouter
+
+
+class TestTaskCompletionScheduler(BaseTestRouter):
+    """
+    Класс для тестирования планировщика
+    src.tasks.scheduler.TaskCompletionScheduler.
+    """
+
+    router = tasks_router
+
+    async def test_sweep(
+        self,
+        session: AsyncSession,
+        task_data_with_completion: TaskCreateSchema,
+    ):
+        """
+        Планировщик завершает только задачи с наступившим сроком
+        и учитывает задержку завершения в метриках.
+        """
+
+        task_db_due = await TaskDAO.add(
+            session=session,
+            obj_in={
+                **task_data_with_completion.model_dump(),
+                "completes_at": TaskDAO.get_completes_at_exp(-5),
+            },
+        )
+        task_db_pending = await TaskDAO.add(
+            session=session,
+            obj_in={
+                **task_data_with_completion.model_dump(),
+                "completes_at": TaskDAO.get_completes_at_exp(60),
+            },
+        )
+        await session.commit()
+
+        scheduler = TaskCompletionScheduler(batch_size=10)
+        completed_tasks = await scheduler.sweep(session=session)
+        assert completed_tasks == 1
+
+        await session.refresh(task_db_due)
+        await session.refresh(task_db_pending)
+        assert task_db_due.is_completed is True
+        assert task_db_pending.is_completed is False
+
+        assert scheduler.stats.sweeps == 1
+        assert scheduler.stats.completed_tasks == 1
+        assert scheduler.stats.last_lag >= timedelta(seconds=5).total_seconds()
+        assert scheduler.stats.max_lag == scheduler.stats.last_lag
+
+        assert await scheduler.sweep(session=session) == 0
+        assert scheduler.stats.sweeps == 2
+        assert scheduler.stats.completed_tasks == 1
+
+    async def test_sweep_reopened_tasks(
+        self,
+        session: AsyncSession,
+        router_client: httpx.AsyncClient,
+        task_data_with_completion: TaskCreateSchema,
+    ):
+        """
+        Задачи с наступившим сроком, отмеченные незавершенными,
+        не завершаются планировщиком повторно.
+        """
+
+        tasks_db = [
+            await TaskDAO.add(
+                session=session,
+                obj_in={
+                    **task_data_with_completion.model_dump(),
+                    "completes_at": TaskDAO.get_completes_at_exp(-5),
+                    "is_completed": True,
+                },
+            )
+            for _ in range(2)
+        ]
+        await session.commit()
+
+        response = await router_client.put(
+            url="/tasks",
+            params={"task_id": tasks_db[0].id},
+            json={
+                "title": "Снова в работе",
+                "description": None,
+                "is_completed": False,
+            },
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["completes_at"] is None
+        assert response.json()["completion"] == 0
+
+        response = await router_client.post(
+            url="/tasks/bulk/update",
+            json={"ids": [str(tasks_db[1].id)], "data": {"is_completed": False}},
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        scheduler = TaskCompletionScheduler(batch_size=10)
+        assert await scheduler.sweep(session=session) == 0
+        for task_db in tasks_db:
+            await session.refresh(task_db)
+            assert task_db.is_completed is False
+            assert task_db.completes_at is None
+
+    async def test_get_scheduler_stats(self, router_client: httpx.AsyncClient):
+        """Возможно получить метрики планировщика."""
+
+        response = await router_client.get(url="/tasks/scheduler")
+        assert response.status_code == status.HTTP_200_OK
+
+        stats = TaskSchedulerStatsSchema(**response.json())
+        assert stats.sweeps >= 0
@@ -0,0 +1,142 @@
+import json
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import api_constants, tracing
+from src.config import api_settings
+from src.dependencies import get_read_session, get_session
+from src.tasks.models import TaskModel
+from src.tasks.router import tasks_router
+
+
+@pytest.fixture
+def memory_exporter(monkeypatch: pytest.MonkeyPatch) -> tracing.MemoryExporter:
+    """Экспортер интервалов в память вместо экспортера из настроек."""
+
+    exporter = tracing.MemoryExporter(maxlen=100)
+    monkeypatch.setattr(tracing, "exporter", exporter)
+    return exporter
+
+
+@pytest.fixture
+async def tracing_client(session: AsyncSession):
+    """Клиент API с трассировкой запросов."""
+
+    app = FastAPI()
+    app.add_middleware(tracing.TracingMiddleware)
+    app.include_router(tasks_router)
+    app.dependency_overrides[get_session] = lambda: session
+    app.dependency_overrides[get_read_session] = lambda: session
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+class TestTracing:
+    """Класс для тестирования трассировки запросов src.tracing."""
+
+    async def test_sampled_request(
+        self,
+        tracing_client: httpx.AsyncClient,
+        memory_exporter: tracing.MemoryExporter,
+        task_db_not_completed: TaskModel,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """
+        Интервалы эндпоинта, сервиса и DAO записываются с id трассировки
+        из заголовка запроса и вложены друг в друга.
+        """
+
+        monkeypatch.setattr(api_settings, "TRACING_SAMPLE_RATE", 1)
+        response = await tracing_client.get(
+            "/tasks", headers={api_constants.TRACE_ID_HEADER: "trace-1"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers[api_constants.TRACE_ID_HEADER] == "trace-1"
+
+        spans = {span["name"]: span for span in memory_exporter.get_spans("trace-1")}
+        root = spans["GET /tasks"]
+        assert root["parent_id"] is None
+        assert root["attributes"] == {"http.status_code": status.HTTP_200_OK}
+
+        route = spans["get_tasks_route"]
+        service = spans["TaskService.get_tasks"]
+        dao = spans["TaskDAO.get_tasks_data"]
+        assert route["parent_id"] == root["span_id"]
+        assert service["parent_id"] == route["span_id"]
+        assert dao["parent_id"] == spans["TaskService._get_tasks_page"]["span_id"]
+        assert spans["TaskService.build_tasks_list"]["attributes"] == {"as_json": False}
+        assert root["duration_ms"] >= route["duration_ms"] >= service["duration_ms"]
+
+        response = await tracing_client.get(f"/tasks/{task_db_not_completed.id}")
+        trace_id = response.headers[api_constants.TRACE_ID_HEADER]
+        names = [span["name"] for span in memory_exporter.get_spans(trace_id)]
+        assert "TaskDAO.get_tasks_data_by_ids" in names
+        assert names[-1] == "GET /tasks/{task_id}"
+
+    async def test_not_sampled_request(
+        self,
+        tracing_client: httpx.AsyncClient,
+        memory_exporter: tracing.MemoryExporter,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """
+        Запросы вне выборки не записываются, id трассировки возвращается
+        всегда, некорректный id из заголовка заменяется.
+        """
+
+        monkeypatch.setattr(api_settings, "TRACING_SAMPLE_RATE", 0)
+        response = await tracing_client.get(
+            "/tasks", headers={api_constants.TRACE_ID_HEADER: "bad id"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        trace_id = response.headers[api_constants.TRACE_ID_HEADER]
+        assert trace_id != "bad id"
+        assert len(trace_id) == 32
+        assert memory_exporter.get_spans() == []
+
+    async def test_jsonl_exporter(self, tmp_path, monkeypatch: pytest.MonkeyPatch):
+        """
+        Интервалы трассировки записываются в файл по одному в строке
+        при сбросе буфера экспортера.
+        """
+
+        path = tmp_path / "traces.jsonl"
+        exporter = tracing.JSONLinesExporter(str(path), flush_interval=60)
+        monkeypatch.setattr(tracing, "exporter", exporter)
+
+        root = tracing.Span("root", trace_id="trace-2")
+        token = tracing.current_span.set(root)
+        with pytest.raises(ValueError):
+            with tracing.span("child", task_count=1):
+                raise ValueError("ошибка")
+        tracing.current_span.reset(token)
+        root.finish()
+        # Интервалы записываются в файл фоновым потоком.
+        assert not path.exists()
+        exporter.flush()
+
+        child, root_data = [json.loads(line) for line in path.read_text().splitlines()]
+        assert child["name"] == "child"
+        assert child["parent_id"] == root_data["span_id"]
+        assert child["attributes"] == {"task_count": 1}
+        assert child["error"] == "ValueError('ошибка')"
+        assert root_data["trace_id"] == "trace-2"
+        assert root_data["error"] is None
+
+    def test_jsonl_exporter_background_flush(self, tmp_path):
+        """Буфер экспортера записывается в файл фоновым потоком."""
+
+        path = tmp_path / "traces.jsonl"
+        exporter = tracing.JSONLinesExporter(str(path), flush_interval=0.01)
+        exporter.export([{"name": "root"}])
+
+        deadline = time.monotonic() + 5
+        while not path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert json.loads(path.read_text()) == {"name": "root"}